@@ -16,6 +16,8 @@ Key Features:
     - Preserve all original information (no summarization)
     - Default output location with overwrite capability
     - Custom output locations with overwrite protection
+    - Follow mode: clean up a streaming transcript piece by piece while it is
+      still being transcribed (``transcribe_audio.py --stream-output``)
 
 Default Behavior:
     - Output: ~/tmp/cleaned_transcript.md (allows overwrite)
@@ -41,6 +43,9 @@ Example Usage:
     # Specify custom output location (cannot overwrite existing file)
     $ python audio_transcription_cleanup.py --transcript-file /path/to/transcript.txt --output ~/Documents/cleaned.md
 
+    # Start cleaning while transcribe_audio.py --stream-output is still running
+    $ python audio_transcription_cleanup.py --transcript-file ~/tmp/download_audio_result.txt --follow
+
 Requirements:
     - Claude CLI must be installed and accessible
     - Transcript file must exist at specified path
@@ -49,13 +54,22 @@ Author: sanhe
 Plugin: youtube@sanhe-claude-code-plugins
 """
 
+import sys
 import subprocess
 import argparse
 from pathlib import Path
 
+dir_here = Path(__file__).absolute().parent
+dir_skills = dir_here.parent.parent
 dir_home = Path.home()
 path_cleaned_transcript = dir_home / "tmp" / "cleaned_transcript.md"
 
+# Characters of raw transcript cleaned up per Claude call in follow mode
+default_follow_chars = 8000
+# A chunk of a --stream-output run is 5 min of audio, even a slow engine
+# appends one well within this
+default_follow_idle_timeout = 900.0
+
 prompt = """
 ## Task
 Transform the messy voice transcription text provided below into a well-formatted, human-readable document while preserving ALL original meaning and content.
@@ -191,6 +205,11 @@ Your entire response = the cleaned document itself, nothing more.
 ## INPUT TRANSCRIPTION:
 """.strip()
 
+continuation_prompt = """
+## Continuation
+The input below continues a transcription whose earlier part has already been cleaned up and saved. Do NOT add an H1 title; start directly with an H2 section heading.
+""".strip()
+
 
 def cleanup_transcript(path_transcript: Path):
     """
@@ -201,12 +220,24 @@ def cleanup_transcript(path_transcript: Path):
     """
     # Read transcript content
     content = path_transcript.read_text(encoding="utf-8")
+    return cleanup_text(content)
+
+
+def cleanup_text(content: str, continuation: bool = False) -> str:
+    """
+    Clean up a piece of raw transcript text with Claude CLI.
+
+    Args:
+        content: Raw transcript text
+        continuation: The text continues an already cleaned up part, no H1
+    """
+    system_prompt = f"{continuation_prompt}\n\n{prompt}" if continuation else prompt
 
     # Call Claude CLI to process the transcript
     args = [
         "claude",
         "--append-system-prompt",
-        prompt,
+        system_prompt,
         "--print",
         content,
     ]
@@ -225,6 +256,60 @@ def cleanup_transcript(path_transcript: Path):
     return cleaned_transcript
 
 
+def cleanup_transcript_follow(
+    path_transcript: Path,
+    path_output: Path,
+    chunk_chars: int = default_follow_chars,
+    poll_interval: float = 2.0,
+    idle_timeout: float | None = default_follow_idle_timeout,
+):
+    """
+    Clean up a transcript that is still being written by
+    ``transcribe_audio.py --stream-output``.
+
+    New lines are collected until about ``chunk_chars`` characters are
+    available, that piece is cleaned up and appended to ``path_output``, and
+    so on until the transcript's completion marker appears.
+
+    Raises:
+        TimeoutError: If no new text arrives for ``idle_timeout`` seconds
+            (e.g. the transcription crashed before writing its marker), after
+            the text read so far was cleaned up
+    """
+    sys.path.append(str(dir_skills / "transcribe-audio-to-text" / "scripts"))
+    import transcript_stream
+
+    path_output.write_text("", encoding="utf-8")
+    pieces = 0
+
+    def flush(lines: list[str]):
+        nonlocal pieces
+        content = "".join(lines).strip()
+        if not content:
+            return
+        cleaned = cleanup_text(content, continuation=pieces > 0)
+        with path_output.open("a", encoding="utf-8") as f:
+            f.write(cleaned.strip() + "\n\n")
+        pieces += 1
+        print(f"✓ Cleaned up piece {pieces} ({len(content)} characters)")
+
+    lines = list()
+    size = 0
+    try:
+        for line in transcript_stream.follow(
+            path_transcript, poll_interval, timeout=idle_timeout
+        ):
+            lines.append(line)
+            size += len(line)
+            if size >= chunk_chars:
+                flush(lines)
+                lines, size = list(), 0
+    except TimeoutError:
+        flush(lines)
+        raise
+    flush(lines)
+
+
 def main():
     """
     Main CLI entry point for cleaning up audio transcriptions.
@@ -257,6 +342,9 @@ Examples:
   # Specify custom output location (cannot overwrite existing file)
   %(prog)s --transcript-file "~/tmp/transcript.txt" --output "~/Documents/cleaned.md"
 
+  # Clean up while transcribe_audio.py --stream-output is still running
+  %(prog)s --transcript-file "~/tmp/download_audio_result.txt" --follow
+
 Cleanup Operations:
   - Remove verbal artifacts: um, uh, like, you know, 呃, 啊, 那个
   - Fix spelling and grammar errors
@@ -288,6 +376,19 @@ Note:
         help=f"Output file path for cleaned transcript (default: {path_cleaned_transcript}). Note: Default location allows overwrite, custom locations cannot overwrite existing files.",
     )
 
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Tail a transcript that is still being written by transcribe_audio.py --stream-output and clean it up piece by piece until its .done marker appears",
+    )
+
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=default_follow_idle_timeout,
+        help=f"With --follow, give up when the transcript gets no new text for this many seconds (default: {default_follow_idle_timeout:g})",
+    )
+
     args = parser.parse_args()
 
     # Convert to Path objects and expand user home directory
@@ -310,13 +411,24 @@ Note:
     # Ensure output directory exists
     path_output.parent.mkdir(parents=True, exist_ok=True)
 
-    # Clean up the transcript
-    cleaned_transcript = cleanup_transcript(
-        path_transcript=path_transcript,
-    )
+    if args.follow:
+        try:
+            cleanup_transcript_follow(
+                path_transcript=path_transcript,
+                path_output=path_output,
+                idle_timeout=args.idle_timeout,
+            )
+        except TimeoutError as e:
+            print(f"✗ {e}, partial cleanup saved to: {path_output}")
+            sys.exit(1)
+    else:
+        # Clean up the transcript
+        cleaned_transcript = cleanup_transcript(
+            path_transcript=path_transcript,
+        )
 
-    # Save to output file
-    path_output.write_text(cleaned_transcript, encoding="utf-8")
+        # Save to output file
+        path_output.write_text(cleaned_transcript, encoding="utf-8")
 
     # Print success message with clickable file path
     absolute_path = path_output.resolve()
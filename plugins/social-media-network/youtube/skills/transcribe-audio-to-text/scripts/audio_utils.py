@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""
+ffmpeg Audio Helpers
+
+Small wrappers around the ffmpeg binary managed by the youtube-video-to-audio
+skill (``download_audio.path_ffmpeg``), shared by the transcription modes
+that need to look inside an audio file before transcribing it:
+
+- :func:`probe_duration`: length of a file in seconds
+- :func:`detect_silences`: silent ranges from ffmpeg's ``silencedetect``
+- :func:`extract_wav`: cut a range into a 16 kHz mono PCM WAV
+- :func:`decode_pcm`: decode a whole file into headerless 16 kHz mono PCM
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import re
+import sys
+import subprocess
+from pathlib import Path
+
+dir_here = Path(__file__).absolute().parent
+dir_skills = dir_here.parent.parent
+
+sample_rate = 16000
+sample_width = 2  # bytes, 16-bit PCM
+
+_duration_pattern = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_time_pattern = re.compile(r"time=(\d+):(\d+):(\d+(?:\.\d+)?)")
+_silence_start_pattern = re.compile(r"silence_start: (-?\d+(?:\.\d+)?)")
+_silence_end_pattern = re.compile(r"silence_end: (-?\d+(?:\.\d+)?)")
+
+
+def get_ffmpeg() -> Path:
+    """
+    Path of the ffmpeg binary of the youtube-video-to-audio skill.
+    """
+    sys.path.append(str(dir_skills / "youtube-video-to-audio" / "scripts"))
+    import download_audio
+
+    return download_audio.ensure_ffmpeg()
+
+
+def _hms(match: re.Match) -> float:
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def probe_duration(path_audio: Path) -> float:
+    """
+    Duration of an audio file in seconds.
+
+    Uses the container header when it has one, otherwise decodes the whole
+    file (e.g. a WebM / opus stream without a duration).
+    """
+    ffmpeg = get_ffmpeg()
+    result = subprocess.run(
+        [str(ffmpeg), "-hide_banner", "-nostdin", "-i", str(path_audio)],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    match = _duration_pattern.search(result.stderr)
+    if match:
+        return _hms(match)
+    result = subprocess.run(
+        [
+            str(ffmpeg),
+            "-hide_banner",
+            "-nostdin",
+            "-i",
+            str(path_audio),
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    matches = list(_time_pattern.finditer(result.stderr))
+    if not matches:
+        raise RuntimeError(f"Cannot determine the duration of {path_audio}")
+    return _hms(matches[-1])
+
+
+def detect_silences(
+    path_audio: Path,
+    noise_db: float = -35.0,
+    min_silence: float = 0.4,
+) -> list[tuple[float, float]]:
+    """
+    Find the silent ranges of an audio file with ffmpeg's ``silencedetect``.
+
+    Args:
+        path_audio: Audio file
+        noise_db: Anything quieter than this (dBFS) counts as silence
+        min_silence: Shortest silence to report, in seconds
+
+    Returns:
+        ``(start, end)`` pairs in seconds, in order
+    """
+    ffmpeg = get_ffmpeg()
+    result = subprocess.run(
+        [
+            str(ffmpeg),
+            "-hide_banner",
+            "-nostdin",
+            "-i",
+            str(path_audio),
+            "-af",
+            f"silencedetect=noise={noise_db:g}dB:d={min_silence:g}",
+            "-f",
+            "null",
+            "-",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        errors="replace",
+    )
+    silences = list()
+    start = None
+    for line in result.stderr.splitlines():
+        match = _silence_start_pattern.search(line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+        match = _silence_end_pattern.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    return silences
+
+
+def extract_wav(
+    path_audio: Path,
+    path_output: Path,
+    start: float = 0.0,
+    end: float | None = None,
+):
+    """
+    Decode ``[start, end)`` of an audio file into a 16 kHz mono 16-bit WAV,
+    the format every ASR engine resamples to anyway.
+    """
+    args = [
+        str(get_ffmpeg()),
+        "-hide_banner",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-ss",
+        f"{start:.3f}",
+        "-i",
+        str(path_audio),
+    ]
+    if end is not None:
+        args.extend(["-t", f"{end - start:.3f}"])
+    args.extend(
+        [
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            "1",
+            "-c:a",
+            "pcm_s16le",
+            "-y",
+            str(path_output),
+        ]
+    )
+    subprocess.run(args, check=True)
+
+
+def decode_pcm(path_audio: Path, path_output: Path):
+    """
+    Decode a whole audio file into raw (headerless) 16 kHz mono 16-bit
+    little-endian PCM, so that second ``t`` starts at byte
+    ``int(t * sample_rate) * sample_width``. ffmpeg streams the decode, its
+    memory does not grow with the duration.
+    """
+    subprocess.run(
+        [
+            str(get_ffmpeg()),
+            "-hide_banner",
+            "-nostdin",
+            "-loglevel",
+            "error",
+            "-i",
+            str(path_audio),
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            "1",
+            "-f",
+            "s16le",
+            "-c:a",
+            "pcm_s16le",
+            "-y",
+            str(path_output),
+        ],
+        check=True,
+    )
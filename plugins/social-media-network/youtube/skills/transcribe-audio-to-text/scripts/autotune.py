@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+CPU Thread and Worker Auto-Tuning
+
+The modes that run several engine processes at once (``--parallel``,
+``--batch``, ``--stream-output``) need two numbers: how many processes
+(``--workers``) and how many CPU threads each (``--threads``). One process
+with the engine's default thread count under-uses a many-core host, and
+many processes that each start a thread per core oversubscribe it and
+thrash.
+
+``python transcribe_audio.py tune --clip clip.wav`` tries every combination
+of ``workers`` x ``threads`` that fills the cores of this host (1 x N,
+2 x N/2, 4 x N/4, ..., N x 1), each by transcribing the calibration clip
+``workers`` times concurrently, and records the combination with the
+highest total throughput (audio seconds per wall second, summed over the
+processes) per host and engine in
+``~/.cache/sanhe-claude-code-plugins/youtube/engine_benchmark.json``.
+
+Resolution (:func:`resolve`), for the modes with several processes:
+    1. ``--workers`` / ``--threads`` given on the command line
+    2. the tuned combination of this host and engine
+    3. ``--workers`` defaults (CPU count, 4 for ``--batch``) with
+       ``CPU count / workers`` threads each, so the cores are never
+       oversubscribed
+
+Single-process modes use ``--threads`` when given, the engine default
+otherwise.
+
+Example Usage:
+    $ python transcribe_audio.py tune --clip "~/Music/clip.wav"
+    $ python transcribe_audio.py tune --clip "~/Music/clip.wav" --engine whisper-cpp
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import engines
+import audio_utils
+
+
+def get_cpu_count() -> int:
+    return os.cpu_count() or 1
+
+
+def get_candidates(cpu_count: int) -> list[tuple[int, int]]:
+    """
+    ``(workers, threads)`` combinations that use all ``cpu_count`` cores.
+    """
+    workers = {cpu_count}
+    n = 1
+    while n < cpu_count:
+        workers.add(n)
+        n *= 2
+    return [(w, max(1, cpu_count // w)) for w in sorted(workers)]
+
+
+def measure(
+    engine_name: str,
+    path_clip: Path,
+    workers: int,
+    threads: int,
+    duration: float,
+) -> float:
+    """
+    Total throughput of ``workers`` concurrent engine processes with
+    ``threads`` threads each, in audio seconds per wall second.
+    """
+    engine = engines.get_engine(engine_name, threads=threads)
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    engine.transcribe,
+                    path_clip,
+                    Path(dir_tmp) / f"output-{i}.txt",
+                    stdout=subprocess.DEVNULL,
+                )
+                for i in range(workers)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+    return workers * duration / elapsed
+
+
+def run_tune(
+    path_clip: Path,
+    engine_name: str = engines.default_engine,
+    cpu_count: int | None = None,
+) -> dict:
+    """
+    Measure every candidate combination and save the best one, see the
+    module docstring.
+
+    Returns:
+        ``{"workers", "threads", "realtime_factor", "cpu_count", "results"}``
+    """
+    engine = engines.get_engine(engine_name)
+    engine.ensure_available()
+    cpu_count = cpu_count or get_cpu_count()
+    duration = audio_utils.probe_duration(path_clip)
+    results = list()
+    for workers, threads in get_candidates(cpu_count):
+        print(f"Measuring {engine.name}: {workers} workers x {threads} threads")
+        realtime_factor = measure(engine.name, path_clip, workers, threads, duration)
+        results.append(
+            {"workers": workers, "threads": threads, "realtime_factor": realtime_factor}
+        )
+    best = max(results, key=lambda result: result["realtime_factor"])
+    tuning = {
+        **best,
+        "cpu_count": cpu_count,
+        "host_cpu_count": get_cpu_count(),
+        "results": results,
+    }
+    data = engines.load_benchmark()
+    data.setdefault(engines.get_host(), {}).setdefault("tuning", {})[engine.name] = tuning
+    engines.save_benchmark(data)
+    return tuning
+
+
+def get_tuning(engine_name: str) -> dict | None:
+    """
+    The tuned combination of this host and engine, None when it was not
+    tuned or the CPU count changed since.
+    """
+    host = engines.load_benchmark().get(engines.get_host(), {})
+    tuning = host.get("tuning", {}).get(engine_name)
+    if tuning is None or tuning.get("host_cpu_count") != get_cpu_count():
+        return None
+    return tuning
+
+
+def resolve(
+    engine_name: str,
+    workers: int | None = None,
+    threads: int | None = None,
+    default_workers: int | None = None,
+) -> tuple[int, int]:
+    """
+    ``(workers, threads)`` of a mode with several engine processes, see the
+    module docstring.
+
+    Args:
+        engine_name: Resolved engine name
+        workers: ``--workers``, None when not given
+        threads: ``--threads``, None when not given
+        default_workers: Default of the mode (default: CPU count)
+    """
+    tuning = get_tuning(engine_name)
+    if workers is None:
+        workers = tuning["workers"] if tuning else default_workers or get_cpu_count()
+    if threads is None:
+        if tuning and tuning["workers"] == workers:
+            threads = tuning["threads"]
+        else:
+            threads = max(1, get_cpu_count() // workers)
+    return workers, threads
+
+
+def print_tune(engine_name: str, tuning: dict):
+    print(f"{'workers':>8} {'threads':>8} {'realtime':>10}")
+    for result in tuning["results"]:
+        print(
+            f"{result['workers']:>8} {result['threads']:>8} "
+            f"{result['realtime_factor']:>9.1f}x"
+        )
+    print(f"✓ Results saved to {engines.path_benchmark}")
+    print(
+        f"✓ Best for {engine_name} on this host: {tuning['workers']} workers x "
+        f"{tuning['threads']} threads, {tuning['realtime_factor']:.1f}x realtime"
+    )
+
+
+def main_tune(argv: list[str] | None = None):
+    """
+    CLI of ``transcribe_audio.py tune``.
+    """
+    parser = argparse.ArgumentParser(
+        prog="transcribe_audio.py tune",
+        description="Find the workers x threads combination with the highest throughput on this host",
+    )
+    parser.add_argument(
+        "--clip",
+        type=str,
+        required=True,
+        help="Calibration audio clip, a minute or two of typical speech",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="auto",
+        choices=engines.engine_choices,
+        help="Engine to tune (default: auto, the engine --engine auto selects)",
+    )
+    parser.add_argument(
+        "--cpu-count",
+        type=int,
+        default=None,
+        help="Cores to fill (default: all cores of this host)",
+    )
+    args = parser.parse_args(argv)
+    engine_name = engines.get_engine(args.engine).name
+    tuning = run_tune(
+        path_clip=Path(args.clip).expanduser(),
+        engine_name=engine_name,
+        cpu_count=args.cpu_count,
+    )
+    print_tune(engine_name, tuning)
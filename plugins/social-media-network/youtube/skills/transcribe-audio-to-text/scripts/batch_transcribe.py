@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+"""
+Resumable Batch Transcription
+
+Transcribes every audio file of a directory (recursively) or a glob, N files
+at a time, and keeps a JSON job manifest next to the transcripts::
+
+    ${output_dir}/.transcribe_manifest.json
+    {
+        "files": {
+            "/abs/path/ep01.mp3": {
+                "status": "done",           # pending / done / failed
+                "sha256": "9f86d081...",
+                "size": 57671680,
+                "mtime": 1735689600.0,
+                "output": "/abs/output/ep01.mp3.txt",
+                "duration": 3605.2,
+                "elapsed": 410.7,
+                "error": null
+            },
+            ...
+        }
+    }
+
+The manifest is rewritten atomically after every file, so after a crash
+the next run with the same arguments resumes exactly where it left off:
+``done`` files whose content hash is unchanged and whose transcript still
+exists are skipped (the hash is only recomputed when size or mtime
+changed), files that changed since are transcribed again, and
+``failed`` files are only retried with ``retry_failed``. The final report
+gives the throughput in audio hours per wall hour.
+
+Example Usage:
+    $ python transcribe_audio.py --batch "~/Music/podcasts" --output-dir "~/tmp/transcripts" --workers 8
+    $ python transcribe_audio.py --batch "~/Music/podcasts/*.mp3" --retry-failed
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import glob
+import json
+import time
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import autotune
+import audio_utils
+import transcribe_audio
+import transcript_cache
+
+audio_extensions = {
+    ".mp3",
+    ".m4a",
+    ".aac",
+    ".wav",
+    ".flac",
+    ".opus",
+    ".ogg",
+    ".webm",
+    ".mp4",
+    ".mkv",
+}
+manifest_filename = ".transcribe_manifest.json"
+
+
+class TranscribeManifest:
+    """
+    Thread-safe job manifest, saved atomically on every update.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            self.data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.data = {"files": {}}
+
+    @property
+    def files(self) -> dict[str, dict]:
+        return self.data["files"]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        path_tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        path_tmp.write_text(json.dumps(self.data, indent=4), encoding="utf-8")
+        os.replace(path_tmp, self.path)
+
+    def update(self, key: str, **fields):
+        with self.lock:
+            self.files.setdefault(key, {}).update(fields)
+            self.save()
+
+
+def find_audio_files(pattern: str) -> list[Path]:
+    """
+    Audio files of a directory (recursively) or matching a glob, sorted.
+    """
+    path = Path(pattern).expanduser()
+    if path.is_dir():
+        candidates = path.rglob("*")
+    else:
+        candidates = (Path(p) for p in glob.glob(str(path), recursive=True))
+    return sorted(
+        p.absolute()
+        for p in candidates
+        if p.is_file() and p.suffix.lower() in audio_extensions
+    )
+
+
+def get_root(pattern: str) -> Path:
+    """
+    The directory the input tree starts at, the glob's non-wildcard prefix.
+    """
+    path = Path(pattern).expanduser()
+    if path.is_dir():
+        return path.absolute()
+    while any(char in path.name for char in "*?[") or not path.is_dir():
+        if path.parent == path:
+            break
+        path = path.parent
+    return path.absolute()
+
+
+def get_output_path(path_audio: Path, root: Path, output_dir: Path) -> Path:
+    """
+    ``output_dir`` mirrors the input tree, ``a/b/ep01.mp3`` -> ``a/b/ep01.mp3.txt``.
+
+    The audio extension is kept, so ``ep01.mp3`` and ``ep01.m4a`` of one
+    directory get their own transcripts.
+    """
+    try:
+        relative = path_audio.relative_to(root)
+    except ValueError:
+        relative = Path(path_audio.name)
+    return output_dir / relative.with_name(f"{relative.name}.txt")
+
+
+def transcribe_batch(
+    pattern: str,
+    output_dir: Path,
+    workers: int | None = None,
+    manifest_path: Path | None = None,
+    retry_failed: bool = False,
+    use_server: bool = True,
+    use_cache: bool = True,
+    engine: str = "audinota",
+    threads: int | None = None,
+) -> TranscribeManifest:
+    """
+    Transcribe every audio file matching ``pattern``, see the module docstring.
+
+    Args:
+        pattern: Directory or glob
+        output_dir: Where the transcripts (and the manifest) go
+        workers: Files transcribed concurrently (default: tuned, else 4)
+        manifest_path: Manifest location (default: in ``output_dir``)
+        retry_failed: Transcribe files that failed in an earlier run again
+        use_server: Use the warm transcription server when it is running
+        use_cache: Use the transcript cache
+        engine: Transcription engine, see ``engines.py``
+        threads: CPU threads per engine process (default: tuned, else
+            CPU count / ``workers``), see ``autotune.py``
+
+    Returns:
+        The manifest after the run
+    """
+    workers, threads = autotune.resolve(engine, workers, threads, default_workers=4)
+    root = get_root(pattern)
+    files = find_audio_files(pattern)
+    manifest = TranscribeManifest(manifest_path or output_dir / manifest_filename)
+
+    todo = list()
+    skipped = 0
+    for path_audio in files:
+        key = str(path_audio)
+        entry = manifest.files.get(key, {})
+        stat = path_audio.stat()
+        # Hashing hundreds of files is slow, re-hash only when the file changed
+        if entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+            sha256 = entry["sha256"]
+        else:
+            sha256 = transcript_cache.hash_audio(path_audio)
+        path_output = get_output_path(path_audio, root, output_dir)
+        unchanged = entry.get("sha256") == sha256
+        if unchanged and entry.get("status") == "done" and path_output.exists():
+            skipped += 1
+            continue
+        if unchanged and entry.get("status") == "failed" and not retry_failed:
+            skipped += 1
+            continue
+        manifest.files[key] = {
+            "status": "pending",
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "output": str(path_output),
+            "duration": entry.get("duration") if unchanged else None,
+            "elapsed": None,
+            "error": None,
+        }
+        todo.append(path_audio)
+    manifest.save()
+    print(
+        f"Batch: {len(files)} audio files, {len(todo)} to transcribe, "
+        f"{skipped} done or failed in an earlier run, "
+        f"{workers} workers x {threads} threads"
+    )
+
+    def run(path_audio: Path) -> tuple[Path, str | None]:
+        key = str(path_audio)
+        entry = manifest.files[key]
+        path_output = Path(entry["output"])
+        path_output.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        try:
+            duration = entry["duration"] or audio_utils.probe_duration(path_audio)
+            transcribe_audio.transcribe_audio(
+                path_audio=path_audio,
+                path_output=path_output,
+                use_server=use_server,
+                use_cache=use_cache,
+                engine=engine,
+                threads=threads,
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            manifest.update(
+                key, status="failed", error=error, elapsed=time.perf_counter() - start
+            )
+            return path_audio, error
+        manifest.update(
+            key,
+            status="done",
+            duration=duration,
+            elapsed=time.perf_counter() - start,
+        )
+        return path_audio, None
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(run, path_audio) for path_audio in todo]
+        for future in as_completed(futures):
+            path_audio, error = future.result()
+            status = "✓" if error is None else "✗"
+            print(f"{status} {path_audio}: {error or manifest.files[str(path_audio)]['output']}")
+    elapsed = time.perf_counter() - start_time
+
+    print_batch_report(manifest, [str(p) for p in todo], elapsed)
+    return manifest
+
+
+def print_batch_report(manifest: TranscribeManifest, keys: list[str], elapsed: float):
+    """
+    Print the outcome of this run and its throughput.
+    """
+    entries = [manifest.files[key] for key in keys]
+    done = [entry for entry in entries if entry["status"] == "done"]
+    failed = [(key, entry) for key, entry in zip(keys, entries) if entry["status"] == "failed"]
+    audio_hours = sum(entry["duration"] or 0.0 for entry in done) / 3600
+    wall_hours = elapsed / 3600
+    print()
+    print(f"Batch finished in {elapsed:.1f}s")
+    print(f"✓ Transcribed: {len(done)} files, {audio_hours:.2f} audio hours")
+    print(f"✗ Failed: {len(failed)}")
+    for key, entry in failed:
+        print(f"  - {key}: {entry['error']}")
+    if wall_hours > 0:
+        print(
+            f"✓ Throughput: {audio_hours / wall_hours:.1f} audio hours per wall hour "
+            f"({audio_hours / wall_hours:.1f}x realtime)"
+        )
+    print(f"✓ Manifest: {manifest.path}")
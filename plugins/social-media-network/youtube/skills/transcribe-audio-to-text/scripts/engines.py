@@ -0,0 +1,609 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pluggable Transcription Engines
+
+Every transcription mode (single file, ``--parallel``, ``--vad``,
+``--stream-output``, ``--batch``) runs its engine through the small
+:class:`Engine` interface: "transcribe this audio file into that text
+file", implemented as one subprocess per call, so every engine is measured
+and isolated the same way.
+
+Engines:
+    - ``audinota``: the audinota CLI at
+      ~/Documents/GitHub/audinota-project/.venv/bin/audinota
+    - ``whisper-cpp``: whisper.cpp's ``whisper-cli`` on ``PATH``, with the model
+      from ``WHISPER_CPP_MODEL`` (default: ~/whisper.cpp/models/ggml-base.bin).
+      Writes ``[start --> end] text`` lines
+    - ``faster-whisper``: the faster-whisper backend of ``transcribe_server.py``
+      (``run`` subcommand), in the audinota virtualenv or this interpreter,
+      with the model from ``FASTER_WHISPER_MODEL`` (default: small). Writes
+      ``[start --> end] text`` lines. A warm server started with
+      ``--backend faster-whisper`` and the same model serves it instead
+    - ``fake``: no ASR at all, writes one timed placeholder line per 5 seconds
+      of audio, at ``FAKE_ENGINE_SPEED`` (default: 50) times realtime. For
+      tests and for benchmarking the pipeline around the engine
+
+Threads:
+    ``--threads N`` runs every engine process with N CPU threads
+    (``OMP_NUM_THREADS`` and friends, ``whisper-cli --threads``), so several
+    concurrent processes do not oversubscribe the cores, see ``autotune.py``.
+
+Benchmark and Auto-Selection:
+    ``python transcribe_audio.py benchmark --clip clip.wav --reference clip.txt``
+    runs every available engine on a calibration clip and records, per host,
+    its realtime factor (audio seconds per wall second), peak memory and,
+    with a reference transcript, word error rate in
+    ``~/.cache/sanhe-claude-code-plugins/youtube/engine_benchmark.json``.
+    ``--engine auto`` (the default) then picks the fastest engine of this host
+    whose measured word error rate is within ``--max-wer``, so heterogeneous
+    workers each use their best option. Engines benchmarked without a
+    reference do not qualify; without such a benchmark, auto means audinota.
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import socket
+import tempfile
+import functools
+import argparse
+import platform
+import subprocess
+import typing
+from pathlib import Path
+
+import audio_utils
+import transcribe_audio
+import transcribe_server
+
+dir_cache = Path.home() / ".cache" / "sanhe-claude-code-plugins" / "youtube"
+path_benchmark = dir_cache / "engine_benchmark.json"
+default_max_wer = 0.35
+default_engine = "audinota"
+thread_env_vars = [
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+]
+
+
+class Engine:
+    """
+    A local transcription engine.
+
+    Subclasses implement :meth:`command` (or :meth:`transcribe` when the
+    engine needs more than one process).
+    """
+
+    name: str = ""
+    # Whether the engine reports timestamps in its text output
+    timestamps: bool = False
+
+    def __init__(self, threads: int | None = None):
+        """
+        Args:
+            threads: CPU threads per engine process (default: the engine's
+                own default, usually every core), see ``autotune.py``
+        """
+        self.threads = threads
+
+    def get_env(self) -> dict[str, str] | None:
+        """
+        Environment of the engine process, with the thread count of the
+        OpenMP / BLAS runtimes the engines run on.
+        """
+        if not self.threads:
+            return None
+        env = dict(os.environ)
+        for key in thread_env_vars:
+            env[key] = str(self.threads)
+        return env
+
+    @property
+    def model(self) -> str | None:
+        """
+        Model that changes the transcript, part of the transcript cache key.
+        """
+        return None
+
+    def is_available(self) -> bool:
+        raise NotImplementedError
+
+    def ensure_available(self):
+        """
+        Raises:
+            FileNotFoundError: If the engine is not installed
+        """
+        if not self.is_available():
+            raise FileNotFoundError(f"Transcription engine {self.name!r} is not installed")
+
+    def cache_params(self) -> dict:
+        """
+        Transcript cache key parameters of this engine.
+        """
+        return {"engine": self.name, "model": self.model}
+
+    def command(self, path_audio: Path, path_output: Path | None) -> list[str]:
+        raise NotImplementedError
+
+    def transcribe(self, path_audio: Path, path_output: Path | None = None, **kwargs):
+        """
+        Transcribe ``path_audio`` into ``path_output``.
+
+        Args:
+            kwargs: Passed to :func:`subprocess.run`
+
+        Raises:
+            subprocess.CalledProcessError: If the engine fails
+        """
+        subprocess.run(
+            self.command(path_audio, path_output),
+            check=True,
+            env=self.get_env(),
+            **kwargs,
+        )
+
+
+class AudinotaEngine(Engine):
+    name = "audinota"
+
+    def is_available(self) -> bool:
+        return transcribe_audio.path_audinota.exists()
+
+    def ensure_available(self):
+        if not self.is_available():
+            raise FileNotFoundError(f"audinota not found at {transcribe_audio.path_audinota}")
+
+    def command(self, path_audio: Path, path_output: Path | None) -> list[str]:
+        args = [
+            str(transcribe_audio.path_audinota),
+            "transcribe",
+            "--input",
+            str(path_audio),
+        ]
+        if path_output:
+            args.extend(["--output", str(path_output)])
+        return args
+
+
+class WhisperCppEngine(Engine):
+    name = "whisper-cpp"
+    timestamps = True
+
+    @property
+    def path_model(self) -> Path:
+        default = Path.home() / "whisper.cpp" / "models" / "ggml-base.bin"
+        return Path(os.environ.get("WHISPER_CPP_MODEL", default)).expanduser()
+
+    @property
+    def model(self) -> str | None:
+        return self.path_model.name
+
+    def is_available(self) -> bool:
+        return shutil.which("whisper-cli") is not None and self.path_model.exists()
+
+    def command(self, path_audio: Path, path_output: Path | None) -> list[str]:
+        args = [
+            "whisper-cli",
+            "--model",
+            str(self.path_model),
+            "--file",
+            str(path_audio),
+            "--no-prints",
+        ]
+        if self.threads:
+            args.extend(["--threads", str(self.threads)])
+        return args
+
+    def transcribe(self, path_audio: Path, path_output: Path | None = None, **kwargs):
+        kwargs.pop("stdout", None)
+        path_output = path_output or path_audio.with_suffix(".txt")
+        with tempfile.TemporaryDirectory() as dir_tmp:
+            # whisper-cli only reads 16 kHz WAV
+            if path_audio.suffix.lower() != ".wav":
+                path_wav = Path(dir_tmp) / "input.wav"
+                audio_utils.extract_wav(path_audio, path_wav)
+                path_audio = path_wav
+            with path_output.open("w", encoding="utf-8") as f:
+                subprocess.run(
+                    self.command(path_audio, path_output),
+                    check=True,
+                    stdout=f,
+                    env=self.get_env(),
+                    **kwargs,
+                )
+
+
+class FasterWhisperEngine(Engine):
+    name = "faster-whisper"
+    timestamps = True
+
+    @property
+    def model(self) -> str | None:
+        return transcribe_server.default_model
+
+    @property
+    def python(self) -> Path | None:
+        """
+        Interpreter that can import faster_whisper, None if there is none.
+        """
+        return _find_faster_whisper_python()
+
+    def is_available(self) -> bool:
+        return self.python is not None
+
+    def command(self, path_audio: Path, path_output: Path | None) -> list[str]:
+        args = [
+            str(self.python),
+            str(Path(transcribe_server.__file__).absolute()),
+            "run",
+            "--backend",
+            self.name,
+            "--model",
+            self.model,
+            "--input",
+            str(path_audio),
+        ]
+        if path_output:
+            args.extend(["--output", str(path_output)])
+        if self.threads:
+            args.extend(["--threads", str(self.threads)])
+        return args
+
+
+@functools.cache
+def _find_faster_whisper_python() -> Path | None:
+    """
+    The audinota venv python or this one, whichever imports faster_whisper
+    first. Checked once per process.
+    """
+    for python in [transcribe_server.get_venv_python(), Path(sys.executable)]:
+        if not python.exists():
+            continue
+        result = subprocess.run(
+            [str(python), "-c", "import faster_whisper"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode == 0:
+            return python
+    return None
+
+
+class FakeEngine(Engine):
+    name = "fake"
+    timestamps = True
+
+    def is_available(self) -> bool:
+        return True
+
+    def command(self, path_audio: Path, path_output: Path | None) -> list[str]:
+        path_output = path_output or path_audio.with_suffix(".txt")
+        return [
+            sys.executable,
+            str(Path(__file__).absolute()),
+            "fake",
+            "--input",
+            str(path_audio),
+            "--output",
+            str(path_output),
+        ]
+
+
+engines: dict[str, type[Engine]] = {
+    "audinota": AudinotaEngine,
+    "whisper-cpp": WhisperCppEngine,
+    "faster-whisper": FasterWhisperEngine,
+    "fake": FakeEngine,
+}
+engine_choices = ["auto"] + list(engines)
+
+
+def get_engine(
+    name: str = "auto",
+    max_wer: float = default_max_wer,
+    threads: int | None = None,
+) -> Engine:
+    """
+    Engine by name, ``"auto"`` resolves with :func:`select_engine`.
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == "auto":
+        name = select_engine(max_wer)
+    if name not in engines:
+        raise ValueError(f"Unknown engine {name!r}, choose from {engine_choices}")
+    return engines[name](threads)
+
+
+# ------------------------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------------------------
+def get_host() -> str:
+    return socket.gethostname()
+
+
+def load_benchmark() -> dict:
+    try:
+        return json.loads(path_benchmark.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return dict()
+
+
+def save_benchmark(data: dict):
+    path_benchmark.parent.mkdir(parents=True, exist_ok=True)
+    path_tmp = path_benchmark.with_name(f".{path_benchmark.name}.{os.getpid()}")
+    path_tmp.write_text(json.dumps(data, indent=4), encoding="utf-8")
+    os.replace(path_tmp, path_benchmark)
+
+
+def select_engine(max_wer: float = default_max_wer) -> str:
+    """
+    The fastest benchmarked engine of this host whose measured word error
+    rate is within ``max_wer``, or :data:`default_engine` when there is no
+    usable benchmark. An engine benchmarked without a reference transcript
+    has no word error rate and does not qualify.
+    """
+    results = load_benchmark().get(get_host(), {}).get("engines", {})
+    candidates = [
+        (result["realtime_factor"], name)
+        for name, result in results.items()
+        if name in engines
+        and name != "fake"
+        and result.get("ok")
+        and result.get("wer") is not None
+        and result["wer"] <= max_wer
+        and engines[name]().is_available()
+    ]
+    if not candidates:
+        return default_engine
+    return max(candidates)[1]
+
+
+def run_measured(
+    args: list[str],
+    stdout: typing.IO | None = None,
+) -> tuple[int, float, int]:
+    """
+    Run a command and measure it.
+
+    Args:
+        args: Command line
+        stdout: File the output goes to (default: discarded)
+
+    Returns:
+        ``(returncode, elapsed_seconds, peak_rss_bytes)``
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, stdout=stdout or subprocess.DEVNULL)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, elapsed, maxrss_to_bytes(rusage.ru_maxrss)
+
+
+def maxrss_to_bytes(maxrss: int) -> int:
+    """
+    ``ru_maxrss`` is in KiB on Linux and in bytes on macOS.
+    """
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def get_peak_rss() -> tuple[int, int]:
+    """
+    Peak resident memory so far, in bytes.
+
+    Returns:
+        ``(this_process, largest_child_process)``, the largest child among the
+        engine / ffmpeg processes that have finished
+    """
+    import resource
+
+    return (
+        maxrss_to_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+        maxrss_to_bytes(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss),
+    )
+
+
+_word_pattern = re.compile(r"\w+", re.UNICODE)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Word level edit distance divided by the number of reference words,
+    case and punctuation insensitive, timestamps ignored.
+    """
+    import segments
+
+    def words(text: str) -> list[str]:
+        try:
+            text = " ".join(segment.text for segment in segments.parse_transcript(text))
+        except ValueError:
+            pass  # plain text, no timestamps to drop
+        return [word.lower() for word in _word_pattern.findall(text)]
+
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, word_ref in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, word_hyp in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (word_ref != word_hyp),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def benchmark_engine(
+    engine: Engine,
+    path_clip: Path,
+    reference: str | None = None,
+) -> dict:
+    """
+    Transcribe the calibration clip with one engine and measure it.
+    """
+    duration = audio_utils.probe_duration(path_clip)
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        path_output = Path(dir_tmp) / "output.txt"
+        if isinstance(engine, WhisperCppEngine):
+            # Reads only WAV and writes its transcript to stdout, the WAV is
+            # decoded up front so only whisper-cli itself is measured
+            path_wav = path_clip
+            if path_clip.suffix.lower() != ".wav":
+                path_wav = Path(dir_tmp) / "input.wav"
+                audio_utils.extract_wav(path_clip, path_wav)
+            with path_output.open("w", encoding="utf-8") as f:
+                returncode, elapsed, peak_rss = run_measured(
+                    engine.command(path_wav, path_output), stdout=f
+                )
+        else:
+            returncode, elapsed, peak_rss = run_measured(
+                engine.command(path_clip, path_output)
+            )
+        text = path_output.read_text(encoding="utf-8") if path_output.exists() else ""
+    result = {
+        "ok": returncode == 0,
+        "seconds": elapsed,
+        "realtime_factor": duration / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss / 1024 / 1024 if peak_rss else None,
+        "wer": None,
+    }
+    if reference is not None and result["ok"]:
+        result["wer"] = word_error_rate(reference, text)
+    return result
+
+
+def run_benchmark(
+    path_clip: Path,
+    path_reference: Path | None = None,
+    names: list[str] | None = None,
+) -> dict:
+    """
+    Benchmark the available engines (or ``names``) on this host and save the
+    results, see the module docstring.
+    """
+    reference = path_reference.read_text(encoding="utf-8") if path_reference else None
+    results = dict()
+    for name in names or list(engines):
+        engine = engines[name]()
+        if not engine.is_available():
+            print(f"✗ {name}: not installed, skipped")
+            continue
+        print(f"Benchmarking {name} on {path_clip}")
+        results[name] = benchmark_engine(engine, path_clip, reference)
+    data = load_benchmark()
+    # Keep the thread / worker tuning of autotune.py
+    data.setdefault(get_host(), {}).update(
+        {
+            "cpu_count": os.cpu_count(),
+            "platform": platform.platform(),
+            "clip": str(path_clip),
+            "benchmarked_at": time.time(),
+            "engines": results,
+        }
+    )
+    save_benchmark(data)
+    return results
+
+
+def print_benchmark(results: dict, max_wer: float = default_max_wer):
+    print(f"{'engine':<14} {'realtime':>10} {'peak MB':>9} {'WER':>7}")
+    for name, result in results.items():
+        if not result["ok"]:
+            print(f"{name:<14} {'failed':>10}")
+            continue
+        peak = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] else "-"
+        wer = f"{result['wer']:.1%}" if result["wer"] is not None else "-"
+        print(f"{name:<14} {result['realtime_factor']:>9.1f}x {peak:>9} {wer:>7}")
+    print(f"✓ Results saved to {path_benchmark}")
+    print(f"✓ Auto-selected engine on this host: {select_engine(max_wer)}")
+
+
+def main_benchmark(argv: list[str] | None = None):
+    """
+    CLI of ``transcribe_audio.py benchmark``.
+    """
+    parser = argparse.ArgumentParser(
+        prog="transcribe_audio.py benchmark",
+        description="Measure every installed transcription engine on a calibration clip",
+    )
+    parser.add_argument(
+        "--clip",
+        type=str,
+        required=True,
+        help="Calibration audio clip, a minute or two of typical speech",
+    )
+    parser.add_argument(
+        "--reference",
+        type=str,
+        default=None,
+        help="Correct transcript of the clip, enables the word error rate (engines without one are never auto-selected)",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        action="append",
+        default=None,
+        choices=list(engines),
+        help="Only benchmark this engine, can be repeated (default: all installed, fake excluded)",
+    )
+    parser.add_argument(
+        "--max-wer",
+        type=float,
+        default=default_max_wer,
+        help=f"Word error rate an engine must stay within to be auto-selected (default: {default_max_wer})",
+    )
+    args = parser.parse_args(argv)
+    names = args.engine or [name for name in engines if name != "fake"]
+    results = run_benchmark(
+        path_clip=Path(args.clip).expanduser(),
+        path_reference=Path(args.reference).expanduser() if args.reference else None,
+        names=names,
+    )
+    print_benchmark(results, args.max_wer)
+
+
+def main_fake(argv: list[str] | None = None):
+    """
+    The fake engine process, see :class:`FakeEngine`.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", type=str, required=True)
+    parser.add_argument("--output", type=str, required=True)
+    args = parser.parse_args(argv)
+
+    import segments
+
+    duration = audio_utils.probe_duration(Path(args.input))
+    speed = float(os.environ.get("FAKE_ENGINE_SPEED", "50"))
+    time.sleep(duration / speed)
+    lines = list()
+    position = 0.0
+    while position < duration:
+        end = min(duration, position + 5.0)
+        lines.append(
+            f"[{segments.format_timestamp(position)} --> "
+            f"{segments.format_timestamp(end)}] segment {len(lines) + 1}\n"
+        )
+        position = end
+    Path(args.output).write_text("".join(lines), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["fake"]:
+        main_fake(sys.argv[2:])
+    else:
+        main_benchmark(sys.argv[1:])
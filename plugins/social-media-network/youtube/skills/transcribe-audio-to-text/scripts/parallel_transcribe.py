@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+"""
+Silence-Split Parallel Transcription
+
+A single audinota process uses one core for the whole file. This mode:
+
+1. finds the silent ranges of the file with ffmpeg's ``silencedetect``
+2. cuts it into chunks of about ``chunk_seconds``, each cut placed in the
+   middle of the silence closest to the target length. When there is no
+   silence near a target, the cut is forced and the next chunk starts
+   ``overlap`` seconds earlier so no word is lost at the seam.
+3. decodes every chunk to 16 kHz mono WAV and transcribes the chunks
+   concurrently, one audinota (or ``--engine``) process per chunk,
+   ``workers`` at a time
+4. stitches the chunk transcripts back in order: timestamps in the text
+   (``[HH:MM:SS]`` / ``HH:MM:SS.mmm -->``) are shifted by the chunk offset,
+   and the words repeated across a forced (overlapping) cut are dropped.
+   Every chunk is appended to the output as soon as it and the chunks before
+   it are done
+
+Example Usage:
+    $ python transcribe_audio.py --audio-file-path "~/Music/podcast.mp3" --parallel
+    $ python transcribe_audio.py --parallel --chunk-seconds 120 --workers 16
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import re
+import time
+import typing
+import tempfile
+import subprocess
+import dataclasses
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import engines
+import autotune
+import audio_utils
+import transcribe_audio
+
+default_chunk_seconds = 300.0
+default_overlap = 1.0
+
+_timestamp_pattern = re.compile(
+    r"(?P<h>\d{1,2}):(?P<m>\d{2}):(?P<s>\d{2})(?P<frac>[.,]\d{1,3})?"
+)
+_ts = r"\d{1,2}:\d{2}:\d{2}(?:[.,]\d{1,3})?"
+# The line-leading timestamp forms segments.parse_transcript() reads:
+# "[start --> end] text", "start --> end" (SRT/VTT cue) and "[start] text"
+_timestamp_prefix_pattern = re.compile(
+    rf"^[ \t]*(?:\[?[ \t]*{_ts}[ \t]*-->[ \t]*{_ts}|\[{_ts}\])",
+    re.MULTILINE,
+)
+_word_pattern = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclasses.dataclass
+class Chunk:
+    """
+    One range of the source audio.
+
+    Attributes:
+        index: Position in the file
+        start: Start in seconds
+        end: End in seconds
+        overlap: Seconds shared with the previous chunk (forced cuts only)
+    """
+
+    index: int
+    start: float
+    end: float
+    overlap: float = 0.0
+
+
+def plan_chunks(
+    duration: float,
+    silences: list[tuple[float, float]],
+    chunk_seconds: float = default_chunk_seconds,
+    overlap: float = default_overlap,
+) -> list[Chunk]:
+    """
+    Split ``[0, duration)`` into chunks of roughly ``chunk_seconds``, cutting
+    in silences found within half a chunk of every target.
+    """
+    midpoints = [(start + end) / 2 for start, end in silences]
+    chunks = list()
+    start = 0.0
+    pending_overlap = 0.0
+    while start < duration:
+        target = start + chunk_seconds
+        if target >= duration - chunk_seconds * 0.25:
+            # Do not leave a tiny last chunk behind
+            chunks.append(Chunk(len(chunks), start, duration, pending_overlap))
+            break
+        low, high = start + chunk_seconds * 0.5, start + chunk_seconds * 1.5
+        candidates = [mid for mid in midpoints if low <= mid <= min(high, duration)]
+        if candidates:
+            cut = min(candidates, key=lambda mid: abs(mid - target))
+            chunks.append(Chunk(len(chunks), start, cut, pending_overlap))
+            start, pending_overlap = cut, 0.0
+        else:
+            chunks.append(Chunk(len(chunks), start, target, pending_overlap))
+            start, pending_overlap = target - overlap, overlap
+    return chunks
+
+
+def map_timestamps(text: str, func: typing.Callable[[float], float]) -> str:
+    """
+    Replace every ``HH:MM:SS[.mmm]`` timestamp ``t`` at the start of a line
+    of ``text`` (``[start --> end]``, ``start --> end`` or ``[start]``) by
+    ``func(t)``, keeping its format. Times in the spoken text are left alone.
+    """
+
+    def replace(match: re.Match) -> str:
+        frac = match.group("frac") or ""
+        seconds = func(
+            int(match.group("h")) * 3600
+            + int(match.group("m")) * 60
+            + int(match.group("s"))
+            + (float("0." + frac[1:]) if frac else 0.0)
+        )
+        digits = len(frac) - 1 if frac else 0
+        units = round(seconds * 10**digits)
+        whole, fraction = divmod(units, 10**digits)
+        hours, rest = divmod(whole, 3600)
+        minutes, secs = divmod(rest, 60)
+        text = f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        if frac:
+            text += f"{frac[0]}{fraction:0{digits}d}"
+        return text
+
+    return _timestamp_prefix_pattern.sub(
+        lambda match: _timestamp_pattern.sub(replace, match.group(0)), text
+    )
+
+
+def shift_timestamps(text: str, offset: float) -> str:
+    """
+    Add ``offset`` seconds to every ``HH:MM:SS[.mmm]`` timestamp in ``text``.
+    """
+    if not offset:
+        return text
+    return map_timestamps(text, lambda seconds: seconds + offset)
+
+
+def merge_overlap(previous: str, text: str, max_words: int = 40) -> str:
+    """
+    Drop the start of ``text`` that repeats the end of ``previous``.
+
+    The longest run of (case and punctuation insensitive) words that ends
+    ``previous`` and starts ``text`` is removed from ``text``. Runs shorter
+    than two words are kept, they are too likely to be a coincidence.
+    """
+    prev_words = [w.lower() for w in _word_pattern.findall(previous)][-max_words:]
+    matches = list(_word_pattern.finditer(text))[:max_words]
+    next_words = [m.group().lower() for m in matches]
+    for n in range(min(len(prev_words), len(next_words)), 1, -1):
+        if prev_words[-n:] == next_words[:n]:
+            return text[matches[n - 1].end() :].lstrip(" ,.;:!?，。")
+    return text
+
+
+def transcribe_chunk(
+    path_audio: Path,
+    chunk: Chunk,
+    dir_work: Path,
+    engine: str = "audinota",
+    threads: int | None = None,
+) -> str:
+    """
+    Decode one chunk to WAV and transcribe it with its own engine process.
+    """
+    path_wav = dir_work / f"chunk-{chunk.index:05d}.wav"
+    path_txt = dir_work / f"chunk-{chunk.index:05d}.txt"
+    audio_utils.extract_wav(path_audio, path_wav, chunk.start, chunk.end)
+    engines.get_engine(engine, threads=threads).transcribe(
+        path_wav, path_txt, stdout=subprocess.DEVNULL
+    )
+    path_wav.unlink()
+    return path_txt.read_text(encoding="utf-8")
+
+
+def stitch_chunk(chunk: Chunk, text: str, previous: str | None) -> str:
+    """
+    Prepare one chunk transcript for appending after ``previous``, the
+    stitched text of the chunk before it, see the module docstring.
+    """
+    text = shift_timestamps(text.strip(), chunk.start)
+    if previous and chunk.overlap:
+        text = merge_overlap(previous, text)
+    return text
+
+
+def transcribe_audio_parallel(
+    path_audio: Path,
+    path_output: Path,
+    chunk_seconds: float = default_chunk_seconds,
+    workers: int | None = None,
+    overlap: float = default_overlap,
+    use_cache: bool = True,
+    on_text: typing.Callable[[Chunk, str], typing.Any] | None = None,
+    engine: str = "audinota",
+    threads: int | None = None,
+) -> Path:
+    """
+    Transcribe ``path_audio`` as silence-aligned chunks in parallel.
+
+    Chunks are appended to ``path_output`` in order as soon as they and all
+    the chunks before them are done, so the transcript grows while later
+    audio is still being transcribed.
+
+    Args:
+        path_audio: Audio file to transcribe
+        path_output: Where to write the stitched transcript
+        chunk_seconds: Target chunk length
+        workers: Concurrent engine processes (default: tuned, else CPU count)
+        overlap: Seconds repeated across a forced cut
+        use_cache: Use the transcript cache, see
+            :func:`transcribe_audio.transcribe_with_cache`
+        on_text: Called with every chunk and its stitched text right after
+            it was appended to ``path_output``
+        engine: Transcription engine, see ``engines.py``
+        threads: CPU threads per engine process (default: tuned, else
+            CPU count / ``workers``), see ``autotune.py``
+
+    Returns:
+        ``path_output``
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg or any audinota process fails
+    """
+    if use_cache:
+        transcribe_audio.transcribe_with_cache(
+            path_audio=path_audio,
+            path_output=path_output,
+            transcribe=lambda: transcribe_audio_parallel(
+                path_audio,
+                path_output,
+                chunk_seconds=chunk_seconds,
+                workers=workers,
+                overlap=overlap,
+                use_cache=False,
+                on_text=on_text,
+                engine=engine,
+                threads=threads,
+            ),
+            **engines.get_engine(engine).cache_params(),
+            mode="parallel",
+            chunk_seconds=chunk_seconds,
+            overlap=overlap,
+        )
+        return path_output
+
+    engines.get_engine(engine).ensure_available()
+    if not path_audio.exists():
+        raise FileNotFoundError(f"Audio file not found at {path_audio}")
+    workers, threads = autotune.resolve(engine, workers, threads)
+
+    start_time = time.perf_counter()
+    duration = audio_utils.probe_duration(path_audio)
+    silences = audio_utils.detect_silences(path_audio)
+    chunks = plan_chunks(duration, silences, chunk_seconds, overlap)
+    print(
+        f"Transcribing {path_audio} ({duration / 60:.1f} min) as {len(chunks)} "
+        f"chunks with {min(workers, len(chunks))} workers x {threads} threads"
+    )
+
+    path_output.parent.mkdir(parents=True, exist_ok=True)
+    with (
+        tempfile.TemporaryDirectory() as dir_tmp,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+        path_output.open("w", encoding="utf-8") as f,
+    ):
+        # map() yields in submission order, i.e. chunk by chunk
+        texts = executor.map(
+            lambda chunk: transcribe_chunk(
+                path_audio, chunk, Path(dir_tmp), engine, threads
+            ),
+            chunks,
+        )
+        previous = None
+        for chunk, text in zip(chunks, texts):
+            text = stitch_chunk(chunk, text, previous)
+            if not text:
+                continue
+            f.write(text + "\n")
+            f.flush()
+            previous = text
+            if on_text is not None:
+                on_text(chunk, text)
+    elapsed = time.perf_counter() - start_time
+    forced = sum(1 for chunk in chunks if chunk.overlap)
+    print("✓ Transcription completed successfully")
+    print(
+        f"✓ {len(chunks)} chunks ({forced} forced cuts) in {elapsed:.1f}s, "
+        f"{duration / elapsed:.1f}x realtime"
+    )
+    print(f"✓ Saved to: {path_output}")
+    return path_output
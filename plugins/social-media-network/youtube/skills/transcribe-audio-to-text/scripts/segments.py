@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""
+Timestamped Transcript Segments
+
+A transcript as a list of :class:`Segment` (start, end, text, confidence)
+instead of one string, so downstream stages can slice it by time, link to a
+timestamp or reprocess part of it without reading the whole document.
+
+Input:
+    :func:`parse_transcript` reads the timestamps the engine puts in the text,
+    in any of these forms::
+
+        [00:01:02.500 --> 00:01:05.000] text
+        [00:01:02.500] text                      (end = start of the next line)
+        00:01:02,500 --> 00:01:05,000            (SRT / VTT cue, text below)
+
+    Text without any timestamps (plain audinota output) is rejected: the
+    times would have to be made up. ``transcribe_audio.py --format`` only
+    accepts engines that write timestamps (``Engine.timestamps``).
+    ``confidence`` is always None: no engine reports a per-segment
+    confidence in its text output.
+
+Output formats:
+    - ``jsonl``: ``{"start": 62.5, "end": 65.0, "text": "...", "confidence": null}`` per line
+    - ``srt``: SubRip subtitles
+    - ``vtt``: WebVTT subtitles
+
+Example Usage:
+    $ python transcribe_audio.py --format srt
+    $ python transcribe_audio.py --audio-file-path "~/Music/podcast.mp3" --format jsonl
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import re
+import json
+import bisect
+import dataclasses
+from pathlib import Path
+
+formats = ["txt", "jsonl", "srt", "vtt"]
+
+_ts = r"(\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?"
+_range_pattern = re.compile(
+    rf"^\[?\s*(?P<start>{_ts})\s*-->\s*(?P<end>{_ts})\s*\]?\s*(?P<text>.*)$"
+)
+_start_pattern = re.compile(rf"^\[(?P<start>{_ts})\]\s*(?P<text>.*)$")
+_cue_index_pattern = re.compile(r"^\d+$")
+
+
+@dataclasses.dataclass(slots=True)
+class Segment:
+    """
+    One timed piece of transcript.
+
+    Attributes:
+        start: Start in seconds
+        end: End in seconds
+        text: Transcript text
+        confidence: Engine confidence in [0, 1], always None for now, no
+            engine reports one
+    """
+
+    start: float
+    end: float
+    text: str
+    confidence: float | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "text": self.text,
+            "confidence": self.confidence,
+        }
+
+
+def parse_timestamp(text: str) -> float:
+    """
+    ``"01:02:03.5"``, ``"1:02:03,500"`` or ``"02:03"`` to seconds.
+    """
+    parts = text.replace(",", ".").split(":")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_timestamp(seconds: float, separator: str = ".") -> str:
+    """
+    Seconds to ``HH:MM:SS.mmm`` (``separator=","`` for SRT).
+    """
+    millis = round(max(0.0, seconds) * 1000)
+    hours, millis = divmod(millis, 3600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def parse_transcript(text: str, duration: float | None = None) -> list[Segment]:
+    """
+    Split a transcript into segments, see the module docstring.
+
+    Args:
+        text: Transcript text
+        duration: Audio duration, the end of the last segment when the text
+            does not say
+
+    Raises:
+        ValueError: If the text has no timestamps
+    """
+    segments = list()
+    untimed = list()
+    open_ends = list()  # segments whose end is the start of the next one
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line == "WEBVTT" or _cue_index_pattern.match(line):
+            continue
+        match = _range_pattern.match(line)
+        if match:
+            start = parse_timestamp(match.group("start"))
+            for segment in open_ends:
+                segment.end = start
+            open_ends = list()
+            segments.append(
+                Segment(start, parse_timestamp(match.group("end")), match.group("text"))
+            )
+            continue
+        match = _start_pattern.match(line)
+        if match:
+            start = parse_timestamp(match.group("start"))
+            for segment in open_ends:
+                segment.end = start
+            segment = Segment(start, start, match.group("text"))
+            segments.append(segment)
+            open_ends = [segment]
+            continue
+        if segments:
+            # Cue text below an SRT / VTT timing line, or a wrapped line
+            last = segments[-1]
+            last.text = f"{last.text} {line}" if last.text else line
+        else:
+            untimed.append(line)
+
+    if untimed and not segments:
+        raise ValueError(
+            "The transcript has no timestamps, it cannot be split into timed segments"
+        )
+    for segment in open_ends:
+        segment.end = max(segment.start, duration or segment.start)
+    return segments
+
+
+def slice_segments(segments: list[Segment], start: float, end: float) -> list[Segment]:
+    """
+    Segments overlapping ``[start, end)``, ``segments`` must be sorted.
+    """
+    starts = [segment.start for segment in segments]
+    i = bisect.bisect_left(starts, end)
+    return [segment for segment in segments[:i] if segment.end > start]
+
+
+def to_jsonl(segments: list[Segment]) -> str:
+    return "".join(
+        json.dumps(segment.to_dict(), ensure_ascii=False) + "\n" for segment in segments
+    )
+
+
+def to_srt(segments: list[Segment]) -> str:
+    blocks = list()
+    for i, segment in enumerate(segments, start=1):
+        blocks.append(
+            f"{i}\n"
+            f"{format_timestamp(segment.start, ',')} --> {format_timestamp(segment.end, ',')}\n"
+            f"{segment.text}\n"
+        )
+    return "\n".join(blocks)
+
+
+def to_vtt(segments: list[Segment]) -> str:
+    blocks = ["WEBVTT\n"]
+    for segment in segments:
+        blocks.append(
+            f"{format_timestamp(segment.start)} --> {format_timestamp(segment.end)}\n"
+            f"{segment.text}\n"
+        )
+    return "\n".join(blocks)
+
+
+def to_txt(segments: list[Segment]) -> str:
+    return "".join(segment.text + "\n" for segment in segments)
+
+
+_writers = {"txt": to_txt, "jsonl": to_jsonl, "srt": to_srt, "vtt": to_vtt}
+
+
+def write_segments(segments: list[Segment], path: Path, format: str):
+    """
+    Write ``segments`` to ``path`` as one of :data:`formats`.
+    """
+    path.write_text(_writers[format](segments), encoding="utf-8")
+
+
+def convert_transcript(
+    path_transcript: Path,
+    format: str,
+    duration: float | None = None,
+) -> Path:
+    """
+    Write the segments of a text transcript next to it, as
+    ``${stem}.${format}``.
+
+    Returns:
+        Path of the segment file
+    """
+    text = path_transcript.read_text(encoding="utf-8")
+    segments = parse_transcript(text, duration)
+    path = path_transcript.with_suffix(f".{format}")
+    write_segments(segments, path, format)
+    print(f"✓ {len(segments)} segments saved to: {path}")
+    return path
+
+
+def read_segments(path: Path) -> list[Segment]:
+    """
+    Read segments back from a ``.jsonl``, ``.srt`` or ``.vtt`` file.
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".jsonl":
+        return [
+            Segment(**json.loads(line)) for line in text.splitlines() if line.strip()
+        ]
+    return parse_transcript(text)
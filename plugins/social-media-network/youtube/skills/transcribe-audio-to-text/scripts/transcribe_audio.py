@@ -9,6 +9,31 @@ accidentally overwriting existing files at custom locations.
 
 Key Features:
     - Transcribe audio files using audinota
+    - Accept the ASR-ready output profiles of the youtube-video-to-audio skill
+      (16 kHz mono WAV/FLAC or native opus), no MP3 decode + resample needed
+    - Streaming mode: yt-dlp -> ffmpeg -> audinota connected through pipes,
+      transcription starts while the download is running and no audio file
+      is written to disk
+    - Warm server: when transcribe_server.py is running with the requested
+      engine and model, transcribe there instead of starting a new process
+    - Transcript cache keyed by the audio content and the engine, a re-run on
+      the same audio (even at another path) returns instantly
+    - Streaming output: finished chunks are appended to the transcript while
+      later audio is still being transcribed, ``${output}.done`` marks the end
+    - Batch mode: a directory or glob, N files at a time, with a job manifest
+      so a crashed run resumes where it left off
+    - Timed segment output (start, end, text) as JSONL, SRT or VTT
+      next to the text transcript
+    - VAD pre-pass: drop silence and dead air before ASR, the timestamps of
+      the transcript still match the original audio
+    - Parallel mode: split long audio at silences into ~5 minute chunks and
+      transcribe them concurrently, one audinota process per core
+    - Windowed mode: decode multi-hour audio once into a memory-mapped PCM
+      scratch file and transcribe fixed overlapping windows, peak memory is
+      bounded by the window size
+    - Pluggable engines (audinota, whisper.cpp, a fake engine for tests):
+      ``benchmark`` measures them on this host and ``--engine auto`` picks the
+      fastest one that is accurate enough
     - Default output location with overwrite capability
     - Custom output locations with overwrite protection
     - Automatic directory creation for custom paths
@@ -29,70 +54,304 @@ Example Usage:
     # Custom audio file
     $ python transcribe_audio.py --audio-file-path "/path/to/audio.mp3"
 
+    # Audio downloaded with ``download_audio.py --profile asr``
+    $ python transcribe_audio.py --profile asr
+
+    # Stream a video straight into the transcriber, no intermediate audio file
+    $ python transcribe_audio.py --video-url "https://youtu.be/xyz" --stream
+
+    # Long recording: silence-split chunks transcribed on all cores
+    $ python transcribe_audio.py --audio-file-path "~/Music/podcast.mp3" --parallel
+
     # Custom output (cannot overwrite existing)
     $ python transcribe_audio.py --audio-file-path "/path/to/audio.mp3" --output "~/Documents/transcript.txt"
 
+    # Measure the installed engines once, later runs auto-select the best one
+    $ python transcribe_audio.py benchmark --clip "~/Music/clip.wav" --reference "~/Music/clip.txt"
+
 Requirements:
     - audinota installed at ~/Documents/GitHub/audinota-project/.venv/bin/audinota
     - Audio file must exist at specified path
+    - Streaming mode: yt-dlp and ffmpeg from the youtube-video-to-audio skill,
+      macOS or Linux (audinota reads the WAV stream from /dev/stdin)
+    - Parallel mode: ffmpeg from the youtube-video-to-audio skill
 
 Author: sanhe
 Plugin: youtube@sanhe-claude-code-plugins
 """
 
+import sys
+import time
+import typing
 import subprocess
 import argparse
 from pathlib import Path
 
+dir_here = Path(__file__).absolute().parent
+dir_skills = dir_here.parent.parent
 dir_home = Path.home()
 default_audio_path = dir_home / "tmp" / "download_audio_result.mp3"
 default_transcript_path = dir_home / "tmp" / "download_audio_result.txt"
-
-
-def transcribe_audio(path_audio: Path, path_output: Path = None):
+default_batch_output_dir = dir_home / "tmp" / "transcripts"
+path_audinota = (
+    dir_home
+    / "Documents"
+    / "GitHub"
+    / "audinota-project"
+    / ".venv"
+    / "bin"
+    / "audinota"
+)
+
+# File extension written by each ``download_audio.py --profile``
+audio_profile_extensions = {
+    "mp3": "mp3",
+    "asr": "wav",
+    "asr-flac": "flac",
+    "asr-opus": "opus",
+}
+
+
+def get_default_audio_path(profile: str = "mp3") -> Path:
+    """
+    Default input location for audio downloaded with the given profile.
     """
-    Transcribe an audio file to text using audinota.
+    ext = audio_profile_extensions[profile]
+    return dir_home / "tmp" / f"download_audio_result.{ext}"
+
+
+def transcribe_audio(
+    path_audio: Path,
+    path_output: Path = None,
+    use_server: bool = True,
+    use_cache: bool = True,
+    engine: str = "audinota",
+    threads: int | None = None,
+):
+    """
+    Transcribe an audio file to text using audinota (or another engine).
+
+    When the warm transcription server (``transcribe_server.py``) is running
+    with the backend and model of ``engine``, the file is transcribed there.
+    Otherwise a fresh engine process is started.
 
     Args:
         path_audio: Path to the audio file to transcribe
         path_output: Path to save the transcript (optional, audinota will use default if not specified)
+        use_server: Use the warm transcription server when it is running
+        use_cache: Serve the transcript from the transcript cache when the
+            same audio was transcribed before with the same engine
+            (needs ``path_output``)
+        engine: Transcription engine, see ``engines.py``. The warm server
+            is only used when it runs this engine and its model
+        threads: CPU threads of the engine process (default: engine default),
+            the warm server keeps the threads it was started with
 
     Raises:
         subprocess.CalledProcessError: If audinota transcription fails
     """
-    path_audinota = (
-        dir_home
-        / "Documents"
-        / "GitHub"
-        / "audinota-project"
-        / ".venv"
-        / "bin"
-        / "audinota"
+    if not (use_cache and path_output):
+        _transcribe_audio(path_audio, path_output, use_server, engine, threads)
+        return
+
+    import engines
+
+    # The server only takes requests of the same engine and model, so the
+    # key is the same wherever the transcript is made
+    transcribe_with_cache(
+        path_audio=path_audio,
+        path_output=path_output,
+        transcribe=lambda: _transcribe_audio(
+            path_audio, path_output, use_server, engine, threads
+        ),
+        **engines.get_engine(engine).cache_params(),
     )
 
-    if not path_audinota.exists():
-        raise FileNotFoundError(f"audinota not found at {path_audinota}")
+
+def _transcribe_audio(
+    path_audio: Path,
+    path_output: Path = None,
+    use_server: bool = True,
+    engine: str = "audinota",
+    threads: int | None = None,
+):
+    import engines
+
+    if use_server and transcribe_via_server(path_audio, path_output, engine):
+        return
+
+    asr = engines.get_engine(engine, threads=threads)
+    asr.ensure_available()
+
+    if not path_audio.exists():
+        raise FileNotFoundError(f"Audio file not found at {path_audio}")
+
+    threads_info = f", {threads} threads" if threads else ""
+    print(f"Transcribing audio file with {asr.name}{threads_info}: {path_audio}")
+    start = time.perf_counter()
+    asr.transcribe(path_audio, path_output)
+    elapsed = time.perf_counter() - start
+
+    output_location = path_output if path_output else "default location"
+    print_realtime_factor(path_audio, elapsed)
+    print(f"✓ Saved to: {output_location}")
+
+
+def print_realtime_factor(path_audio: Path, elapsed: float):
+    """
+    Print the wall time of a transcription and its realtime factor (audio
+    seconds per wall second), the time only when ffmpeg cannot tell the
+    duration.
+    """
+    import audio_utils
+
+    try:
+        duration = audio_utils.probe_duration(path_audio)
+    except (OSError, RuntimeError, subprocess.CalledProcessError):
+        print(f"✓ Transcription completed successfully in {elapsed:.1f}s")
+        return
+    print(
+        f"✓ Transcription completed successfully in {elapsed:.1f}s, "
+        f"{duration / elapsed:.1f}x realtime"
+    )
+
+
+def transcribe_with_cache(
+    path_audio: Path,
+    path_output: Path,
+    transcribe: typing.Callable[[], typing.Any],
+    **params,
+):
+    """
+    Copy the transcript from the transcript cache to ``path_output``, or run
+    ``transcribe()`` (which must write ``path_output``) and cache the result.
+
+    Args:
+        path_audio: Audio file, its content is part of the cache key
+        path_output: Transcript location
+        transcribe: Does the actual transcription on a cache miss
+        params: Engine parameters that change the transcript, part of the key
+    """
+    import transcript_cache
 
     if not path_audio.exists():
         raise FileNotFoundError(f"Audio file not found at {path_audio}")
+    cache = transcript_cache.TranscriptCache()
+    key = cache.make_key(transcript_cache.hash_audio(path_audio), **params)
+    if cache.restore(key, path_output):
+        print(f"✓ Transcript cache hit for {path_audio}")
+        print(f"✓ Saved to: {path_output}")
+    else:
+        transcribe()
+        cache.put(key, path_output)
+    cache.print_stats()
+
+
+def transcribe_via_server(
+    path_audio: Path,
+    path_output: Path = None,
+    engine: str = "audinota",
+) -> bool:
+    """
+    Transcribe on the warm transcription server.
+
+    Returns:
+        False when no server is running, or it runs another backend or model
+        than ``engine``, the caller should spawn the engine
+    """
+    import engines
+    import transcribe_server
+
+    if not transcribe_server.path_socket.exists():
+        return False
+    try:
+        status = transcribe_server.request({"command": "status"}, timeout=5)
+    except (OSError, ValueError):
+        # Stale socket left behind by a killed server
+        print(f"✗ Transcription server is not responding, starting {engine}")
+        return False
+    if (status["backend"], status.get("model")) != (
+        engine,
+        engines.get_engine(engine).model,
+    ):
+        return False
+    if not path_audio.exists():
+        raise FileNotFoundError(f"Audio file not found at {path_audio}")
+    print(f"Transcribing audio file on the warm server: {path_audio}")
+    try:
+        response = transcribe_server.transcribe(path_audio, path_output)
+    except OSError:
+        print(f"✗ Transcription server is not responding, starting {engine}")
+        return False
+    output_location = path_output if path_output else "default location"
+    print_realtime_factor(path_audio, response["seconds"])
+    print(f"✓ Saved to: {output_location}")
+    return True
+
+
+def transcribe_video_stream(
+    video_url: str,
+    path_output: Path,
+    quality: str = "bestaudio[abr<=64]/worstaudio",
+):
+    """
+    Stream a YouTube video's audio straight into audinota.
+
+    yt-dlp writes the audio stream to a pipe, ffmpeg decodes it to 16 kHz
+    mono PCM WAV on another pipe, and audinota reads that from its stdin.
+    Network download, decoding and transcription overlap, and no audio file
+    is ever written to disk.
+
+    Args:
+        video_url: YouTube video URL
+        path_output: Path to save the transcript
+        quality: yt-dlp quality selector, must select a single audio-only format
+
+    Raises:
+        subprocess.CalledProcessError: If yt-dlp, ffmpeg or audinota fails
+    """
+    if sys.platform in ["win32", "cygwin"]:  # pragma: no cover
+        raise RuntimeError(
+            "Streaming mode reads from /dev/stdin, it is not supported on Windows"
+        )
+
+    if not path_audinota.exists():
+        raise FileNotFoundError(f"audinota not found at {path_audinota}")
+
+    sys.path.append(str(dir_skills / "youtube-video-to-audio" / "scripts"))
+    import download_audio
+
+    download_audio.ensure_yt_dlp()
+    download_audio.ensure_ffmpeg()
 
     args = [
         str(path_audinota),
         "transcribe",
         "--input",
-        str(path_audio),
+        "/dev/stdin",
+        "--output",
+        str(path_output),
     ]
 
-    # Add output argument if specified
-    if path_output:
-        args.extend(["--output", str(path_output)])
-
-    print(f"Transcribing audio file: {path_audio}")
-    subprocess.run(args, check=True)
-
-    output_location = path_output if path_output else "default location"
-    print(f"✓ Transcription completed successfully")
-    print(f"✓ Saved to: {output_location}")
+    print(f"Streaming and transcribing: {video_url}")
+    start = time.perf_counter()
+    procs = download_audio.open_audio_stream(video_url=video_url, quality=quality)
+    try:
+        proc_audinota = subprocess.Popen(args, stdin=procs[-1].stdout)
+        procs[-1].stdout.close()
+        returncode = proc_audinota.wait()
+    except BaseException:
+        for proc in procs:
+            proc.kill()
+        raise
+    download_audio.wait_audio_stream(procs)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args)
+
+    # The stream has no duration up front, and is paced by the download
+    elapsed = time.perf_counter() - start
+    print(f"✓ Transcription completed successfully in {elapsed:.1f}s")
+    print(f"✓ Saved to: {path_output}")
 
 
 def main():
@@ -119,7 +378,22 @@ def main():
     Note:
         - Default location (~/tmp/download_audio_result.txt) allows overwrite
         - Custom output locations cannot overwrite existing files
+        - ``transcribe_audio.py benchmark ...`` runs the engine benchmark,
+          see ``engines.py``
+        - ``transcribe_audio.py tune ...`` measures the best workers x threads,
+          see ``autotune.py``
     """
+    import engines
+
+    if sys.argv[1:2] == ["benchmark"]:
+        engines.main_benchmark(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["tune"]:
+        import autotune
+
+        autotune.main_tune(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Transcribe audio files to text using audinota",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -128,6 +402,17 @@ Examples:
   %(prog)s
   %(prog)s --audio-file-path "/path/to/audio.mp3"
   %(prog)s --audio-file-path "~/Music/podcast.mp3" --output "~/Documents/transcript.txt"
+  %(prog)s --profile asr
+  %(prog)s --video-url "https://youtu.be/xyz" --stream
+  %(prog)s --audio-file-path "~/Music/podcast.mp3" --parallel --workers 16
+  %(prog)s --audio-file-path "~/Music/lecture.mp3" --vad
+  %(prog)s --audio-file-path "~/Music/6h-stream.opus" --windowed
+  %(prog)s --audio-file-path "~/Music/podcast.mp3" --stream-output
+  %(prog)s --profile asr --format srt
+  %(prog)s --batch "~/Music/podcasts" --output-dir "~/tmp/transcripts" --workers 8
+  %(prog)s --engine whisper-cpp --parallel
+  %(prog)s benchmark --clip "~/Music/clip.wav" --reference "~/Music/clip.txt"
+  %(prog)s tune --clip "~/Music/clip.wav"
 
 Notes:
   - The default audio file path is the output of youtube-video-to-audio skill
@@ -140,8 +425,150 @@ Notes:
     parser.add_argument(
         "--audio-file-path",
         type=str,
-        default=str(default_audio_path),
-        help=f"Path to the audio file to transcribe (default: {default_audio_path})",
+        default=None,
+        help=f"Path to the audio file to transcribe (default: {default_audio_path}, or the --profile default)",
+    )
+
+    parser.add_argument(
+        "--video-url",
+        type=str,
+        default=None,
+        help="YouTube video URL to transcribe directly, requires --stream",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Pipe yt-dlp -> ffmpeg -> audinota, transcription starts during the download and no audio file is written",
+    )
+
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Split the audio at silences and transcribe the chunks concurrently",
+    )
+
+    parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=300.0,
+        help="Target chunk length for --parallel (default: 300)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Concurrent engine processes for --parallel / --stream-output (default: tuned, else CPU count), or files transcribed concurrently for --batch (default: tuned, else 4)",
+    )
+
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="CPU threads per engine process (default: tuned, else CPU count / workers with several processes, the engine default with one); run 'tune' to measure the best workers x threads",
+    )
+
+    parser.add_argument(
+        "--windowed",
+        action="store_true",
+        help="Decode once into a memory-mapped PCM scratch file and transcribe fixed overlapping windows one by one, peak memory does not grow with the duration",
+    )
+
+    parser.add_argument(
+        "--window-seconds",
+        type=float,
+        default=600.0,
+        help="Window length for --windowed (default: 600)",
+    )
+
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        metavar="DIR_OR_GLOB",
+        help="Transcribe every audio file of a directory (recursively) or glob, resumable through a job manifest",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=str(default_batch_output_dir),
+        help=f"Transcript directory for --batch, mirrors the input tree and holds the manifest (default: {default_batch_output_dir})",
+    )
+
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="With --batch, also retry files that failed in an earlier run",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="txt",
+        choices=["txt", "jsonl", "srt", "vtt"],
+        help="Also write timed segments next to the transcript as ${output stem}.jsonl / .srt / .vtt, needs an engine that writes timestamps, e.g. --engine whisper-cpp (default: txt only)",
+    )
+
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Transcribe chunk by chunk and append every finished chunk to the output right away, then write ${output}.done",
+    )
+
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="With --stream-output, also print every chunk as a JSON line on stdout (status messages go to stderr)",
+    )
+
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Detect speech first and transcribe only the speech regions, timestamps still match the original audio",
+    )
+
+    parser.add_argument(
+        "--vad-min-silence",
+        type=float,
+        default=1.0,
+        help="Shortest silence dropped by --vad, in seconds (default: 1.0)",
+    )
+
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="auto",
+        choices=engines.engine_choices,
+        help="Transcription engine, 'auto' picks the fastest accurate enough engine from the last 'benchmark' on this host, audinota without one (default: auto)",
+    )
+
+    parser.add_argument(
+        "--max-wer",
+        type=float,
+        default=engines.default_max_wer,
+        help=f"Highest benchmarked word error rate --engine auto accepts (default: {engines.default_max_wer})",
+    )
+
+    parser.add_argument(
+        "--no-server",
+        action="store_true",
+        help="Always spawn the engine, even when the warm transcription server is running",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always transcribe, do not use or fill the transcript cache",
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default="mp3",
+        choices=list(audio_profile_extensions),
+        help="Output profile the audio was downloaded with, selects the default audio file: 'asr' = .wav, 'asr-flac' = .flac, 'asr-opus' = .opus (default: mp3)",
     )
 
     parser.add_argument(
@@ -153,8 +580,41 @@ Notes:
 
     args = parser.parse_args()
 
+    engine = engines.get_engine(args.engine, args.max_wer).name
+    if args.engine == "auto":
+        print(f"Transcription engine: {engine}")
+    if args.format != "txt" and (args.stream or not engines.engines[engine].timestamps):
+        timed = [
+            name
+            for name, cls in engines.engines.items()
+            if cls.timestamps and name != "fake"
+        ]
+        parser.error(
+            f"--format {args.format} needs an engine that writes timestamps "
+            f"({', '.join(timed)}), {'audinota' if args.stream else engine} "
+            f"writes plain text"
+        )
+
+    if args.batch:
+        import batch_transcribe
+
+        batch_transcribe.transcribe_batch(
+            pattern=args.batch,
+            output_dir=Path(args.output_dir).expanduser(),
+            workers=args.workers,
+            retry_failed=args.retry_failed,
+            use_server=not args.no_server,
+            use_cache=not args.no_cache,
+            engine=engine,
+            threads=args.threads,
+        )
+        return
+
     # Convert to Path object and expand user home directory
-    audio_path = Path(args.audio_file_path).expanduser()
+    if args.audio_file_path:
+        audio_path = Path(args.audio_file_path).expanduser()
+    else:
+        audio_path = get_default_audio_path(args.profile)
 
     # Determine output path and check for existing files
     if args.output:
@@ -173,8 +633,99 @@ Notes:
         path_output = default_transcript_path
         path_output.unlink(missing_ok=True)
 
-    # Transcribe the audio
-    transcribe_audio(path_audio=audio_path, path_output=path_output)
+    if args.output and args.format != "txt" and path_output.suffix == f".{args.format}":
+        parser.error(
+            f"--output is the text transcript, the .{args.format} file is written next to it"
+        )
+
+    if args.stream:
+        if not args.video_url:
+            parser.error("--stream requires --video-url")
+        if args.engine not in ["auto", "audinota"]:
+            parser.error("--stream pipes the audio into audinota, it does not support --engine")
+        sys.path.append(str(dir_skills / "youtube-video-to-audio" / "scripts"))
+        import toolchain
+
+        try:
+            transcribe_video_stream(video_url=args.video_url, path_output=path_output)
+        except toolchain.VersionNotInstalled as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+    elif args.video_url:
+        parser.error("--video-url requires --stream")
+    elif args.stream_output:
+        import transcript_stream
+
+        transcript_stream.transcribe_audio_streaming(
+            path_audio=audio_path,
+            path_output=path_output,
+            jsonl=args.jsonl,
+            chunk_seconds=args.chunk_seconds,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            engine=engine,
+            threads=args.threads,
+        )
+    elif args.jsonl:
+        parser.error("--jsonl requires --stream-output")
+    elif args.vad:
+        import vad
+
+        vad.transcribe_audio_vad(
+            path_audio=audio_path,
+            path_output=path_output,
+            min_silence=args.vad_min_silence,
+            parallel=args.parallel,
+            chunk_seconds=args.chunk_seconds,
+            workers=args.workers,
+            use_server=not args.no_server,
+            use_cache=not args.no_cache,
+            engine=engine,
+            threads=args.threads,
+        )
+    elif args.windowed:
+        if args.parallel:
+            parser.error("--windowed transcribes one window at a time, it does not combine with --parallel")
+        import windowed_transcribe
+
+        windowed_transcribe.transcribe_audio_windowed(
+            path_audio=audio_path,
+            path_output=path_output,
+            window_seconds=args.window_seconds,
+            use_cache=not args.no_cache,
+            engine=engine,
+            threads=args.threads,
+        )
+    elif args.parallel:
+        import parallel_transcribe
+
+        parallel_transcribe.transcribe_audio_parallel(
+            path_audio=audio_path,
+            path_output=path_output,
+            chunk_seconds=args.chunk_seconds,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            engine=engine,
+            threads=args.threads,
+        )
+    else:
+        # Transcribe the audio
+        transcribe_audio(
+            path_audio=audio_path,
+            path_output=path_output,
+            use_server=not args.no_server,
+            use_cache=not args.no_cache,
+            engine=engine,
+            threads=args.threads,
+        )
+
+    if args.format != "txt":
+        import segments
+        import audio_utils
+
+        segments.convert_transcript(
+            path_output, args.format, audio_utils.probe_duration(audio_path)
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+"""
+Warm Transcription Server
+
+Every ``audinota transcribe`` call starts a fresh interpreter, imports the
+ASR stack and loads the model before the first second of audio is decoded.
+For a batch of short clips that fixed cost dominates. This server pays (part
+of) it once: it runs inside the audinota virtualenv and serves transcription
+requests over a Unix socket. ``transcribe_audio()`` sends its work to the
+server automatically when the socket is up and the server runs the backend
+and model of the requested ``--engine`` (so the transcript cache key is the
+same either way), and spawns the engine otherwise.
+
+Backends:
+    - ``audinota`` (default): calls the audinota CLI entry point in-process.
+      Only interpreter startup and imports are saved: every call goes through
+      audinota's ``main()``, which loads the model again
+    - ``faster-whisper``: loads a ``faster_whisper.WhisperModel`` once at
+      startup and writes a ``[start --> end] text`` line per segment. Serves
+      ``--engine faster-whisper``, whose spawned form is the one-shot ``run``
+      subcommand of this script
+
+Protocol:
+    One JSON object per line on ``~/.cache/sanhe-claude-code-plugins/youtube/transcribe.sock``.
+    Request ``{"input": "...", "output": "..."}``, response
+    ``{"ok": true, "output": "...", "seconds": 1.2}`` or
+    ``{"ok": false, "error": "..."}``. ``{"command": "status"}`` and
+    ``{"command": "shutdown"}`` manage the server. Requests are served one at
+    a time, concurrent clients wait in line.
+
+Example Usage:
+    # Start the server in the background (re-executes with the audinota venv python)
+    $ nohup python transcribe_server.py serve > ~/tmp/transcribe_server.log 2>&1 &
+    $ python transcribe_server.py serve --backend faster-whisper --model small
+
+    # transcribe_audio.py now uses it automatically
+    $ python transcribe_audio.py --audio-file-path "/path/to/clip.mp3"
+    $ python transcribe_audio.py --audio-file-path "/path/to/clip.mp3" --engine faster-whisper
+
+    # One request without a server (what --engine faster-whisper spawns)
+    $ python transcribe_server.py run --backend faster-whisper --input clip.wav --output clip.txt
+
+    $ python transcribe_server.py status
+    $ python transcribe_server.py stop
+
+Requirements:
+    - audinota installed at ~/Documents/GitHub/audinota-project/.venv/bin/audinota
+    - macOS or Linux (Unix socket)
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import importlib
+import socketserver
+from pathlib import Path
+
+import transcribe_audio
+
+dir_cache = Path.home() / ".cache" / "sanhe-claude-code-plugins" / "youtube"
+path_socket = dir_cache / "transcribe.sock"
+
+backends = ["audinota", "faster-whisper"]
+default_model = os.environ.get("FASTER_WHISPER_MODEL", "small")
+
+_entry_point_pattern = re.compile(r"^from (\S+) import (\S+)", re.MULTILINE)
+
+
+class AudinotaBackend:
+    """
+    Calls the function behind the ``audinota`` console script in-process.
+
+    This saves the interpreter startup and the imports of every call, not the
+    model load: audinota exposes no API to keep a loaded model, its ``main()``
+    loads it again on each request.
+    """
+
+    def __init__(self):
+        path = transcribe_audio.path_audinota
+        text = path.read_text(encoding="utf-8", errors="replace")
+        match = _entry_point_pattern.search(text)
+        if match is None:
+            raise RuntimeError(f"Cannot find the entry point in {path}")
+        module = importlib.import_module(match.group(1))
+        self.main = getattr(module, match.group(2))
+
+    def transcribe(self, path_input: Path, path_output: Path | None):
+        argv = ["audinota", "transcribe", "--input", str(path_input)]
+        if path_output:
+            argv.extend(["--output", str(path_output)])
+        sys.argv = argv
+        try:
+            code = self.main()
+        except SystemExit as e:
+            code = e.code
+        if code not in (None, 0):
+            raise RuntimeError(f"audinota exited with status {code}")
+
+
+def _format_timestamp(seconds: float) -> str:
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3600_000)
+    minutes, millis = divmod(millis, 60_000)
+    return f"{hours:02d}:{minutes:02d}:{millis // 1000:02d}.{millis % 1000:03d}"
+
+
+class FasterWhisperBackend:
+    """
+    Keeps one ``faster_whisper.WhisperModel`` loaded.
+    """
+
+    def __init__(self, model: str = default_model, threads: int = 0):
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(
+            model,
+            device="cpu",
+            compute_type="int8",
+            cpu_threads=threads,
+        )
+
+    def transcribe(self, path_input: Path, path_output: Path | None):
+        segments, _ = self.model.transcribe(str(path_input))
+        # Same timestamp form as segments.parse_transcript() reads
+        lines = [
+            f"[{_format_timestamp(segment.start)} --> "
+            f"{_format_timestamp(segment.end)}] {segment.text.strip()}\n"
+            for segment in segments
+        ]
+        path_output = path_output or path_input.with_suffix(".txt")
+        path_output.write_text("".join(lines), encoding="utf-8")
+
+
+def load_backend(backend: str, model: str = default_model, threads: int = 0):
+    if backend == "audinota":
+        return AudinotaBackend()
+    if backend == "faster-whisper":
+        return FasterWhisperBackend(model, threads)
+    raise ValueError(f"Unknown backend {backend!r}, choose from {backends}")
+
+
+class TranscribeServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, backend, backend_name: str, model: str | None):
+        self.backend = backend
+        self.backend_name = backend_name
+        self.model = model
+        self.lock = threading.Lock()
+        self.requests_served = 0
+        self.started_at = time.time()
+        super().__init__(str(path), TranscribeHandler)
+
+
+class TranscribeHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server: TranscribeServer = self.server
+        for line in self.rfile:
+            payload = dict()
+            try:
+                payload = json.loads(line)
+                response = self.dispatch(server, payload)
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            if payload.get("command") == "shutdown":
+                threading.Thread(target=server.shutdown).start()
+                return
+
+    def dispatch(self, server: TranscribeServer, request: dict) -> dict:
+        command = request.get("command", "transcribe")
+        if command in ["status", "shutdown"]:
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "backend": server.backend_name,
+                "model": server.model,
+                "requests_served": server.requests_served,
+                "uptime": time.time() - server.started_at,
+            }
+        path_input = Path(request["input"])
+        if not path_input.exists():
+            raise FileNotFoundError(f"Audio file not found at {path_input}")
+        path_output = Path(request["output"]) if request.get("output") else None
+        with server.lock:
+            start = time.perf_counter()
+            server.backend.transcribe(path_input, path_output)
+            elapsed = time.perf_counter() - start
+            server.requests_served += 1
+        return {
+            "ok": True,
+            "output": str(path_output) if path_output else None,
+            "seconds": elapsed,
+        }
+
+
+def request(payload: dict, path: Path | None = None, timeout: float | None = None) -> dict:
+    """
+    Send one request to the server and wait for its response.
+
+    Raises:
+        OSError: If the server is not running
+    """
+    path = path or path_socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("Transcription server closed the connection")
+    return json.loads(line)
+
+
+def is_running(path: Path | None = None) -> bool:
+    path = path or path_socket
+    if not path.exists():
+        return False
+    try:
+        return request({"command": "status"}, path, timeout=5)["ok"]
+    except (OSError, ValueError):
+        return False
+
+
+def transcribe(
+    path_input: Path,
+    path_output: Path | None = None,
+    path: Path | None = None,
+) -> dict:
+    """
+    Transcribe one file on the running server.
+
+    Raises:
+        OSError: If the server is not running
+        RuntimeError: If the transcription failed on the server
+    """
+    payload = {"input": str(Path(path_input).absolute())}
+    if path_output:
+        payload["output"] = str(Path(path_output).absolute())
+    response = request(payload, path)
+    if not response["ok"]:
+        raise RuntimeError(f"Transcription server: {response['error']}")
+    return response
+
+
+def serve(
+    backend: str = "audinota",
+    model: str = default_model,
+    path: Path | None = None,
+    threads: int = 0,
+):
+    """
+    Load the backend and serve until ``stop``.
+    """
+    path = path or path_socket
+    if is_running(path):
+        raise RuntimeError(f"A transcription server is already running on {path}")
+    path.unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    engine = load_backend(backend, model, threads)
+    print(f"✓ {backend} backend loaded in {time.perf_counter() - start:.1f}s")
+    model = model if backend == "faster-whisper" else None
+    with TranscribeServer(path, engine, backend, model) as server:
+        os.chmod(path, 0o600)
+        print(f"✓ Listening on {path} (pid {os.getpid()})")
+        try:
+            server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
+    print(f"✓ Stopped after {server.requests_served} requests")
+
+
+def get_venv_python() -> Path:
+    return transcribe_audio.path_audinota.parent / "python"
+
+
+def main():
+    """
+    Main CLI entry point for the warm transcription server.
+    """
+    parser = argparse.ArgumentParser(
+        description="Keep the transcription engine loaded and serve requests over a Unix socket",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    parser_serve = subparsers.add_parser("serve", help="Start the server in the foreground")
+    parser_run = subparsers.add_parser(
+        "run",
+        help="Load the backend, transcribe one file and exit, no server",
+    )
+    for sub_parser in [parser_serve, parser_run]:
+        sub_parser.add_argument(
+            "--backend",
+            type=str,
+            default="audinota",
+            choices=backends,
+            help="Engine to load (default: audinota)",
+        )
+        sub_parser.add_argument(
+            "--model",
+            type=str,
+            default=default_model,
+            help=f"Model name for the faster-whisper backend (default: {default_model})",
+        )
+        sub_parser.add_argument(
+            "--threads",
+            type=int,
+            default=0,
+            help="CPU threads of the faster-whisper backend (default: 0, every core)",
+        )
+    parser_run.add_argument("--input", type=str, required=True, help="Audio file")
+    parser_run.add_argument("--output", type=str, default=None, help="Transcript file")
+    subparsers.add_parser("status", help="Show whether the server is running")
+    subparsers.add_parser("stop", help="Stop the running server")
+    args = parser.parse_args()
+
+    if args.command in ["serve", "run"]:
+        # The engine lives in the audinota virtualenv, not in this interpreter
+        python = get_venv_python()
+        if python.exists() and Path(sys.prefix) != python.parent.parent:
+            os.execv(str(python), [str(python), __file__] + sys.argv[1:])
+    if args.command == "serve":
+        serve(backend=args.backend, model=args.model, threads=args.threads)
+    elif args.command == "run":
+        backend = load_backend(args.backend, args.model, args.threads)
+        path_output = Path(args.output) if args.output else None
+        backend.transcribe(Path(args.input), path_output)
+    elif args.command == "status":
+        try:
+            status = request({"command": "status"}, timeout=5)
+        except OSError:
+            print(f"✗ No transcription server on {path_socket}")
+            sys.exit(1)
+        print(
+            f"✓ {status['backend']} server pid {status['pid']}, "
+            f"{status['requests_served']} requests served, "
+            f"up {status['uptime'] / 60:.1f} min"
+        )
+    elif args.command == "stop":
+        try:
+            request({"command": "shutdown"}, timeout=5)
+        except OSError:
+            print(f"✗ No transcription server on {path_socket}")
+            sys.exit(1)
+        print("✓ Transcription server stopped")
+
+
+if __name__ == "__main__":
+    main()
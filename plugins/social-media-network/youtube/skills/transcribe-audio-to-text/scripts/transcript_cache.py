@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+"""
+Content-Addressed Transcript Cache
+
+Transcription is the most expensive CPU stage of the pipeline. This cache
+remembers its results, keyed by a SHA-256 of the audio bytes plus a hash of
+the engine parameters (engine name, model, language, chunking, ...). The key
+does not depend on the file path, so the same audio re-downloaded to another
+place, or transcribed again by a re-run of ``/yt-to-md``, is a hit, while a
+different engine or setting gets its own entry.
+
+Cache Layout:
+    ~/.cache/sanhe-claude-code-plugins/youtube/transcripts/${audio_hash}.${params_hash}.txt
+
+Entries are written to a temporary file and renamed into place, so a crash
+or a concurrent reader never sees a partial transcript. Like the audio cache
+of the youtube-video-to-audio skill, the cache has a size cap and evicts the
+least recently used entries first.
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+dir_home = Path.home()
+dir_transcript_cache = (
+    dir_home / ".cache" / "sanhe-claude-code-plugins" / "youtube" / "transcripts"
+)
+default_max_bytes = 512 * 1024 * 1024  # 512 MB
+
+
+def hash_audio(path_audio: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 of the audio file content, the path does not matter.
+    """
+    sha256 = hashlib.sha256()
+    with open(path_audio, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class TranscriptCache:
+    """
+    Size-capped LRU cache of transcripts on local disk.
+
+    Args:
+        dir_cache: Directory to store the cached transcripts in
+        max_bytes: Total size cap, least recently used entries are evicted
+            once the cache grows beyond it
+    """
+
+    def __init__(
+        self,
+        dir_cache: Path = dir_transcript_cache,
+        max_bytes: int = default_max_bytes,
+    ):
+        self.dir_cache = dir_cache
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(audio_hash: str, **params) -> str:
+        """
+        Build the cache key for an audio file and the engine parameters.
+
+        Args:
+            audio_hash: :func:`hash_audio` of the audio file
+            params: Anything that changes the transcript, e.g. ``engine``,
+                ``model``, ``language``
+
+        Returns:
+            Cache key like ``9f86d081884c7d65.3f2a9c1e0b7d4a58``
+        """
+        payload = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        params_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return f"{audio_hash[:32]}.{params_hash}"
+
+    def get_path(self, key: str) -> Path:
+        return self.dir_cache / f"{key}.txt"
+
+    def get(self, key: str) -> Path | None:
+        """
+        Look up a cache entry and mark it as recently used.
+
+        Returns:
+            Path to the cached transcript, or None on cache miss
+        """
+        path = self.get_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def restore(self, key: str, path_output: Path) -> bool:
+        """
+        Copy a cached transcript to ``path_output``.
+
+        Returns:
+            False on cache miss
+        """
+        path = self.get(key)
+        if path is None:
+            return False
+        path_output.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, path_output)
+        return True
+
+    def put(self, key: str, path_src: Path) -> Path:
+        """
+        Copy a transcript into the cache, then evict entries over the size cap.
+
+        Returns:
+            Path to the cached transcript
+        """
+        self.dir_cache.mkdir(parents=True, exist_ok=True)
+        path = self.get_path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.dir_cache, prefix=".", suffix=".part")
+        os.close(fd)
+        try:
+            shutil.copyfile(path_src, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        if not self.dir_cache.exists():
+            return []
+        entries = list()
+        for path in self.dir_cache.iterdir():
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self, keep: Path | None = None) -> list[Path]:
+        """
+        Delete least recently used entries until the cache fits ``max_bytes``.
+
+        Args:
+            keep: Entry that must not be evicted (usually the one just added)
+
+        Returns:
+            List of evicted paths
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = list()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted.append(path)
+        return evicted
+
+    def print_stats(self):
+        entries = self._entries()
+        size = sum(size for _, size, _ in entries)
+        print(
+            f"✓ Transcript cache: {self.hits} hits, {self.misses} misses this run, "
+            f"{len(entries)} entries ({size / 1024 / 1024:.1f} MB) in {self.dir_cache}"
+        )
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+Incremental Streaming Transcript Output
+
+Normally the transcript appears only after the last minute of audio is
+done, so the cleanup stage waits for the whole transcription. With
+``--stream-output`` the audio is transcribed chunk by chunk (see
+``parallel_transcribe.py``) and every finalized chunk is appended to the
+output file right away, optionally also printed as a JSON line on stdout::
+
+    {"index": 0, "start": 0.0, "end": 297.4, "text": "..."}
+    {"index": 1, "start": 297.4, "end": 601.2, "text": "..."}
+    {"done": true, "output": "/Users/me/tmp/download_audio_result.txt", "chunks": 2}
+
+Completion Marker:
+    ``${output}.done`` is removed when the run starts and written (atomically,
+    with a small JSON summary) once the transcript is complete. A consumer
+    tails the output file and stops when the marker exists and it has read
+    everything, see :func:`follow` and ``audio_transcript_cleanup.py --follow``.
+
+Example Usage:
+    $ python transcribe_audio.py --audio-file-path "~/Music/podcast.mp3" --stream-output
+    $ python transcribe_audio.py --stream-output --jsonl | my-consumer
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import sys
+import json
+import time
+import typing
+import contextlib
+from pathlib import Path
+
+import audio_utils
+import parallel_transcribe
+
+
+def get_marker_path(path_output: Path) -> Path:
+    """
+    Completion marker of a transcript, ``${path_output}.done``.
+    """
+    return path_output.with_name(path_output.name + ".done")
+
+
+def write_marker(path_output: Path, **summary):
+    path_marker = get_marker_path(path_output)
+    path_tmp = path_marker.with_name(f".{path_marker.name}.{os.getpid()}")
+    path_tmp.write_text(json.dumps(summary), encoding="utf-8")
+    os.replace(path_tmp, path_marker)
+
+
+def follow(
+    path_output: Path,
+    poll_interval: float = 1.0,
+    timeout: float | None = None,
+) -> typing.Iterator[str]:
+    """
+    Tail a streaming transcript: yield every complete line as soon as it is
+    written, stop once the completion marker exists and everything is read.
+
+    Args:
+        path_output: Transcript file, does not have to exist yet
+        poll_interval: Seconds between checks for new text
+        timeout: Give up after this many seconds without new text
+
+    Raises:
+        TimeoutError: If nothing new arrives within ``timeout``
+    """
+    path_marker = get_marker_path(path_output)
+    position = 0
+    buffer = b""
+    last_progress = time.monotonic()
+    while True:
+        # Check the marker first, so text written right before it is not missed
+        done = path_marker.exists()
+        if path_output.exists():
+            with path_output.open("rb") as f:
+                f.seek(position)
+                data = f.read()
+                position = f.tell()
+            if data:
+                last_progress = time.monotonic()
+                # Split on bytes, a read can end in the middle of a character
+                *lines, buffer = (buffer + data).split(b"\n")
+                yield from (line.decode("utf-8") + "\n" for line in lines)
+        if done:
+            if buffer:
+                yield buffer.decode("utf-8")
+            return
+        if timeout is not None and time.monotonic() - last_progress > timeout:
+            raise TimeoutError(f"No new transcript text in {path_output} for {timeout}s")
+        time.sleep(poll_interval)
+
+
+def transcribe_audio_streaming(
+    path_audio: Path,
+    path_output: Path,
+    jsonl: bool = False,
+    chunk_seconds: float = parallel_transcribe.default_chunk_seconds,
+    workers: int | None = None,
+    use_cache: bool = True,
+    engine: str = "audinota",
+    threads: int | None = None,
+) -> Path:
+    """
+    Transcribe chunk by chunk, appending every finalized chunk to
+    ``path_output``, then write the completion marker.
+
+    Args:
+        path_audio: Audio file to transcribe
+        path_output: Transcript file, written incrementally
+        jsonl: Also print every chunk as a JSON line on stdout, all other
+            output goes to stderr
+        chunk_seconds: Target chunk length
+        workers: Concurrent engine processes (default: tuned, else CPU count)
+        use_cache: Use the transcript cache, a hit is emitted as one chunk
+        engine: Transcription engine, see ``engines.py``
+        threads: CPU threads per engine process, see ``autotune.py``
+
+    Returns:
+        ``path_output``
+    """
+    get_marker_path(path_output).unlink(missing_ok=True)
+    stdout = sys.stdout
+    chunks = list()
+
+    def on_text(chunk: parallel_transcribe.Chunk, text: str):
+        chunks.append(chunk)
+        if jsonl:
+            record = {
+                "index": chunk.index,
+                "start": round(chunk.start, 3),
+                "end": round(chunk.end, 3),
+                "text": text,
+            }
+            stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stdout.flush()
+
+    redirect = contextlib.redirect_stdout(sys.stderr) if jsonl else contextlib.nullcontext()
+    with redirect:
+        parallel_transcribe.transcribe_audio_parallel(
+            path_audio,
+            path_output,
+            chunk_seconds=chunk_seconds,
+            workers=workers,
+            use_cache=use_cache,
+            on_text=on_text,
+            engine=engine,
+            threads=threads,
+        )
+        if not chunks and jsonl:
+            # Cache hit, the transcript was copied in one go
+            text = path_output.read_text(encoding="utf-8").strip()
+            duration = audio_utils.probe_duration(path_audio)
+            on_text(parallel_transcribe.Chunk(0, 0.0, duration), text)
+        write_marker(path_output, done=True, chunks=len(chunks))
+        print(f"✓ Completion marker: {get_marker_path(path_output)}")
+    if jsonl:
+        record = {"done": True, "output": str(path_output), "chunks": len(chunks)}
+        stdout.write(json.dumps(record) + "\n")
+        stdout.flush()
+    return path_output
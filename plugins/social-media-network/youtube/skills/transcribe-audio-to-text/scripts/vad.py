@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""
+Voice Activity Detection Pre-Pass
+
+Lectures and live streams contain long silences, dead air and quiet intros,
+and the ASR engine spends as much time on those as on speech. With ``--vad``:
+
+1. the audio is decoded once to 16 kHz mono WAV
+2. speech regions are detected as the complement of ffmpeg's
+   ``silencedetect`` ranges (silences shorter than ``min_silence`` are kept,
+   every region is padded by ``padding`` seconds so no word onset is cut)
+3. only the speech regions are concatenated into a condensed WAV, which is
+   what gets transcribed
+4. a :class:`TimeMap` translates every timestamp in the transcript from the
+   condensed audio back to the original audio
+
+The run summary reports the fraction of audio skipped and the ASR time saved,
+estimated from the measured speed on the speech that was transcribed.
+
+Example Usage:
+    $ python transcribe_audio.py --audio-file-path "~/Music/lecture.mp3" --vad
+    $ python transcribe_audio.py --vad --vad-min-silence 2 --parallel
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import time
+import wave
+import bisect
+import tempfile
+import dataclasses
+from pathlib import Path
+
+import engines
+import audio_utils
+import transcribe_audio
+import parallel_transcribe
+
+default_noise_db = -35.0
+default_min_silence = 1.0
+default_padding = 0.25
+
+
+@dataclasses.dataclass
+class TimeMap:
+    """
+    Maps times in the condensed (speech only) audio to the original audio.
+
+    Attributes:
+        regions: ``(start, end)`` of every kept region in the original audio
+        offsets: Start of every region in the condensed audio
+    """
+
+    regions: list[tuple[float, float]]
+    offsets: list[float] = dataclasses.field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.offsets:
+            position = 0.0
+            for start, end in self.regions:
+                self.offsets.append(position)
+                position += end - start
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.regions)
+
+    def to_original(self, seconds: float) -> float:
+        if not self.regions:
+            return seconds
+        i = max(0, bisect.bisect_right(self.offsets, seconds) - 1)
+        start, end = self.regions[i]
+        return min(start + seconds - self.offsets[i], end)
+
+
+def detect_speech(
+    path_audio: Path,
+    duration: float,
+    noise_db: float = default_noise_db,
+    min_silence: float = default_min_silence,
+    padding: float = default_padding,
+) -> list[tuple[float, float]]:
+    """
+    Speech regions of an audio file, as padded, merged ``(start, end)`` pairs.
+    """
+    silences = audio_utils.detect_silences(path_audio, noise_db, min_silence)
+    regions = list()
+    position = 0.0
+    for start, end in silences + [(duration, duration)]:
+        if start > position:
+            region_start = max(0.0, position - padding)
+            region_end = min(duration, start + padding)
+            if regions and region_start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], region_end)
+            else:
+                regions.append((region_start, region_end))
+        position = max(position, end)
+    return regions
+
+
+def write_speech_wav(
+    path_wav: Path,
+    regions: list[tuple[float, float]],
+    path_output: Path,
+):
+    """
+    Concatenate ``regions`` of a PCM WAV into ``path_output``.
+    """
+    with wave.open(str(path_wav), "rb") as f_in, wave.open(str(path_output), "wb") as f_out:
+        f_out.setparams(f_in.getparams())
+        rate = f_in.getframerate()
+        total = f_in.getnframes()
+        for start, end in regions:
+            first = min(total, int(start * rate))
+            last = min(total, int(end * rate))
+            f_in.setpos(first)
+            f_out.writeframes(f_in.readframes(last - first))
+
+
+def transcribe_audio_vad(
+    path_audio: Path,
+    path_output: Path,
+    noise_db: float = default_noise_db,
+    min_silence: float = default_min_silence,
+    padding: float = default_padding,
+    parallel: bool = False,
+    chunk_seconds: float = parallel_transcribe.default_chunk_seconds,
+    workers: int | None = None,
+    use_server: bool = True,
+    use_cache: bool = True,
+    engine: str = "audinota",
+    threads: int | None = None,
+) -> Path:
+    """
+    Transcribe only the speech regions of ``path_audio``.
+
+    Args:
+        path_audio: Audio file to transcribe
+        path_output: Where to write the transcript
+        noise_db: Anything quieter than this (dBFS) counts as silence
+        min_silence: Shortest silence to drop, in seconds
+        padding: Seconds of context kept around every speech region
+        parallel: Transcribe the condensed audio with
+            :func:`parallel_transcribe.transcribe_audio_parallel`
+        chunk_seconds: Target chunk length for ``parallel``
+        workers: Concurrent engine processes for ``parallel``
+        use_server: Use the warm transcription server when it is running
+        use_cache: Use the transcript cache
+        engine: Transcription engine, see ``engines.py``
+        threads: CPU threads per engine process, see ``autotune.py``
+
+    Returns:
+        ``path_output``
+    """
+    if use_cache:
+        transcribe_audio.transcribe_with_cache(
+            path_audio=path_audio,
+            path_output=path_output,
+            transcribe=lambda: transcribe_audio_vad(
+                path_audio,
+                path_output,
+                noise_db=noise_db,
+                min_silence=min_silence,
+                padding=padding,
+                parallel=parallel,
+                chunk_seconds=chunk_seconds,
+                workers=workers,
+                use_server=use_server,
+                use_cache=False,
+                engine=engine,
+                threads=threads,
+            ),
+            **engines.get_engine(engine).cache_params(),
+            mode="vad-parallel" if parallel else "vad",
+            noise_db=noise_db,
+            min_silence=min_silence,
+            padding=padding,
+            chunk_seconds=chunk_seconds if parallel else None,
+        )
+        return path_output
+
+    if not path_audio.exists():
+        raise FileNotFoundError(f"Audio file not found at {path_audio}")
+
+    start_time = time.perf_counter()
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        dir_tmp = Path(dir_tmp)
+        path_wav = dir_tmp / "full.wav"
+        audio_utils.extract_wav(path_audio, path_wav)
+        duration = audio_utils.probe_duration(path_wav)
+        time_map = TimeMap(
+            detect_speech(path_wav, duration, noise_db, min_silence, padding)
+        )
+        path_speech = dir_tmp / "speech.wav"
+        write_speech_wav(path_wav, time_map.regions, path_speech)
+        path_wav.unlink()
+
+        speech = time_map.speech_seconds
+        skipped = duration - speech
+        print(
+            f"VAD: {len(time_map.regions)} speech regions, "
+            f"{speech / 60:.1f} of {duration / 60:.1f} min kept"
+        )
+        path_condensed_txt = dir_tmp / "speech.txt"
+        start = time.perf_counter()
+        if not time_map.regions:
+            path_condensed_txt.write_text("", encoding="utf-8")
+        elif parallel:
+            parallel_transcribe.transcribe_audio_parallel(
+                path_speech,
+                path_condensed_txt,
+                chunk_seconds=chunk_seconds,
+                workers=workers,
+                use_cache=False,
+                engine=engine,
+                threads=threads,
+            )
+        else:
+            transcribe_audio._transcribe_audio(
+                path_speech, path_condensed_txt, use_server, engine, threads
+            )
+        elapsed = time.perf_counter() - start
+        text = path_condensed_txt.read_text(encoding="utf-8")
+
+    path_output.parent.mkdir(parents=True, exist_ok=True)
+    path_output.write_text(
+        parallel_transcribe.map_timestamps(text, time_map.to_original),
+        encoding="utf-8",
+    )
+    saved = skipped * elapsed / speech if speech else 0.0
+    fraction = skipped / duration if duration else 0.0
+    total = time.perf_counter() - start_time
+    print(
+        f"✓ VAD skipped {skipped / 60:.1f} min ({fraction:.0%} of the audio), "
+        f"saving about {saved:.1f}s of ASR time"
+    )
+    print(f"✓ {duration / 60:.1f} min of audio in {total:.1f}s, {duration / total:.1f}x realtime")
+    print(f"✓ Saved to: {path_output}")
+    return path_output
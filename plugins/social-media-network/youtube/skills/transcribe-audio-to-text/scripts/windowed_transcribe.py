@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bounded-Memory Windowed Transcription
+
+Handing a multi-hour recording to the engine as one file makes its memory
+grow with the duration, and long jobs get OOM-killed. ``--windowed``
+bounds the peak memory by the window size instead:
+
+1. the audio is decoded once, streaming, into a scratch file of raw 16 kHz
+   mono PCM (about 115 MB per hour) next to the transcript
+2. the scratch file is memory-mapped, and the pages of every window are
+   released (``MADV_DONTNEED``) once it is copied out, so only the window
+   being read is resident, never the whole recording
+3. fixed windows of ``window_seconds`` (the last one may be up to a quarter
+   longer), each starting ``overlap`` seconds before the previous one ends,
+   are copied out of the map into a small WAV and transcribed one after
+   the other, one engine process per window
+4. the window transcripts are stitched like ``--parallel`` chunks: timestamps
+   are shifted by the window start and the words repeated in the overlap are
+   dropped. Every window is appended to the output as soon as it is done
+
+The run summary reports the peak memory of this process and of the largest
+engine / ffmpeg process, to size containers with (a child's peak includes
+what it shared with this process before it started the engine).
+
+Example Usage:
+    $ python transcribe_audio.py --audio-file-path "~/Music/6h-stream.opus" --windowed
+    $ python transcribe_audio.py --windowed --window-seconds 300 --engine whisper-cpp
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import mmap
+import time
+import wave
+import tempfile
+from pathlib import Path
+
+import engines
+import audio_utils
+import transcribe_audio
+import parallel_transcribe
+
+default_window_seconds = 600.0
+default_overlap = 2.0
+
+
+def write_window_wav(
+    pcm: mmap.mmap,
+    window: parallel_transcribe.Chunk,
+    path_output: Path,
+):
+    """
+    Copy ``[window.start, window.end)`` of the memory-mapped PCM into a WAV,
+    then drop the pages read from the resident memory of this process.
+    """
+    frame = audio_utils.sample_width
+    first = min(len(pcm), int(window.start * audio_utils.sample_rate) * frame)
+    last = min(len(pcm), int(window.end * audio_utils.sample_rate) * frame)
+    with memoryview(pcm) as view, wave.open(str(path_output), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(frame)
+        f.setframerate(audio_utils.sample_rate)
+        f.writeframes(view[first:last])
+    if hasattr(mmap, "MADV_DONTNEED"):  # not on Windows
+        start = first - first % mmap.PAGESIZE
+        if last > start:
+            pcm.madvise(mmap.MADV_DONTNEED, start, last - start)
+
+
+def transcribe_audio_windowed(
+    path_audio: Path,
+    path_output: Path,
+    window_seconds: float = default_window_seconds,
+    overlap: float = default_overlap,
+    use_cache: bool = True,
+    engine: str = "audinota",
+    threads: int | None = None,
+) -> Path:
+    """
+    Transcribe ``path_audio`` window by window with bounded memory, see the
+    module docstring.
+
+    Args:
+        path_audio: Audio file to transcribe
+        path_output: Where to write the stitched transcript, the PCM scratch
+            file is created in the same directory
+        window_seconds: Window length
+        overlap: Seconds shared by consecutive windows
+        use_cache: Use the transcript cache, see
+            :func:`transcribe_audio.transcribe_with_cache`
+        engine: Transcription engine, see ``engines.py``
+        threads: CPU threads of the engine process (default: engine default)
+
+    Returns:
+        ``path_output``
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg or the engine fails
+    """
+    if use_cache:
+        transcribe_audio.transcribe_with_cache(
+            path_audio=path_audio,
+            path_output=path_output,
+            transcribe=lambda: transcribe_audio_windowed(
+                path_audio,
+                path_output,
+                window_seconds=window_seconds,
+                overlap=overlap,
+                use_cache=False,
+                engine=engine,
+                threads=threads,
+            ),
+            **engines.get_engine(engine).cache_params(),
+            mode="windowed",
+            window_seconds=window_seconds,
+            overlap=overlap,
+        )
+        return path_output
+
+    asr = engines.get_engine(engine, threads=threads)
+    asr.ensure_available()
+    if not path_audio.exists():
+        raise FileNotFoundError(f"Audio file not found at {path_audio}")
+
+    start_time = time.perf_counter()
+    path_output.parent.mkdir(parents=True, exist_ok=True)
+    # On disk, not in /tmp: /tmp is RAM-backed on some hosts
+    with tempfile.TemporaryDirectory(dir=path_output.parent) as dir_tmp:
+        dir_tmp = Path(dir_tmp)
+        path_pcm = dir_tmp / "audio.pcm"
+        print(f"Decoding {path_audio} to {path_pcm}")
+        audio_utils.decode_pcm(path_audio, path_pcm)
+        size = path_pcm.stat().st_size
+        if size == 0:
+            path_output.write_text("", encoding="utf-8")
+            print(f"✓ No audio in {path_audio}")
+            return path_output
+        frame_bytes = audio_utils.sample_rate * audio_utils.sample_width
+        duration = size / frame_bytes
+        # No silences: fixed windows, every cut forced, every seam overlapping
+        windows = parallel_transcribe.plan_chunks(duration, [], window_seconds, overlap)
+        print(
+            f"Transcribing {duration / 60:.1f} min as {len(windows)} windows of "
+            f"{window_seconds / 60:.1f} min with {asr.name}"
+        )
+
+        with (
+            path_pcm.open("rb") as f_pcm,
+            mmap.mmap(f_pcm.fileno(), 0, access=mmap.ACCESS_READ) as pcm,
+            path_output.open("w", encoding="utf-8") as f,
+        ):
+            previous = None
+            for window in windows:
+                path_wav = dir_tmp / "window.wav"
+                path_txt = dir_tmp / "window.txt"
+                write_window_wav(pcm, window, path_wav)
+                asr.transcribe(path_wav, path_txt)
+                text = parallel_transcribe.stitch_chunk(
+                    window, path_txt.read_text(encoding="utf-8"), previous
+                )
+                path_txt.unlink()
+                print(
+                    f"✓ Window {window.index + 1}/{len(windows)} "
+                    f"({window.start / 60:.1f} - {window.end / 60:.1f} min)"
+                )
+                if not text:
+                    continue
+                f.write(text + "\n")
+                f.flush()
+                previous = text
+
+    elapsed = time.perf_counter() - start_time
+    peak_self, peak_child = engines.get_peak_rss()
+    print("✓ Transcription completed successfully")
+    print(
+        f"✓ {len(windows)} windows in {elapsed:.1f}s, "
+        f"{duration / elapsed:.1f}x realtime"
+    )
+    print(
+        f"✓ Peak memory: {peak_self / 1024 / 1024:.0f} MB this process, "
+        f"{peak_child / 1024 / 1024:.0f} MB largest engine / ffmpeg process"
+    )
+    print(f"✓ Saved to: {path_output}")
+    return path_output
@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+
+"""
+YouTube Captions to Text
+
+This module provides a caption-first fast path for turning a YouTube video into
+a plain-text transcript. It probes the video's subtitle tracks through yt-dlp,
+fetches the best acceptable track and converts it to the same plain-text
+transcript format that the transcribe-audio-to-text skill writes. Only when no
+acceptable track exists does it fall back to downloading the audio and
+transcribing it locally.
+
+Key Features:
+    - One yt-dlp metadata probe, no audio download when captions exist
+    - Prefers manual subtitles over auto-generated captions
+    - Ignores machine-translated auto captions (only the original language is used)
+    - De-duplicates the rolling lines of auto-generated captions
+    - Falls back to youtube-video-to-audio + transcribe-audio-to-text
+    - Time range (--start/--end) and chapter (--chapter) scoped transcripts,
+      on both the caption path and the audio fallback
+
+Default Behavior:
+    - Output: ~/tmp/download_audio_result.txt (allows overwrite), the same
+      location transcribe-audio-to-text writes to, so later steps do not change
+    - Languages: the video's own language, then English
+    - Auto-generated captions: accepted
+
+Custom Output:
+    - Cannot overwrite existing files (raises FileExistsError)
+    - Creates parent directories automatically
+
+Example Usage:
+    # Captions if available, otherwise download + transcribe
+    $ python fetch_captions.py --video-url "https://www.youtube.com/watch?v=d6rZtgHcbWA"
+
+    # Only accept manual subtitles in Chinese or English, never fall back
+    $ python fetch_captions.py --video-url "https://youtu.be/xyz" --lang zh-Hans,en --no-auto-captions --no-fallback
+
+    # Only the "Q&A" chapter
+    $ python fetch_captions.py --video-url "https://youtu.be/xyz" --chapter "Q&A"
+
+Requirements:
+    - yt-dlp (auto-downloaded by the youtube-video-to-audio skill)
+    - For the fallback path: ffmpeg and audinota, see the other two skills
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import re
+import sys
+import json
+import html
+import argparse
+import subprocess
+import urllib.request
+from pathlib import Path
+
+dir_here = Path(__file__).absolute().parent
+dir_skills = dir_here.parent.parent
+sys.path.append(str(dir_skills / "youtube-video-to-audio" / "scripts"))
+sys.path.append(str(dir_skills / "transcribe-audio-to-text" / "scripts"))
+
+import download_audio
+import transcribe_audio
+
+default_transcript_path = transcribe_audio.default_transcript_path
+
+# Caption formats we know how to convert, in order of preference
+caption_formats = ["json3", "vtt"]
+
+
+class NoCaptionsError(Exception):
+    """
+    Raised when a video has no acceptable subtitle track.
+    """
+
+
+def probe_video_info(video_url: str) -> dict:
+    """
+    Fetch the video's metadata, including its subtitle tracks, without
+    downloading any media.
+    """
+    args = [
+        f"{download_audio.path_yt_dlp}",
+        "--dump-single-json",
+        "--skip-download",
+        "--no-playlist",
+        video_url,
+    ]
+    result = subprocess.run(args, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def select_caption_track(
+    info: dict,
+    langs: list[str] | None = None,
+    allow_auto: bool = True,
+) -> tuple[str, dict, bool] | None:
+    """
+    Pick the best subtitle track from yt-dlp's video info.
+
+    Manual subtitles always win over auto-generated captions. For auto
+    captions only the original language track is accepted, YouTube's
+    machine-translated variants are too lossy to replace ASR.
+
+    Args:
+        info: yt-dlp ``--dump-single-json`` output
+        langs: Acceptable language codes in order of preference. Defaults to
+            the video's own language followed by English.
+        allow_auto: Accept auto-generated captions
+
+    Returns:
+        ``(language, track, is_auto)`` where ``track`` is the yt-dlp format
+        dict with ``ext`` and ``url``, or None if no track is acceptable
+    """
+    if not langs:
+        langs = [lang for lang in [info.get("language"), "en"] if lang]
+
+    def match(tracks: dict, lang: str) -> tuple[str, list] | None:
+        # "en" should match "en-US" and "en-orig" style keys as well
+        for key in [lang, f"{lang}-orig"] + sorted(tracks):
+            if key in tracks and (key == lang or key.split("-")[0] == lang):
+                return key, tracks[key]
+        return None
+
+    def pick_format(formats: list[dict]) -> dict | None:
+        for ext in caption_formats:
+            for fmt in formats:
+                if fmt.get("ext") == ext and fmt.get("url"):
+                    return fmt
+        return None
+
+    subtitles = {
+        k: v for k, v in (info.get("subtitles") or {}).items() if k != "live_chat"
+    }
+    for lang in langs:
+        found = match(subtitles, lang)
+        if found:
+            fmt = pick_format(found[1])
+            if fmt:
+                return found[0], fmt, False
+
+    if allow_auto:
+        original = info.get("language")
+        auto = info.get("automatic_captions") or {}
+        for lang in langs:
+            if original and lang.split("-")[0] != original.split("-")[0]:
+                continue
+            for key in [f"{lang}-orig", lang]:
+                if key in auto:
+                    fmt = pick_format(auto[key])
+                    if fmt:
+                        return key, fmt, True
+    return None
+
+
+def json3_to_lines(content: str) -> list[tuple[float, str]]:
+    """
+    Convert a YouTube ``json3`` caption document to ``(start_seconds, text)`` lines.
+    """
+    data = json.loads(content)
+    lines = list()
+    for event in data.get("events", []):
+        segs = event.get("segs")
+        if not segs:
+            continue
+        text = "".join(seg.get("utf8", "") for seg in segs)
+        text = " ".join(text.split())
+        if text:
+            lines.append((event.get("tStartMs", 0) / 1000, text))
+    return lines
+
+
+_vtt_timing = re.compile(r"^((?:\d+:)?\d{2}:\d{2}\.\d{3})\s+-->")
+_vtt_tag = re.compile(r"<[^>]+>")
+
+
+def vtt_to_lines(content: str) -> list[tuple[float, str]]:
+    """
+    Convert a WebVTT caption document to ``(start_seconds, text)`` lines.
+    """
+    lines = list()
+    cue_start = None
+    for raw in content.splitlines():
+        line = raw.strip()
+        match = _vtt_timing.match(line)
+        if match:
+            cue_start = download_audio.parse_timestamp(match.group(1))
+            continue
+        if not line:
+            cue_start = None
+            continue
+        if cue_start is not None:
+            text = html.unescape(_vtt_tag.sub("", line)).strip()
+            if text:
+                lines.append((cue_start, text))
+    return lines
+
+
+def resolve_chapter(info: dict, chapter: str) -> tuple[float, float]:
+    """
+    Find the time range of the first chapter whose title matches the regex.
+
+    Returns:
+        ``(start_seconds, end_seconds)``
+
+    Raises:
+        re.error: If ``chapter`` is not a valid regular expression
+        ValueError: If no chapter matches
+    """
+    pattern = re.compile(chapter)
+    chapters = info.get("chapters") or []
+    for item in chapters:
+        if pattern.search(item.get("title", "")):
+            return item["start_time"], item["end_time"]
+    titles = ", ".join(repr(item.get("title", "")) for item in chapters)
+    raise ValueError(f"No chapter matches {chapter!r} (chapters: {titles or 'none'})")
+
+
+def dedupe_lines(lines: list[str]) -> list[str]:
+    """
+    Remove the repetition of rolling auto-generated captions, where every cue
+    repeats the previous line before adding new words.
+    """
+    result = list()
+    # The previous full caption line, ``result[-1]`` may only hold its new tail
+    previous = None
+    for line in lines:
+        if previous is not None and line == previous:
+            continue
+        if previous is not None and line.startswith(previous):
+            tail = line[len(previous) :].strip()
+            if tail:
+                result.append(tail)
+        else:
+            result.append(line)
+        previous = line
+    return result
+
+
+def captions_to_text(
+    content: str,
+    ext: str,
+    start: float | None = None,
+    end: float | None = None,
+) -> str:
+    """
+    Convert a caption document into a plain-text transcript.
+
+    Args:
+        content: Caption document
+        ext: Caption format, ``"json3"`` or ``"vtt"``
+        start: Drop lines starting before this many seconds
+        end: Drop lines starting at or after this many seconds
+    """
+    if ext == "json3":
+        lines = json3_to_lines(content)
+    elif ext == "vtt":
+        lines = vtt_to_lines(content)
+    else:  # pragma: no cover
+        raise ValueError(f"Unsupported caption format: {ext}")
+    texts = [
+        text
+        for line_start, text in lines
+        if (start is None or line_start >= start)
+        and (end is None or line_start < end)
+    ]
+    return "\n".join(dedupe_lines(texts)) + "\n"
+
+
+def fetch_captions(
+    video_url: str,
+    path_output: Path,
+    langs: list[str] | None = None,
+    allow_auto: bool = True,
+    start: str | float | None = None,
+    end: str | float | None = None,
+    chapter: str | None = None,
+) -> str:
+    """
+    Write the video's captions to ``path_output`` as a plain-text transcript.
+
+    Args:
+        video_url: YouTube video URL
+        path_output: Path to save the transcript
+        langs: Acceptable language codes in order of preference
+        allow_auto: Accept auto-generated captions
+        start: Only keep captions from this timestamp on
+        end: Only keep captions before this timestamp
+        chapter: Only keep captions of the chapter whose title matches this regex
+
+    Returns:
+        Description of the used track, e.g. ``"en (auto)"``
+
+    Raises:
+        NoCaptionsError: If the video has no acceptable subtitle track
+    """
+    info = probe_video_info(video_url)
+    selected = select_caption_track(info, langs=langs, allow_auto=allow_auto)
+    if selected is None:
+        raise NoCaptionsError(f"No acceptable subtitle track for {video_url}")
+    lang, track, is_auto = selected
+    if chapter:
+        start, end = resolve_chapter(info, chapter)
+    with urllib.request.urlopen(track["url"]) as response:
+        content = response.read().decode("utf-8")
+    text = captions_to_text(
+        content,
+        track["ext"],
+        start=download_audio.parse_timestamp(start) if start is not None else None,
+        end=download_audio.parse_timestamp(end) if end is not None else None,
+    )
+    path_output.write_text(text, encoding="utf-8")
+    return f"{lang} ({'auto' if is_auto else 'manual'})"
+
+
+def video_to_transcript(
+    video_url: str,
+    path_output: Path,
+    langs: list[str] | None = None,
+    allow_auto: bool = True,
+    fallback: bool = True,
+    start: str | float | None = None,
+    end: str | float | None = None,
+    chapter: str | None = None,
+) -> str:
+    """
+    Caption-first transcript: use captions when available, otherwise download
+    the audio and transcribe it.
+
+    Returns:
+        ``"captions"`` or ``"audio"``, the path that produced the transcript
+    """
+    try:
+        track = fetch_captions(
+            video_url=video_url,
+            path_output=path_output,
+            langs=langs,
+            allow_auto=allow_auto,
+            start=start,
+            end=end,
+            chapter=chapter,
+        )
+        print(f"✓ Using captions: {track}")
+        return "captions"
+    except NoCaptionsError as e:
+        if not fallback:
+            raise
+        print(f"{e}, falling back to audio download + transcription")
+
+    download_audio.path_audio.unlink(missing_ok=True)
+    path_audio = download_audio.download_audio(
+        video_url=video_url,
+        start=start,
+        end=end,
+        chapter=chapter,
+    )
+    transcribe_audio.transcribe_audio(
+        path_audio=Path(path_audio),
+        path_output=path_output,
+    )
+    return "audio"
+
+
+def main():
+    """
+    Main CLI entry point for the caption-first transcript fast path.
+
+    Example usage:
+        # Captions if available, otherwise download + transcribe
+        python fetch_captions.py --video-url "https://www.youtube.com/watch?v=d6rZtgHcbWA"
+
+        # Exit with code 2 instead of falling back when no captions exist
+        python fetch_captions.py --video-url "https://youtu.be/xyz" --no-fallback
+
+    Note:
+        - Default location (~/tmp/download_audio_result.txt) allows overwrite
+        - Custom output locations cannot overwrite existing files
+    """
+    parser = argparse.ArgumentParser(
+        description="Fetch YouTube captions as a plain-text transcript, falling back to audio transcription",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --video-url "https://www.youtube.com/watch?v=d6rZtgHcbWA"
+  %(prog)s --video-url "https://youtu.be/xyz" --lang zh-Hans,en
+  %(prog)s --video-url "https://youtu.be/xyz" --no-auto-captions --no-fallback
+  %(prog)s --video-url "https://youtu.be/xyz" --start 1:05:00 --end 1:20:30
+  %(prog)s --video-url "https://youtu.be/xyz" --chapter "Q&A"
+
+Exit codes:
+  0 - Transcript written (from captions or from the audio fallback)
+  2 - No acceptable captions and --no-fallback was given
+        """,
+    )
+
+    parser.add_argument(
+        "--video-url",
+        type=str,
+        required=True,
+        help="YouTube video URL (required)",
+    )
+
+    parser.add_argument(
+        "--lang",
+        type=str,
+        default=None,
+        help="Comma separated caption languages in order of preference (default: video language, then en)",
+    )
+
+    parser.add_argument(
+        "--no-auto-captions",
+        action="store_true",
+        help="Only accept manually created subtitles",
+    )
+
+    parser.add_argument(
+        "--no-fallback",
+        action="store_true",
+        help="Do not fall back to audio download + transcription when no captions exist",
+    )
+
+    parser.add_argument(
+        "--start",
+        type=str,
+        default=None,
+        help="Only transcribe from this timestamp on, seconds or [HH:]MM:SS",
+    )
+
+    parser.add_argument(
+        "--end",
+        type=str,
+        default=None,
+        help="Only transcribe up to this timestamp, seconds or [HH:]MM:SS",
+    )
+
+    parser.add_argument(
+        "--chapter",
+        type=str,
+        default=None,
+        help="Only transcribe the chapter whose title matches this regular expression",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help=f"Output file path for transcript (default: {default_transcript_path}). Note: Default location allows overwrite, custom locations cannot overwrite existing files.",
+    )
+
+    args = parser.parse_args()
+
+    if args.chapter and (args.start or args.end):
+        parser.error("--chapter cannot be combined with --start/--end")
+    if args.chapter:
+        try:
+            re.compile(args.chapter)
+        except re.error as e:
+            parser.error(f"--chapter is not a valid regular expression: {e}")
+
+    if args.output:
+        path_output = Path(args.output).expanduser()
+        if (path_output != default_transcript_path) and path_output.exists():
+            raise FileExistsError(
+                f"Output file already exists at {path_output}. "
+                f"Please choose a different location or remove the existing file. "
+                f"(Default location {default_transcript_path} allows overwrite)"
+            )
+    else:
+        path_output = default_transcript_path
+        path_output.unlink(missing_ok=True)
+    path_output.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        download_audio.ensure_yt_dlp()
+    except download_audio.toolchain.VersionNotInstalled as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    langs = args.lang.split(",") if args.lang else None
+    try:
+        source = video_to_transcript(
+            video_url=args.video_url,
+            path_output=path_output,
+            langs=langs,
+            allow_auto=not args.no_auto_captions,
+            fallback=not args.no_fallback,
+            start=args.start,
+            end=args.end,
+            chapter=args.chapter,
+        )
+    except NoCaptionsError as e:
+        print(f"✗ {e}")
+        sys.exit(2)
+    except (ValueError, re.error) as e:
+        # A --chapter that matches no chapter or an unparsable --start/--end
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    print(f"✓ Transcript created from {source}")
+    print(f"✓ Saved to: {path_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Content-Addressed Audio Cache
+
+A persistent local cache for downloaded audio files. Entries are keyed by the
+canonical YouTube video ID plus a hash of the download parameters (quality
+selector, audio format, bitrate, ...), so the same video requested through
+``youtu.be``, ``/shorts/`` or ``&t=`` URL forms maps to the same entry, while
+a different bitrate or format gets its own entry.
+
+Cache Layout:
+    ~/.cache/sanhe-claude-code-plugins/youtube/audio/${video_id}.${params_hash}.${audio_format}
+
+Eviction:
+    The cache has a size cap. Every hit refreshes the entry's mtime, and when
+    the total size exceeds the cap the least recently used entries (oldest
+    mtime) are deleted first.
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+dir_home = Path.home()
+dir_audio_cache = (
+    dir_home / ".cache" / "sanhe-claude-code-plugins" / "youtube" / "audio"
+)
+default_max_bytes = 5 * 1024 * 1024 * 1024  # 5 GB
+
+
+class AudioCache:
+    """
+    Size-capped LRU cache of audio files on local disk.
+
+    Args:
+        dir_cache: Directory to store the cached audio files in
+        max_bytes: Total size cap, least recently used entries are evicted
+            once the cache grows beyond it
+    """
+
+    def __init__(
+        self,
+        dir_cache: Path = dir_audio_cache,
+        max_bytes: int = default_max_bytes,
+    ):
+        self.dir_cache = dir_cache
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(video_id: str, **params) -> str:
+        """
+        Build the cache key for a video and its download parameters.
+
+        Args:
+            video_id: Canonical 11 character YouTube video ID
+            params: Anything that changes the produced audio bytes, e.g.
+                ``quality``, ``audio_format``, ``bitrate``
+
+        Returns:
+            Cache key like ``d6rZtgHcbWA.3f2a9c1e0b7d4a58``
+        """
+        payload = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        params_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return f"{video_id}.{params_hash}"
+
+    def get_path(self, key: str, audio_format: str) -> Path:
+        return self.dir_cache / f"{key}.{audio_format}"
+
+    def get(self, key: str, audio_format: str) -> Path | None:
+        """
+        Look up a cache entry and mark it as recently used.
+
+        Returns:
+            Path to the cached audio file, or None on cache miss
+        """
+        path = self.get_path(key, audio_format)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, audio_format: str, path_src: Path) -> Path:
+        """
+        Copy an audio file into the cache, then evict entries over the size cap.
+
+        The copy is written to a temporary file in the cache directory and
+        renamed into place, so concurrent readers never see a partial file.
+
+        Returns:
+            Path to the cached audio file
+        """
+        self.dir_cache.mkdir(parents=True, exist_ok=True)
+        path = self.get_path(key, audio_format)
+        fd, tmp = tempfile.mkstemp(dir=self.dir_cache, prefix=".", suffix=".part")
+        os.close(fd)
+        try:
+            shutil.copyfile(path_src, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Path | None = None) -> list[Path]:
+        """
+        Delete least recently used entries until the cache fits ``max_bytes``.
+
+        Args:
+            keep: Entry that must not be evicted (usually the one just added)
+
+        Returns:
+            List of evicted paths
+        """
+        if not self.dir_cache.exists():
+            return []
+        entries = list()
+        total = 0
+        for path in self.dir_cache.iterdir():
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        evicted = list()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted.append(path)
+        return evicted
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""
+Offline Download Path Benchmark
+
+Measures the fixed costs of the download path against the local fake
+YouTube (fake_youtube.py), so regressions show up without any network and
+without depending on YouTube's speed of the day:
+
+- bootstrap: ``download_yt_dlp()`` into an empty directory
+- release_lookup_cold / release_lookup_cached: ``get_latest_yt_dlp_release()``
+  without and with a fresh release cache
+- per_video: one ``download_audio()`` call with the cache bypassed, i.e.
+  the overhead of launching yt-dlp and handling its output for one video
+- batch_throughput: videos per second of ``download_audio_batch()``
+- cache_hit: one ``download_audio()`` call served from the audio cache
+
+Every timing is the median of ``--rounds`` runs. ``--output`` saves the
+results as JSON, ``--baseline`` compares against a saved run and exits with
+status 1 when any metric is worse by more than ``--tolerance``, which makes
+the script usable as a CI performance gate.
+
+Example Usage:
+    $ python benchmark_download.py
+    $ python benchmark_download.py --rounds 10 --videos 40 --workers 8 --output ~/tmp/bench.json
+    $ python benchmark_download.py --baseline ~/tmp/bench.json --tolerance 0.25
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+import contextlib
+from pathlib import Path
+
+import download_audio
+from fake_youtube import FakeYouTube
+
+
+def _median_seconds(func, rounds: int) -> float:
+    timings = list()
+    for i in range(rounds):
+        start = time.perf_counter()
+        func(i)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_benchmarks(
+    rounds: int = 5,
+    videos: int = 20,
+    workers: int = 4,
+    audio_seconds: float = 10.0,
+    bandwidth: int | None = None,
+) -> dict:
+    """
+    Run the whole suite against a fresh :class:`FakeYouTube`.
+
+    Returns:
+        Mapping of metric name to ``{"value", "unit", "better"}``, where
+        ``better`` is ``"lower"`` or ``"higher"``
+    """
+    results = dict()
+
+    def add(name: str, value: float, unit: str, better: str = "lower"):
+        results[name] = {"value": value, "unit": unit, "better": better}
+
+    with FakeYouTube(
+        audio_seconds=audio_seconds,
+        playlist_size=max(videos, rounds),
+        bandwidth=bandwidth,
+    ) as fake:
+        dir_root = fake.dir_root
+        # The bootstrap prints its progress, which is noise here
+        with contextlib.redirect_stdout(None):
+
+            def bootstrap(i: int):
+                download_audio.path_release_cache.unlink(missing_ok=True)
+                download_audio.download_yt_dlp(force=True)
+
+            add("bootstrap", _median_seconds(bootstrap, rounds), "s")
+
+        def lookup_cold(i: int):
+            download_audio.path_release_cache.unlink(missing_ok=True)
+            download_audio.get_latest_yt_dlp_release()
+
+        add("release_lookup_cold", _median_seconds(lookup_cold, rounds), "s")
+        add(
+            "release_lookup_cached",
+            _median_seconds(lambda i: download_audio.get_latest_yt_dlp_release(), rounds),
+            "s",
+        )
+
+        def per_video(i: int):
+            download_audio.download_audio(
+                video_url=fake.video_url(i),
+                audio_format="wav",
+                output_path=str(dir_root / f"per-video-{i}.wav"),
+                use_cache=False,
+                engine="subprocess",
+            )
+
+        add("per_video", _median_seconds(per_video, rounds), "s")
+
+        with contextlib.redirect_stdout(None):
+            start = time.perf_counter()
+            download_audio.download_audio_batch(
+                video_urls=[fake.video_url(i) for i in range(videos)],
+                output_dir=dir_root / "batch",
+                workers=workers,
+                audio_format="wav",
+                use_cache=False,
+                engine="subprocess",
+            )
+            elapsed = time.perf_counter() - start
+        add("batch_throughput", videos / elapsed, "videos/s", better="higher")
+
+        download_audio.download_audio(
+            video_url=fake.video_url(0),
+            audio_format="wav",
+            output_path=str(dir_root / "warm.wav"),
+            engine="subprocess",
+        )
+
+        def cache_hit(i: int):
+            download_audio.download_audio(
+                video_url=fake.video_url(0),
+                audio_format="wav",
+                output_path=str(dir_root / f"hit-{i}.wav"),
+                engine="subprocess",
+            )
+
+        add("cache_hit", _median_seconds(cache_hit, rounds), "s")
+    return results
+
+
+def compare_to_baseline(
+    results: dict,
+    baseline: dict,
+    tolerance: float = 0.2,
+    min_seconds: float = 0.002,
+) -> list[str]:
+    """
+    Find the metrics that are worse than ``baseline`` by more than
+    ``tolerance`` (a fraction, 0.2 = 20%). Timings that moved by less than
+    ``min_seconds`` are scheduler noise and never count as a regression.
+
+    Returns:
+        One message per regression, empty when there is none
+    """
+    regressions = list()
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["value"], result["value"]
+        if result["better"] == "lower":
+            worse = new > old * (1 + tolerance)
+            if result["unit"] == "s" and new - old < min_seconds:
+                worse = False
+        else:
+            worse = new < old * (1 - tolerance)
+        if worse:
+            regressions.append(
+                f"{name}: {new:.4f} {result['unit']} vs baseline {old:.4f}"
+            )
+    return regressions
+
+
+def print_results(results: dict, baseline: dict | None = None):
+    header = f"{'metric':<24} {'value':>12} {'unit':<10}"
+    if baseline:
+        header += f" {'baseline':>12} {'change':>8}"
+    print(header)
+    for name, result in results.items():
+        line = f"{name:<24} {result['value']:>12.4f} {result['unit']:<10}"
+        if baseline and name in baseline:
+            old = baseline[name]["value"]
+            change = (result["value"] - old) / old * 100 if old else 0.0
+            line += f" {old:>12.4f} {change:>+7.1f}%"
+        print(line)
+
+
+def main():
+    """
+    Main CLI entry point for the offline download benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the download path against a local fake YouTube, no network needed",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="Runs per timing, the median is reported (default: 5)",
+    )
+    parser.add_argument(
+        "--videos",
+        type=int,
+        default=20,
+        help="Videos in the batch throughput run (default: 20)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Workers in the batch throughput run (default: 4)",
+    )
+    parser.add_argument(
+        "--audio-seconds",
+        type=float,
+        default=10.0,
+        help="Duration of every synthetic video (default: 10)",
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=int,
+        default=None,
+        help="Throttle the fake media server to this many bytes per second (default: no limit)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Save the results as JSON to this file",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="JSON results of an earlier run to compare against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed regression against --baseline as a fraction (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        rounds=max(1, args.rounds),
+        videos=max(1, args.videos),
+        workers=args.workers,
+        audio_seconds=args.audio_seconds,
+        bandwidth=args.bandwidth,
+    )
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).expanduser().read_text())
+    print_results(results, baseline)
+
+    if args.output:
+        path_output = Path(args.output).expanduser()
+        path_output.parent.mkdir(parents=True, exist_ok=True)
+        path_output.write_text(json.dumps(results, indent=4))
+        print(f"✓ Results saved to {path_output}")
+
+    if baseline:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"✗ Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"✓ No regression beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+Output Profile Timing Comparison
+
+Downloads the same video once per output profile (bypassing the audio cache)
+and measures what the transcriber actually pays for each one:
+
+- download: wall time of ``download_audio()``, i.e. network + ffmpeg encode
+- decode: wall time for ffmpeg to turn the file into 16 kHz mono PCM, which is
+  what every ASR engine does before inference. For the "asr" profile this is
+  a no-op copy, for "mp3" it is a full MP3 decode + resample.
+- size: bytes on disk
+
+Example Usage:
+    $ python benchmark_profiles.py --video-url "https://www.youtube.com/watch?v=d6rZtgHcbWA"
+    $ python benchmark_profiles.py --video-url "https://youtu.be/xyz" --profiles mp3,asr --rounds 3
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import download_audio
+
+
+def measure_decode(path_audio: Path) -> float:
+    """
+    Time a full decode of ``path_audio`` to 16 kHz mono s16 PCM.
+    """
+    args = [
+        f"{download_audio.path_ffmpeg}",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-i",
+        str(path_audio),
+        "-ar",
+        "16000",
+        "-ac",
+        "1",
+        "-f",
+        "s16le",
+        "-y",
+        "-",
+    ]
+    start = time.perf_counter()
+    subprocess.run(args, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def compare_profiles(
+    video_url: str,
+    profiles: list[str],
+    rounds: int = 1,
+) -> list[dict]:
+    """
+    Run every profile ``rounds`` times and keep the fastest run of each.
+
+    Returns:
+        One dict per profile with ``profile``, ``download``, ``decode``,
+        ``total`` (seconds) and ``size`` (bytes)
+    """
+    rows = list()
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        for profile in profiles:
+            best = None
+            for i in range(rounds):
+                audio_format = download_audio.output_profiles[profile]["audio_format"]
+                path_output = Path(dir_tmp) / f"{profile}-{i}.{audio_format}"
+                start = time.perf_counter()
+                download_audio.download_audio(
+                    video_url=video_url,
+                    output_path=str(path_output),
+                    use_cache=False,
+                    profile=profile,
+                )
+                elapsed_download = time.perf_counter() - start
+                elapsed_decode = measure_decode(path_output)
+                row = {
+                    "profile": profile,
+                    "download": elapsed_download,
+                    "decode": elapsed_decode,
+                    "total": elapsed_download + elapsed_decode,
+                    "size": path_output.stat().st_size,
+                }
+                if best is None or row["total"] < best["total"]:
+                    best = row
+                path_output.unlink()
+            rows.append(best)
+    return rows
+
+
+def print_comparison(rows: list[dict]):
+    """
+    Print the comparison table, relative to the first profile.
+    """
+    baseline = rows[0]["total"]
+    print(
+        f"{'profile':<10} {'download':>10} {'decode':>10} {'total':>10} {'size':>12} {'speedup':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['profile']:<10} "
+            f"{row['download']:>9.2f}s "
+            f"{row['decode']:>9.2f}s "
+            f"{row['total']:>9.2f}s "
+            f"{row['size']:>12,} "
+            f"{baseline / row['total']:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare download + decode time of the download_audio output profiles",
+    )
+    parser.add_argument(
+        "--video-url",
+        type=str,
+        required=True,
+        help="YouTube video URL to benchmark with (required)",
+    )
+    parser.add_argument(
+        "--profiles",
+        type=str,
+        default=",".join(download_audio.output_profiles),
+        help="Comma separated profiles, the first one is the baseline (default: all)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=1,
+        help="Runs per profile, the fastest one is reported (default: 1)",
+    )
+    args = parser.parse_args()
+
+    try:
+        download_audio.ensure_yt_dlp()
+    except download_audio.toolchain.VersionNotInstalled as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    download_audio.ensure_ffmpeg()
+
+    rows = compare_profiles(
+        video_url=args.video_url,
+        profiles=args.profiles.split(","),
+        rounds=args.rounds,
+    )
+    print_comparison(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,37 @@ yt-dlp binary management with built-in protection against overwriting existing f
 
 Key Features:
     - Download audio from YouTube videos as MP3 files
+    - Batch mode for playlists, channels and URL list files with a bounded
+      concurrent worker pool (one output file per video ID)
+    - Persistent size-capped LRU audio cache keyed by canonical video ID and
+      download parameters, repeat requests need zero network I/O
+    - ASR-ready output profiles (16 kHz mono WAV/FLAC, or the native opus
+      stream without re-encode) that skip the lossy MP3 round-trip
+    - Streaming mode: yt-dlp stdout piped through ffmpeg, so a consumer can
+      start working while the download is still running, with no temp file
+    - Partial downloads of a time range (--start/--end) or a chapter
+      (--chapter), only the selected range is fetched and transcoded
+    - In-process engine that drives yt-dlp as a library inside one long-lived
+      process (reused extractors and HTTP session), with the standalone
+      binary kept as the fallback engine
+    - Structured progress events (bytes, speed, ETA, download vs ffmpeg
+      post-processing time) as JSON lines or a callback, plus a per-video
+      metrics file
+    - Concurrent fragment downloads, partial-file resume and exponential
+      backoff retries with a per-video deadline; fatal errors (private,
+      removed, ...) fail fast so a batch never stalls on one bad URL
+    - Adaptive format selection (--quality auto): the smallest native audio
+      stream meeting an ASR bitrate floor, preferring one that needs no
+      transcode, with the bytes saved reported
+    - Batch scheduling from the SQLite metadata index (metadata_index.py):
+      skip processed videos, longest first, load estimate up front
     - Automatic yt-dlp binary download and updates
+    - Versioned, hash-pinned yt-dlp / ffmpeg toolchain with a manifest read
+      at startup, and pinning of a known-good yt-dlp (toolchain.py)
+    - Cached, conditional (ETag) release lookup with an offline fallback to
+      the already installed binary
+    - Resumable, SHA-256 verified yt-dlp bootstrap with atomic install and a
+      file lock so parallel processes only download it once
     - Cross-platform support (Windows, macOS, Linux)
     - Customizable audio quality and bitrate
     - Default output location with overwrite capability
@@ -26,6 +56,22 @@ Custom Output:
     - Cannot overwrite existing files (raises FileExistsError)
     - Creates parent directories automatically
 
+Output Profiles (--profile):
+    - mp3: MP3 at --bitrate, the default behavior
+    - asr: 16 kHz mono 16-bit PCM WAV, decoded and resampled once by ffmpeg
+    - asr-flac: same samples as "asr", losslessly compressed (about half the size)
+    - asr-opus: the native opus stream remuxed into .opus with no re-encode
+
+Engines (--engine):
+    - auto: "library" when the yt-dlp package is importable, else "subprocess"
+    - library: yt-dlp imported in-process, see ytdlp_engine.py
+    - subprocess: one standalone yt-dlp binary process per video
+
+Audio Cache:
+    - Location: ~/.cache/sanhe-claude-code-plugins/youtube/audio (default cap: 5 GB)
+    - ``youtu.be``, ``/shorts/``, ``/live/`` and ``&t=`` URL forms share one entry
+    - ``--refresh`` re-downloads and replaces the entry, ``--no-cache`` bypasses it
+
 Example Usage:
     # Download with defaults (allows overwrite)
     $ python download_audio.py --video-url "https://www.youtube.com/watch?v=d6rZtgHcbWA"
@@ -33,11 +79,37 @@ Example Usage:
     # Custom quality and bitrate
     $ python download_audio.py --video-url "https://youtu.be/xyz" --quality "bestaudio" --bitrate "128K"
 
+    # Smallest native format that still meets the ASR floor, opus kept as is
+    $ python download_audio.py --video-url "https://youtu.be/xyz" --quality auto --profile asr-opus
+
     # Custom output location (cannot overwrite existing)
     $ python download_audio.py --video-url "https://youtu.be/xyz" --output "/path/to/audio.mp3"
 
+    # ASR-ready 16 kHz mono WAV at ~/tmp/download_audio_result.wav
+    $ python download_audio.py --video-url "https://youtu.be/xyz" --profile asr
+
+    # Only 1:05:00 - 1:20:30 of a long stream, or only the "Q&A" chapter
+    $ python download_audio.py --video-url "https://youtu.be/xyz" --start 1:05:00 --end 1:20:30
+    $ python download_audio.py --video-url "https://youtu.be/xyz" --chapter "Q&A"
+
+    # Progress as JSON lines on stdout, per-video totals appended to a metrics file
+    $ python download_audio.py --video-url "https://youtu.be/xyz" --progress-json --metrics-file "~/tmp/download_metrics.jsonl"
+
+    # Multi-hour video on a flaky link: 8 parallel fragments, 5 attempts, 2 hour cap
+    $ python download_audio.py --video-url "https://youtu.be/xyz" --concurrent-fragments 8 --max-attempts 5 --deadline 7200
+
+    # Batch download a whole playlist with 8 concurrent workers
+    $ python download_audio.py --batch --video-url "https://www.youtube.com/playlist?list=PLxyz" --workers 8
+
+    # Batch download using the metadata index: skip done videos, longest first
+    $ python metadata_index.py --video-url "https://www.youtube.com/@channel/videos"
+    $ python download_audio.py --batch --video-url "https://www.youtube.com/@channel/videos" --index
+
+    # Batch download every URL listed in a text file (one URL per line)
+    $ python download_audio.py --batch --url-file "~/tmp/urls.txt" --output-dir "~/tmp/audio"
+
 Requirements:
-    - ffmpeg installed at ~/ffmpeg
+    - ffmpeg installed at ~/ffmpeg, in PATH, or registered with toolchain.py
     - Internet connection for downloading yt-dlp and videos
     - yt-dlp will be automatically downloaded if not present
 
@@ -52,11 +124,43 @@ Plugin: youtube@sanhe-claude-code-plugins
 
 import sys
 import os
+import re
 import json
+import time
+import hashlib
+import threading
+import contextlib
 import subprocess
+import urllib.error
 import urllib.request
+import urllib.parse
+import shutil
 import argparse
+import dataclasses
+import typing as T
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import toolchain
+import ytdlp_engine
+from audio_cache import AudioCache
+from retry_policy import (
+    RetryPolicy,
+    default_retry_policy,
+    format_error,
+    is_retryable,
+    run_with_retry,
+)
+from download_progress import (
+    ProgressTracker,
+    MetricsWriter,
+    progress_template_args,
+    print_json_event,
+    chain,
+)
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from metadata_index import MetadataIndex
 
 # Detect OS
 IS_WINDOWS = False
@@ -79,7 +183,17 @@ try:
     dir_tmp.mkdir(exist_ok=True)
 except Exception: # pragma: no cover
     pass
-path_audio = dir_tmp / "download_audio_result.mp3"
+
+
+def get_default_output_path(audio_format: str = "mp3") -> Path:
+    """
+    Default output location for the given audio format.
+    """
+    return dir_tmp / f"download_audio_result.{audio_format}"
+
+
+path_audio = get_default_output_path("mp3")
+dir_batch_output = dir_tmp / "download_audio_batch"
 
 if IS_WINDOWS:
     filename = "yt-dlp.exe"
@@ -95,37 +209,396 @@ else:
 
 path_ffmpeg = dir_home / "ffmpeg"
 
+# Binaries registered in the toolchain manifest (see toolchain.py) take
+# precedence over the legacy locations above. Only the manifest is read, the
+# binaries were verified when they were registered. The yt-dlp version can be
+# chosen per shell (YT_DLP_VERSION), it is resolved by ensure_yt_dlp(), so
+# importing this module never fails on it; call that before running yt-dlp.
+path_ffmpeg = toolchain.get_path("ffmpeg") or path_ffmpeg
+
+dir_cache = dir_home / ".cache" / "sanhe-claude-code-plugins" / "youtube"
+path_release_cache = dir_cache / "yt-dlp-release.json"
+release_cache_ttl = 24 * 60 * 60  # seconds
+github_api_url = "https://api.github.com/repos/yt-dlp/yt-dlp/releases/latest"
+github_download_url = "https://github.com/yt-dlp/yt-dlp/releases/download"
+
+audio_cache = AudioCache()
+
+engines = ["auto", "library", "subprocess"]
+
+
+def resolve_engine(engine: str = "auto") -> str:
+    """
+    Resolve ``"auto"`` to the concrete engine name.
+
+    Returns:
+        ``"library"`` or ``"subprocess"``
+    """
+    if engine == "auto":
+        return "library" if ytdlp_engine.is_available() else "subprocess"
+    if engine not in engines:
+        raise ValueError(f"Unknown engine {engine!r}, choose from {engines}")
+    return engine
+
+# Output profiles, each one is a set of yt-dlp options producing one kind of file.
+# The "asr*" profiles produce exactly what the transcriber consumes in a single
+# ffmpeg pass: no lossy MP3 encode followed by an MP3 decode + resample later.
+output_profiles = {
+    "mp3": {
+        "audio_format": "mp3",
+        "postprocessor_args": None,
+    },
+    "asr": {
+        "audio_format": "wav",
+        "postprocessor_args": "ExtractAudio:-ar 16000 -ac 1 -c:a pcm_s16le",
+    },
+    "asr-flac": {
+        "audio_format": "flac",
+        "postprocessor_args": "ExtractAudio:-ar 16000 -ac 1 -sample_fmt s16",
+    },
+    "asr-opus": {
+        # yt-dlp only remuxes when the source codec already matches
+        "quality": "bestaudio[acodec=opus]/bestaudio",
+        "audio_format": "opus",
+        "postprocessor_args": None,
+    },
+}
+
+
+def get_installed_yt_dlp_version() -> str | None:
+    """
+    Version of the installed yt-dlp binary, or None if it is not installed
+    or cannot be run.
+    """
+    if not path_yt_dlp.exists():
+        return None
+    try:
+        result = subprocess.run(
+            [f"{path_yt_dlp}", "--version"],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _read_release_cache() -> dict | None:
+    try:
+        return json.loads(path_release_cache.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_release_cache(cache: dict):
+    path_release_cache.parent.mkdir(parents=True, exist_ok=True)
+    path_tmp = path_release_cache.with_name(
+        f".{path_release_cache.name}.{os.getpid()}"
+    )
+    path_tmp.write_text(json.dumps(cache, indent=4), encoding="utf-8")
+    os.replace(path_tmp, path_release_cache)
+
+
+def get_latest_yt_dlp_release(ttl: int = release_cache_ttl) -> str:
+    """
+    Get the latest yt-dlp release version from GitHub API.
+
+    The answer is cached on disk at :data:`path_release_cache` for ``ttl``
+    seconds, so most cold starts do not touch the network at all. Once the
+    cache is stale it is revalidated with an ``If-None-Match`` conditional
+    request, a ``304 Not Modified`` reply does not count against GitHub's
+    unauthenticated rate limit. Set ``GITHUB_TOKEN`` to authenticate.
+
+    When GitHub cannot be reached (offline, rate limited, ...) the version of
+    the already installed binary is returned, then the stale cached version.
+
+    Args:
+        ttl: Seconds a cached answer is trusted without revalidation
+
+    Raises:
+        RuntimeError: If GitHub cannot be reached and there is neither an
+            installed binary nor a cached answer to fall back to
+    """
+    cache = _read_release_cache()
+    if cache and (time.time() - cache.get("fetched_at", 0)) < ttl:
+        return cache["tag_name"]
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if cache and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if os.environ.get("GITHUB_TOKEN"):
+        headers["Authorization"] = f"Bearer {os.environ['GITHUB_TOKEN']}"
+    request = urllib.request.Request(github_api_url, headers=headers)
+
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            data = json.loads(response.read().decode())
+            cache = {
+                "tag_name": data["tag_name"],
+                "etag": response.headers.get("ETag"),
+                "fetched_at": time.time(),
+            }
+        _write_release_cache(cache)
+        return cache["tag_name"]
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cache:
+            cache["fetched_at"] = time.time()
+            _write_release_cache(cache)
+            return cache["tag_name"]
+        error = e
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        error = e
+
+    installed_version = get_installed_yt_dlp_version()
+    if installed_version:
+        print(
+            f"Cannot reach GitHub ({error}), "
+            f"using installed yt-dlp {installed_version}"
+        )
+        return installed_version
+    if cache:
+        print(
+            f"Cannot reach GitHub ({error}), "
+            f"using cached yt-dlp release {cache['tag_name']}"
+        )
+        return cache["tag_name"]
+    raise RuntimeError(f"Cannot get the latest yt-dlp release from GitHub: {error}")
+
+
+@contextlib.contextmanager
+def _file_lock(path_lock: Path):
+    """
+    Hold an exclusive inter-process lock on ``path_lock`` (blocking).
+    """
+    path_lock.parent.mkdir(parents=True, exist_ok=True)
+    with open(path_lock, "a+b") as f:
+        if IS_WINDOWS:  # pragma: no cover
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def get_yt_dlp_sha256(version: str) -> str:
+    """
+    Get the published SHA-256 of :data:`filename` for a yt-dlp release from
+    the release's ``SHA2-256SUMS`` asset.
+    """
+    url = f"{github_download_url}/{version}/SHA2-256SUMS"
+    with urllib.request.urlopen(url, timeout=30) as response:
+        content = response.read().decode("utf-8")
+    for line in content.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1].lstrip("*") == filename:
+            return parts[0].lower()
+    raise RuntimeError(f"{filename} is not listed in {url}")
+
+
+def _stream_to_file(url: str, path_part: Path, chunk_size: int = 1024 * 1024):
+    """
+    Stream ``url`` into ``path_part`` chunk by chunk, resuming with an HTTP
+    ``Range`` request when a partial file is already there.
+    """
+    offset = path_part.stat().st_size if path_part.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=30)
+    except urllib.error.HTTPError as e:
+        if e.code == 416:  # the partial file is already complete
+            return
+        raise
+    with response:
+        # 206 means the server honoured the range, 200 means start over
+        mode = "ab" if (offset and response.status == 206) else "wb"
+        if offset and mode == "ab":
+            print(f"Resuming download at {offset:,} bytes...")
+        with open(path_part, mode) as f:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+
+
+def _sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def download_yt_dlp(
+    version: str | None = None,
+    force: bool = False,
+    retries: int = 3,
+    path: Path | None = None,
+):
+    """
+    Download the appropriate yt-dlp binary based on the OS.
+
+    The binary is streamed to a ``.part`` file next to :data:`path_yt_dlp`,
+    resumed with HTTP ``Range`` requests after an interruption, verified
+    against the release's published ``SHA2-256SUMS`` and only then atomically
+    renamed into place, so a half-downloaded executable is never used. An
+    exclusive file lock makes parallel processes bootstrap only once: the
+    ones that waited find the binary already installed and return.
+
+    Args:
+        version: Release tag to install (default: the latest release)
+        force: Re-install even if the binary already exists
+        retries: Download attempts before giving up, each attempt resumes
+            from where the previous one stopped
+        path: Where to install the binary (default: :data:`path_yt_dlp`),
+            toolchain.py installs every version into its own directory
+
+    Raises:
+        RuntimeError: If the checksum does not match
+    """
+    if path is None:
+        path = path_yt_dlp
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path_lock = path.with_name(f".{filename}.lock")
+    with _file_lock(path_lock):
+        if path.exists() and not force:
+            print(f"yt-dlp already installed at {path}")
+            return
+
+        # Get latest release version
+        if version is None:
+            version = get_latest_yt_dlp_release()
+            print(f"Latest yt-dlp version: {version}")
+
+        # Determine download URL and local path based on OS
+        download_url = f"{github_download_url}/{version}/{filename}"
+        expected_sha256 = get_yt_dlp_sha256(version)
+        path_part = path.with_name(f".{filename}.{version}.part")
+
+        print(f"Downloading {filename} from {download_url}...")
+        print(f"Saving to {path}...")
+
+        for attempt in range(1, retries + 1):
+            try:
+                _stream_to_file(download_url, path_part)
+                break
+            except (urllib.error.URLError, OSError) as e:
+                if attempt == retries:
+                    raise
+                print(f"Download interrupted ({e}), retry {attempt}/{retries}...")
+                time.sleep(2**attempt)
+
+        actual_sha256 = _sha256_file(path_part)
+        if actual_sha256 != expected_sha256:
+            path_part.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"Checksum mismatch for {filename} {version}: "
+                f"expected {expected_sha256}, got {actual_sha256}"
+            )
 
-def get_latest_yt_dlp_release() -> str:
-    """Get the latest yt-dlp release version from GitHub API."""
-    api_url = "https://api.github.com/repos/yt-dlp/yt-dlp/releases/latest"
+        # Set executable permissions for macOS and Linux
+        if IS_MACOS or IS_LINUX:
+            os.chmod(path_part, 0o755)
+        os.replace(path_part, path)
 
-    with urllib.request.urlopen(api_url) as response:
-        data = json.loads(response.read().decode())
-        tag_name = data["tag_name"]
-        return tag_name
+    print(f"Successfully downloaded yt-dlp to {path}")
 
 
-def download_yt_dlp():
-    """Download the appropriate yt-dlp binary based on the OS."""
-    # Get latest release version
-    latest_version = get_latest_yt_dlp_release()
-    print(f"Latest yt-dlp version: {latest_version}")
+def ensure_yt_dlp() -> Path:
+    """
+    Point :data:`path_yt_dlp` at the selected toolchain version (if one is
+    registered) and make sure it exists, installing the selected (or the
+    latest) release through the toolchain manager when it does not.
 
-    # Determine download URL and local path based on OS
-    download_url = f"https://github.com/yt-dlp/yt-dlp/releases/download/{latest_version}/{filename}"
+    Raises:
+        toolchain.VersionNotInstalled: If ``YT_DLP_VERSION`` names a version
+            that is not installed
+    """
+    global path_yt_dlp
+    path_yt_dlp = toolchain.get_path("yt-dlp") or path_yt_dlp
+    if not path_yt_dlp.exists():
+        print("yt-dlp not found, downloading...")
+        path_yt_dlp = toolchain.install_yt_dlp(
+            toolchain.selected_version("yt-dlp") or get_latest_yt_dlp_release(),
+            filename,
+            download_yt_dlp,
+        )
+    return path_yt_dlp
+
+
+def ensure_ffmpeg() -> Path:
+    """
+    Make sure :data:`path_ffmpeg` exists, registering the ffmpeg found in
+    ``PATH`` in the toolchain manifest when it does not.
+
+    Raises:
+        FileNotFoundError: If there is no ffmpeg at all
+    """
+    global path_ffmpeg
+    if not path_ffmpeg.exists():
+        path_ffmpeg = toolchain.add_ffmpeg(copy=False)
+        print(f"Registered ffmpeg at {path_ffmpeg}")
+    return path_ffmpeg
+
+
+def parse_timestamp(value: str | float | int) -> float:
+    """
+    Parse a timestamp like ``"90"``, ``"1:30"``, ``"01:02:03.5"`` into seconds.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    seconds = 0.0
+    for part in value.strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
 
-    print(f"Downloading {filename} from {download_url}...")
-    print(f"Saving to {path_yt_dlp}...")
 
-    # Download the file
-    urllib.request.urlretrieve(download_url, path_yt_dlp)
+def build_download_sections(
+    start: str | float | None = None,
+    end: str | float | None = None,
+    chapter: str | None = None,
+) -> str | None:
+    """
+    Build the value of yt-dlp's ``--download-sections`` option.
 
-    # Set executable permissions for macOS and Linux
-    if IS_MACOS or IS_LINUX:
-        os.chmod(path_yt_dlp, 0o755)
+    Args:
+        start: Range start, seconds or ``[HH:]MM:SS`` (default: beginning)
+        end: Range end, seconds or ``[HH:]MM:SS`` (default: end of video)
+        chapter: Regular expression matched against chapter titles
 
-    print(f"Successfully downloaded yt-dlp to {path_yt_dlp}")
+    Returns:
+        ``"*START-END"`` for a time range, the chapter regex for a chapter,
+        or None if the whole video is wanted
+    """
+    if chapter and (start is not None or end is not None):
+        raise ValueError("chapter cannot be combined with start / end")
+    if chapter:
+        return chapter
+    if start is None and end is None:
+        return None
+    start_seconds = parse_timestamp(start) if start is not None else 0.0
+    end_value = f"{parse_timestamp(end):g}" if end is not None else "inf"
+    return f"*{start_seconds:g}-{end_value}"
 
 
 def download_audio(
@@ -134,21 +607,154 @@ def download_audio(
     audio_format: str = "mp3",
     bitrate: str = "64K",
     output_path: str = None,
+    use_cache: bool = True,
+    refresh: bool = False,
+    profile: str | None = None,
+    start: str | float | None = None,
+    end: str | float | None = None,
+    chapter: str | None = None,
+    engine: str = "auto",
+    on_progress: T.Callable[[dict], None] | None = None,
+    min_abr: float | None = None,
+    index: "MetadataIndex | None" = None,
+    retry_policy: RetryPolicy | None = None,
 ):
     """
     Download audio from a YouTube video using yt-dlp.
 
+    Retryable failures (network errors, HTTP 429 / 5xx, ...) are retried with
+    exponential backoff, resuming the partial file; fatal ones (private,
+    removed, ...) are raised at once, see retry_policy.py.
+
+    If the same video was already downloaded with the same parameters, the
+    audio is copied from the local :data:`audio_cache` without any network I/O.
+
     Args:
         video_url: YouTube video URL to download
-        quality: yt-dlp quality selector (default: "bestaudio[abr<=64]/worstaudio")
+        quality: yt-dlp quality selector (default: "bestaudio[abr<=64]/worstaudio"),
+            or ``"auto"`` to pick the smallest audio-only format meeting the
+            ASR quality floor, see format_selector.py
         audio_format: Output audio format (default: "mp3")
         bitrate: Audio bitrate (default: "64K")
         output_path: Custom output path (default: ~/tmp/download_audio_result.mp3)
+        use_cache: Read from and write to the audio cache (default: True)
+        refresh: Ignore an existing cache entry and re-download it (default: False)
+        profile: Name of an :data:`output_profiles` entry. Overrides
+            ``audio_format``, and for "asr-opus" also ``quality`` (default: None)
+        start: Only download from this timestamp on, seconds or ``[HH:]MM:SS``
+        end: Only download up to this timestamp, seconds or ``[HH:]MM:SS``
+        chapter: Only download the chapter whose title matches this regex
+        engine: ``"auto"``, ``"library"`` or ``"subprocess"`` (default: "auto")
+        on_progress: Called with every progress event dict and, at the end,
+            with the per-video "summary" record, see download_progress.py.
+            With ``quality="auto"`` a "format" event reports the chosen
+            format and the bytes saved
+        min_abr: With ``quality="auto"``, the bitrate floor in kbps for every
+            codec (default: per codec, see format_selector.asr_min_abr)
+        index: With ``quality="auto"``, metadata index to read the available
+            formats from instead of probing the video (default: None)
+        retry_policy: Retries, per-video deadline and fragment concurrency
+            (default: :data:`retry_policy.default_retry_policy`). Every retry
+            is reported as a "retry" event to ``on_progress``
 
     Returns:
         Path to the downloaded audio file
     """
-    output = output_path if output_path else str(path_audio)
+    download_sections = build_download_sections(
+        start=start,
+        end=end,
+        chapter=chapter,
+    )
+    postprocessor_args = None
+    if profile is not None:
+        settings = output_profiles[profile]
+        if quality != "auto":
+            quality = settings.get("quality", quality)
+        audio_format = settings["audio_format"]
+        postprocessor_args = settings["postprocessor_args"]
+
+    if output_path:
+        output = output_path
+    else:
+        output = str(get_default_output_path(audio_format))
+
+    cache_key = None
+    video_id = parse_video_id(video_url)
+    tracker = ProgressTracker(video_id=video_id, on_event=on_progress)
+    if use_cache and video_id is not None:
+        cache_key = audio_cache.make_key(
+            video_id,
+            quality=quality if quality != "auto" else f"auto:{min_abr}",
+            audio_format=audio_format,
+            bitrate=bitrate,
+            **({"profile": profile} if profile else {}),
+            **({"sections": download_sections} if download_sections else {}),
+        )
+        path_cached = None if refresh else audio_cache.get(cache_key, audio_format)
+        if path_cached is not None:
+            shutil.copyfile(path_cached, output)
+            tracker.summary(cache_hit=True)
+            return output
+
+    if quality == "auto":
+        # Resolved only after a cache miss, a hit needs no format probe
+        import format_selector
+
+        choice = format_selector.resolve_auto_quality(
+            video_url,
+            video_id=video_id,
+            path_yt_dlp=path_yt_dlp,
+            audio_format=audio_format,
+            min_abr=min_abr,
+            engine=resolve_engine(engine),
+            index=index,
+        )
+        if choice is None:
+            quality = format_selector.default_quality
+        else:
+            quality = choice.format_id
+            if on_progress is not None:
+                on_progress(choice.to_event(video_id))
+
+    if retry_policy is None:
+        retry_policy = default_retry_policy
+
+    def on_retry(attempt: int, delay: float, error: BaseException):
+        if on_progress is not None:
+            on_progress(
+                {
+                    "event": "retry",
+                    "video_id": video_id,
+                    "attempt": attempt,
+                    "delay": round(delay, 3),
+                    "error": format_error(error),
+                    "time": time.time(),
+                }
+            )
+
+    if resolve_engine(engine) == "library":
+        # The deadline is checked between attempts, an in-process download
+        # cannot be interrupted halfway
+        run_with_retry(
+            lambda remaining: ytdlp_engine.download(
+                video_url=video_url,
+                output=output,
+                quality=quality,
+                audio_format=audio_format,
+                bitrate=bitrate,
+                ffmpeg_location=path_ffmpeg,
+                postprocessor_args=postprocessor_args,
+                download_sections=download_sections,
+                tracker=tracker,
+                extra_params=retry_policy.yt_dlp_params(),
+            ),
+            policy=retry_policy,
+            on_retry=on_retry,
+        )
+        if cache_key is not None:
+            audio_cache.put(cache_key, audio_format, Path(output))
+        tracker.summary()
+        return output
 
     args = [
         f"{path_yt_dlp}",
@@ -164,12 +770,448 @@ def download_audio(
         "--restrict-filenames",
         "--ffmpeg-location",
         f"{str(path_ffmpeg)}",
-        video_url,
     ]
-    result = subprocess.run(args, check=True, capture_output=True)
+    if postprocessor_args:
+        args.extend(["--postprocessor-args", postprocessor_args])
+    if download_sections:
+        # yt-dlp hands the range to ffmpeg, which seeks over HTTP and only
+        # fetches the bytes of the selected section
+        args.extend(["--download-sections", download_sections])
+    args.extend(retry_policy.yt_dlp_args())
+    args.extend(progress_template_args)
+    args.append(video_url)
+    # Every attempt writes to the same output, so "--continue" resumes the
+    # .part file left behind by the previous one
+    run_with_retry(
+        lambda remaining: _run_yt_dlp(args, tracker, timeout=remaining),
+        policy=retry_policy,
+        on_retry=on_retry,
+    )
+    if cache_key is not None:
+        audio_cache.put(cache_key, audio_format, Path(output))
+    tracker.summary()
     return output
 
 
+def _run_yt_dlp(
+    args: list[str],
+    tracker: ProgressTracker,
+    timeout: float | None = None,
+):
+    """
+    Run yt-dlp, feeding its progress lines to ``tracker`` as they arrive.
+
+    Args:
+        timeout: Kill yt-dlp after this many seconds, None for no limit
+
+    Raises:
+        subprocess.CalledProcessError: If yt-dlp fails, ``stderr`` holds its
+            non-progress output
+        subprocess.TimeoutExpired: If yt-dlp was killed after ``timeout``
+    """
+    output = list()
+    with subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    ) as proc:
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            proc.kill()
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+        try:
+            for line in proc.stdout:
+                line = line.rstrip("\n")
+                if not tracker.feed_line(line):
+                    output.append(line)
+        finally:
+            if timer is not None:
+                timer.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(args, timeout, output="\n".join(output))
+    if proc.returncode != 0:
+        text = "\n".join(output)
+        raise subprocess.CalledProcessError(
+            proc.returncode, args, output=text, stderr=text
+        )
+
+
+def open_audio_stream(
+    video_url: str,
+    quality: str = "bestaudio[abr<=64]/worstaudio",
+    sample_rate: int = 16000,
+) -> list[subprocess.Popen]:
+    """
+    Start a ``yt-dlp -> ffmpeg`` pipeline that streams the video's audio as a
+    mono 16-bit PCM WAV on the stdout of the last process.
+
+    Nothing is written to disk: yt-dlp writes the raw audio stream to its
+    stdout, ffmpeg decodes and resamples it on the fly. The consumer should
+    read ``procs[-1].stdout`` to the end and then call :func:`wait_audio_stream`.
+
+    Args:
+        video_url: YouTube video URL
+        quality: yt-dlp quality selector, must select a single audio-only format
+        sample_rate: Output sample rate in Hz (default: 16000)
+
+    Returns:
+        ``[yt_dlp_process, ffmpeg_process]``
+    """
+    args_yt_dlp = [
+        f"{path_yt_dlp}",
+        "-f",
+        quality,
+        "--quiet",
+        "--no-playlist",
+        "-o",
+        "-",
+        video_url,
+    ]
+    args_ffmpeg = [
+        f"{path_ffmpeg}",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-i",
+        "pipe:0",
+        "-vn",
+        "-ar",
+        str(sample_rate),
+        "-ac",
+        "1",
+        "-c:a",
+        "pcm_s16le",
+        "-f",
+        "wav",
+        "pipe:1",
+    ]
+    proc_yt_dlp = subprocess.Popen(
+        args_yt_dlp,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    proc_ffmpeg = subprocess.Popen(
+        args_ffmpeg,
+        stdin=proc_yt_dlp.stdout,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    # Only ffmpeg holds the pipe now, so yt-dlp gets SIGPIPE if ffmpeg dies
+    proc_yt_dlp.stdout.close()
+    return [proc_yt_dlp, proc_ffmpeg]
+
+
+def wait_audio_stream(procs: list[subprocess.Popen]):
+    """
+    Wait for an :func:`open_audio_stream` pipeline to exit.
+
+    Raises:
+        subprocess.CalledProcessError: If any process in the pipeline failed
+    """
+    for proc in reversed(procs):
+        if proc.stdout is not None:
+            proc.stdout.close()
+        stderr = proc.stderr.read() if proc.stderr is not None else b""
+        returncode = proc.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, proc.args, stderr=stderr
+            )
+
+
+_video_id_pattern = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def parse_video_id(video_url: str) -> str | None:
+    """
+    Extract the canonical 11 character YouTube video ID from a single-video URL.
+
+    All the URL forms of one video map to the same ID, extra query parameters
+    such as ``&t=``, ``&si=`` or ``&list=`` are ignored.
+
+    Args:
+        video_url: YouTube video URL, e.g. ``https://www.youtube.com/watch?v=ID``,
+            ``https://youtu.be/ID?t=42``, ``https://www.youtube.com/shorts/ID``,
+            ``/live/ID`` or ``/embed/ID``. A bare video ID is also accepted.
+
+    Returns:
+        The video ID, or None if the URL does not point to a single video
+        (for example a playlist or channel URL)
+    """
+    video_url = video_url.strip()
+    if _video_id_pattern.match(video_url):
+        return video_url
+    parsed = urllib.parse.urlparse(video_url)
+    host = parsed.netloc.lower().split(":")[0]
+    if host.startswith("www.") or host.startswith("m."):
+        host = host.split(".", 1)[1]
+    candidate = None
+    if host == "youtu.be":
+        candidate = parsed.path.strip("/").split("/")[0]
+    elif host in ("youtube.com", "music.youtube.com"):
+        parts = parsed.path.strip("/").split("/")
+        if parts[0] == "watch":
+            candidate = urllib.parse.parse_qs(parsed.query).get("v", [None])[0]
+        elif parts[0] in ("shorts", "live", "embed", "v") and len(parts) > 1:
+            candidate = parts[1]
+    if candidate and _video_id_pattern.match(candidate):
+        return candidate
+    return None
+
+
+def expand_video_urls(video_url: str, engine: str = "auto") -> list[str]:
+    """
+    Expand a playlist or channel URL into the list of its video URLs.
+
+    Single-video URLs are returned as-is without any network call. Everything
+    else is resolved with ``yt-dlp --flat-playlist``, which lists the entries
+    without extracting each video.
+
+    Args:
+        video_url: YouTube video, playlist or channel URL
+        engine: ``"auto"``, ``"library"`` or ``"subprocess"``
+
+    Returns:
+        List of ``https://www.youtube.com/watch?v=ID`` URLs
+    """
+    video_id = parse_video_id(video_url)
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(video_url).query)
+    if video_id is not None and "list" not in query:
+        return [f"https://www.youtube.com/watch?v={video_id}"]
+    if resolve_engine(engine) == "library":
+        return [
+            f"https://www.youtube.com/watch?v={video_id}"
+            for video_id in ytdlp_engine.list_video_ids(video_url)
+        ]
+    args = [
+        f"{path_yt_dlp}",
+        "--flat-playlist",
+        "--print",
+        "id",
+        video_url,
+    ]
+    result = subprocess.run(args, check=True, capture_output=True, text=True)
+    video_urls = list()
+    for line in result.stdout.splitlines():
+        line = line.strip()
+        if _video_id_pattern.match(line):
+            video_urls.append(f"https://www.youtube.com/watch?v={line}")
+    return video_urls
+
+
+def read_url_file(path_url_file: Path) -> list[str]:
+    """
+    Read video, playlist or channel URLs from a text file.
+
+    Blank lines and lines starting with ``#`` are ignored.
+    """
+    urls = list()
+    for line in path_url_file.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
+@dataclasses.dataclass
+class BatchItemResult:
+    """
+    Outcome of downloading a single video in batch mode.
+    """
+
+    video_url: str
+    video_id: str | None
+    output_path: str | None = None
+    error: str | None = None
+    retryable: bool | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def download_audio_batch(
+    video_urls: list[str],
+    output_dir: Path,
+    workers: int = 4,
+    quality: str = "bestaudio[abr<=64]/worstaudio",
+    audio_format: str = "mp3",
+    bitrate: str = "64K",
+    overwrite: bool = False,
+    use_cache: bool = True,
+    refresh: bool = False,
+    profile: str | None = None,
+    start: str | float | None = None,
+    end: str | float | None = None,
+    chapter: str | None = None,
+    engine: str = "auto",
+    on_progress: T.Callable[[dict], None] | None = None,
+    index: "MetadataIndex | None" = None,
+    min_abr: float | None = None,
+    retry_policy: RetryPolicy | None = None,
+) -> list[BatchItemResult]:
+    """
+    Download many videos concurrently, writing one ``${video_id}.${audio_format}``
+    file per video into ``output_dir``.
+
+    Each worker drives its own yt-dlp process, so wall-clock time scales with
+    ``len(video_urls) / workers`` rather than with the number of videos.
+    Playlist and channel URLs in ``video_urls`` are expanded first, and
+    duplicated video IDs are only downloaded once.
+
+    Args:
+        video_urls: Video, playlist or channel URLs
+        output_dir: Directory to write the audio files to
+        workers: Number of concurrent downloads (default: 4)
+        quality: yt-dlp quality selector
+        audio_format: Output audio format
+        bitrate: Audio bitrate
+        overwrite: Re-download videos whose output file already exists
+        use_cache: Read from and write to the audio cache
+        refresh: Ignore existing cache entries and re-download them
+        profile: Name of an :data:`output_profiles` entry
+        start: Range start applied to every video
+        end: Range end applied to every video
+        chapter: Chapter title regex applied to every video
+        engine: ``"auto"``, ``"library"`` or ``"subprocess"``. With the
+            library engine every worker thread reuses one in-process yt-dlp
+            instance across all of its videos
+        on_progress: Called with the progress events of every video, from
+            the worker threads
+        index: Metadata index (see metadata_index.py). When given, videos
+            already processed into the same output file, which still exists,
+            are skipped (unless ``overwrite``),
+            the rest are scheduled longest first, and successful downloads
+            are marked as processed. No extra network probe is made.
+            With ``quality="auto"`` the formats are read from it too.
+        min_abr: Bitrate floor in kbps for ``quality="auto"``
+        retry_policy: Retries and per-video deadline applied to every video.
+            A fatal error or an exhausted policy fails only that video
+
+    Returns:
+        One :class:`BatchItemResult` per unique video, in input order
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if profile is not None:
+        audio_format = output_profiles[profile]["audio_format"]
+
+    results: list[BatchItemResult] = list()
+    seen = set()
+    for url in video_urls:
+        try:
+            expanded = expand_video_urls(url, engine=engine)
+        except Exception as e:
+            results.append(
+                BatchItemResult(video_url=url, video_id=None, error=format_error(e))
+            )
+            continue
+        for video_url in expanded:
+            video_id = parse_video_id(video_url)
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+            results.append(BatchItemResult(video_url=video_url, video_id=video_id))
+
+    def run(item: BatchItemResult) -> BatchItemResult:
+        path_output = output_dir / f"{item.video_id}.{audio_format}"
+        if path_output.exists() and not overwrite:
+            item.output_path = str(path_output)
+            return item
+        t0 = time.perf_counter()
+        try:
+            item.output_path = download_audio(
+                video_url=item.video_url,
+                quality=quality,
+                audio_format=audio_format,
+                bitrate=bitrate,
+                output_path=str(path_output),
+                use_cache=use_cache,
+                refresh=refresh,
+                profile=profile,
+                start=start,
+                end=end,
+                chapter=chapter,
+                engine=engine,
+                on_progress=on_progress,
+                min_abr=min_abr,
+                index=index,
+                retry_policy=retry_policy,
+            )
+        except Exception as e:
+            item.error = format_error(e)
+            item.retryable = is_retryable(e)
+        item.elapsed = time.perf_counter() - t0
+        return item
+
+    todo = [item for item in results if item.error is None]
+    if index is not None:
+        records = index.get_many([item.video_id for item in todo])
+        if not overwrite:
+            processed = index.processed_outputs()
+            for item in todo:
+                path_output = output_dir / f"{item.video_id}.{audio_format}"
+                # Processed into this very file (directory and format), and
+                # the file is still there
+                if (
+                    item.video_id,
+                    str(path_output.absolute()),
+                ) in processed and path_output.exists():
+                    item.output_path = str(path_output)
+            todo = [item for item in todo if item.output_path is None]
+        durations = {
+            video_id: record["duration"]
+            for video_id, record in records.items()
+            if record["duration"]
+        }
+        # Longest first, so a long video does not start last and become the tail
+        todo.sort(key=lambda item: durations.get(item.video_id, 0), reverse=True)
+        known = [item for item in todo if item.video_id in durations]
+        total_hours = sum(durations[item.video_id] for item in known) / 3600
+        print(
+            f"Scheduling {len(todo)} videos, {total_hours:.1f} audio hours known "
+            f"for {len(known)} of them"
+        )
+
+    def run_and_mark(item: BatchItemResult) -> BatchItemResult:
+        item = run(item)
+        if index is not None and item.ok:
+            index.mark_processed(item.video_id, item.output_path, audio_format)
+        return item
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(run_and_mark, item) for item in todo]
+        for future in as_completed(futures):
+            item = future.result()
+            status = "✓" if item.ok else "✗"
+            print(f"{status} {item.video_id}: {item.output_path or item.error}")
+    return results
+
+
+def print_batch_summary(results: list[BatchItemResult], elapsed: float):
+    """
+    Print a success / failure summary for a batch run.
+    """
+    succeeded = [item for item in results if item.ok]
+    failed = [item for item in results if not item.ok]
+    print()
+    print(f"Batch finished in {elapsed:.1f}s")
+    print(f"✓ Succeeded: {len(succeeded)}")
+    print(f"✗ Failed: {len(failed)}")
+    for item in failed:
+        kind = "fatal" if item.retryable is False else "gave up"
+        print(f"  - {item.video_id or item.video_url} ({kind}): {item.error}")
+
+
 def main():
     """
     Main CLI entry point for downloading YouTube audio.
@@ -187,6 +1229,10 @@ def main():
         # Specify custom output location (cannot overwrite existing file)
         python download_audio.py --video-url "https://youtu.be/xyz" --output "/path/to/output.mp3"
 
+        # Batch download a playlist / channel / URL list file
+        python download_audio.py --batch --video-url "https://www.youtube.com/@channel/videos" --workers 8
+        python download_audio.py --batch --url-file "~/tmp/urls.txt"
+
     Requirements:
         - ffmpeg must be installed at ~/ffmpeg
         - yt-dlp will be automatically downloaded to home directory if not present
@@ -203,20 +1249,23 @@ Examples:
   %(prog)s --video-url "https://www.youtube.com/watch?v=d6rZtgHcbWA"
   %(prog)s --video-url "https://youtu.be/xyz" --quality "bestaudio" --bitrate "128K"
   %(prog)s --video-url "https://youtu.be/xyz" --output "/custom/path/audio.mp3"
+  %(prog)s --batch --video-url "https://www.youtube.com/playlist?list=PLxyz" --workers 8
+  %(prog)s --batch --url-file "~/tmp/urls.txt" --output-dir "~/tmp/audio"
 
 Quality options:
   bestaudio              - Best quality audio available
   bestaudio[abr<=64]     - Best audio with max 64kbps bitrate
   worstaudio             - Lowest quality audio (smallest file)
+  auto                   - Smallest audio-only format meeting the ASR quality floor
         """,
     )
 
-    # Required arguments
+    # Input arguments
     parser.add_argument(
         "--video-url",
         type=str,
-        required=True,
-        help="YouTube video URL to download (required)",
+        default=None,
+        help="YouTube video URL to download. In batch mode this can also be a playlist or channel URL",
     )
 
     # Optional arguments for yt-dlp customization
@@ -224,7 +1273,14 @@ Quality options:
         "--quality",
         type=str,
         default="bestaudio[abr<=64]/worstaudio",
-        help='Quality selector for yt-dlp (default: "bestaudio[abr<=64]/worstaudio")',
+        help='Quality selector for yt-dlp, or "auto" to pick the smallest audio-only format meeting the ASR quality floor per video (default: "bestaudio[abr<=64]/worstaudio")',
+    )
+
+    parser.add_argument(
+        "--min-abr",
+        type=float,
+        default=None,
+        help="With --quality auto, the minimum audio bitrate in kbps for every codec (default: 32 for opus, 48 for others)",
     )
 
     parser.add_argument(
@@ -248,29 +1304,250 @@ Quality options:
         help=f"Custom output file path (default: {path_audio}). Note: Default location allows overwrite, custom locations cannot overwrite existing files.",
     )
 
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        choices=list(output_profiles),
+        help="Output profile, overrides --audio-format. 'asr' = 16 kHz mono WAV, 'asr-flac' = 16 kHz mono FLAC, 'asr-opus' = native opus stream without re-encode (default: none)",
+    )
+
+    # Partial download arguments
+    parser.add_argument(
+        "--start",
+        type=str,
+        default=None,
+        help="Only download from this timestamp on, seconds or [HH:]MM:SS (default: beginning)",
+    )
+
+    parser.add_argument(
+        "--end",
+        type=str,
+        default=None,
+        help="Only download up to this timestamp, seconds or [HH:]MM:SS (default: end of video)",
+    )
+
+    parser.add_argument(
+        "--chapter",
+        type=str,
+        default=None,
+        help="Only download the chapter whose title matches this regular expression, cannot be combined with --start/--end",
+    )
+
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="auto",
+        choices=engines,
+        help="'library' runs yt-dlp in-process and reuses it across videos, 'subprocess' launches the yt-dlp binary per video, 'auto' uses 'library' when the yt-dlp package is installed (default: auto)",
+    )
+
+    # Retry and resume arguments
+    parser.add_argument(
+        "--concurrent-fragments",
+        type=int,
+        default=default_retry_policy.concurrent_fragments,
+        help=f"DASH/HLS fragments downloaded in parallel per video (default: {default_retry_policy.concurrent_fragments})",
+    )
+
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=default_retry_policy.max_attempts,
+        help=f"Attempts per video for retryable errors, partial files are resumed; fatal errors (private, removed, ...) are not retried (default: {default_retry_policy.max_attempts})",
+    )
+
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Give up on a video after this many seconds, retries included (default: no limit)",
+    )
+
+    # Telemetry arguments
+    parser.add_argument(
+        "--progress-json",
+        action="store_true",
+        help="Print progress events (bytes, speed, ETA, post-processing) as JSON lines on stdout",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        help="Append one JSON line of per-video totals (bytes, download vs post-processing seconds) to this file",
+    )
+
+    # Batch mode arguments
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Batch mode: expand playlist/channel URLs and download every video, one file per video ID",
+    )
+
+    parser.add_argument(
+        "--url-file",
+        type=str,
+        default=None,
+        help="Text file with one video/playlist/channel URL per line (implies --batch)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of concurrent downloads in batch mode (default: 4)",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=str(dir_batch_output),
+        help=f"Output directory in batch mode (default: {dir_batch_output})",
+    )
+
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="In batch mode, use the metadata index (see metadata_index.py) to skip processed videos and schedule the longest first. With --quality auto, read the available formats from it instead of probing",
+    )
+
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="In batch mode, re-download videos whose output file already exists",
+    )
+
+    # Cache arguments
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read from or write to the local audio cache",
+    )
+
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached audio, re-download it and replace the cache entry",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(audio_cache.dir_cache),
+        help=f"Audio cache directory (default: {audio_cache.dir_cache})",
+    )
+
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=audio_cache.max_bytes // (1024 * 1024),
+        help=f"Audio cache size cap in MB, least recently used entries are evicted first (default: {audio_cache.max_bytes // (1024 * 1024)})",
+    )
+
     args = parser.parse_args()
 
-    # Ensure yt-dlp is downloaded
-    if not path_yt_dlp.exists():
-        print("yt-dlp not found, downloading...")
-        download_yt_dlp()
+    audio_cache.dir_cache = Path(args.cache_dir).expanduser()
+    audio_cache.max_bytes = args.cache_max_mb * 1024 * 1024
+
+    if args.url_file:
+        args.batch = True
+    if not args.video_url and not args.url_file:
+        parser.error("one of --video-url or --url-file is required")
+    if args.chapter and (args.start or args.end):
+        parser.error("--chapter cannot be combined with --start/--end")
+
+    retry_policy = RetryPolicy(
+        max_attempts=max(1, args.max_attempts),
+        deadline=args.deadline,
+        concurrent_fragments=max(1, args.concurrent_fragments),
+    )
+
+    savings = None
+    if args.quality == "auto":
+        from format_selector import FormatSavings
+
+        savings = FormatSavings(verbose=not args.progress_json)
+
+    on_progress = chain(
+        print_json_event if args.progress_json else None,
+        (
+            MetricsWriter(Path(args.metrics_file).expanduser())
+            if args.metrics_file
+            else None
+        ),
+        savings,
+    )
+
+    # Ensure yt-dlp is downloaded and ffmpeg is there
+    if resolve_engine(args.engine) == "subprocess":
+        try:
+            ensure_yt_dlp()
+        except toolchain.VersionNotInstalled as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+    ensure_ffmpeg()
+
+    index = None
+    if args.index:
+        from metadata_index import MetadataIndex
+
+        index = MetadataIndex()
+
+    if args.batch:
+        video_urls = list()
+        if args.video_url:
+            video_urls.append(args.video_url)
+        if args.url_file:
+            video_urls.extend(read_url_file(Path(args.url_file).expanduser()))
+        start = time.perf_counter()
+        results = download_audio_batch(
+            video_urls=video_urls,
+            output_dir=Path(args.output_dir).expanduser(),
+            workers=args.workers,
+            quality=args.quality,
+            audio_format=args.audio_format,
+            bitrate=args.bitrate,
+            overwrite=args.overwrite,
+            use_cache=not args.no_cache,
+            refresh=args.refresh,
+            profile=args.profile,
+            start=args.start,
+            end=args.end,
+            chapter=args.chapter,
+            engine=args.engine,
+            on_progress=on_progress,
+            index=index,
+            min_abr=args.min_abr,
+            retry_policy=retry_policy,
+        )
+        print_batch_summary(results, elapsed=time.perf_counter() - start)
+        if savings is not None and savings.videos:
+            savings.report()
+        if not all(item.ok for item in results):
+            sys.exit(1)
+        return
 
     # Determine output path and check for existing files
+    audio_format = args.audio_format
+    if args.profile:
+        audio_format = output_profiles[args.profile]["audio_format"]
+    path_default = get_default_output_path(audio_format)
     if args.output:
         path_output = Path(args.output).expanduser()
         # For custom locations, check if file already exists
-        if (path_output != path_audio) and path_output.exists():
+        if (path_output != path_default) and path_output.exists():
             raise FileExistsError(
                 f"Output file already exists at {path_output}. "
                 f"Please choose a different location or remove the existing file. "
-                f"(Default location {path_audio} allows overwrite)"
+                f"(Default location {path_default} allows overwrite)"
             )
         # Ensure output directory exists
         path_output.parent.mkdir(parents=True, exist_ok=True)
         output_path_str = str(path_output)
     else:
         # Use default location (allows overwrite)
-        path_audio.unlink(missing_ok=True)
+        path_default.unlink(missing_ok=True)
         output_path_str = None
 
     # Download the audio
@@ -280,6 +1557,17 @@ Quality options:
         audio_format=args.audio_format,
         bitrate=args.bitrate,
         output_path=output_path_str,
+        use_cache=not args.no_cache,
+        refresh=args.refresh,
+        profile=args.profile,
+        start=args.start,
+        end=args.end,
+        chapter=args.chapter,
+        engine=args.engine,
+        on_progress=on_progress,
+        min_abr=args.min_abr,
+        index=index,
+        retry_policy=retry_policy,
     )
 
     print(f"✓ Audio successfully downloaded from {args.video_url}")
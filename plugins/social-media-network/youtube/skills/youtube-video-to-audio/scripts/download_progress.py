@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""
+Download Progress Telemetry
+
+Turns yt-dlp's progress reporting into a stream of structured events and a
+per-video metrics record, for both engines:
+
+- subprocess engine: yt-dlp is launched with :data:`progress_template_args`,
+  which make it print one JSON document per progress tick, and every output
+  line goes through :meth:`ProgressTracker.feed_line`
+- library engine: yt-dlp's progress / postprocessor hooks call
+  :meth:`ProgressTracker.handle` directly
+
+Event Format (one dict per event, JSON serializable):
+    {"event": "download", "video_id": "...", "status": "downloading",
+     "downloaded_bytes": 1048576, "total_bytes": 5242880, "speed": 1.2e6,
+     "eta": 3, "time": 1760000000.0}
+    {"event": "postprocess", "video_id": "...", "status": "started",
+     "postprocessor": "ExtractAudio", "time": ...}
+    {"event": "summary", "video_id": "...", "bytes": 5242880,
+     "download_seconds": 4.2, "postprocess_seconds": 1.3,
+     "total_seconds": 6.1, "avg_speed": 1.25e6, "cache_hit": false}
+
+The "summary" record tells whether a slow run was network-bound
+(``download_seconds``) or transcode-bound (``postprocess_seconds``).
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import json
+import time
+import threading
+import typing as T
+from pathlib import Path
+
+_prefix_download = "[progress-download] "
+_prefix_postprocess = "[progress-postprocess] "
+
+# Extra yt-dlp CLI arguments making it print machine readable progress lines
+progress_template_args = [
+    "--newline",
+    "--progress-template",
+    f"download:{_prefix_download}%(progress)j",
+    "--progress-template",
+    f"postprocess:{_prefix_postprocess}%(progress)j",
+]
+
+_download_fields = [
+    "status",
+    "downloaded_bytes",
+    "total_bytes",
+    "total_bytes_estimate",
+    "speed",
+    "eta",
+    "fragment_index",
+    "fragment_count",
+]
+
+
+class ProgressTracker:
+    """
+    Collect the progress events of one video download.
+
+    Args:
+        video_id: Video ID to tag the events with
+        on_event: Called with every event dict, including the final "summary"
+    """
+
+    def __init__(
+        self,
+        video_id: str | None,
+        on_event: T.Callable[[dict], None] | None = None,
+    ):
+        self.video_id = video_id
+        self.on_event = on_event
+        self.started_at = time.time()
+        self.download_started_at: float | None = None
+        self.download_finished_at: float | None = None
+        self.postprocess_started_at: float | None = None
+        self.postprocess_finished_at: float | None = None
+        self.bytes_by_file: dict[str, int] = dict()
+
+    def _emit(self, event: dict):
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def handle(self, kind: str, progress: dict):
+        """
+        Handle a yt-dlp progress dict.
+
+        Args:
+            kind: ``"download"`` or ``"postprocess"``
+            progress: yt-dlp progress hook / progress template dict
+        """
+        now = time.time()
+        status = progress.get("status")
+        event = {"event": kind, "video_id": self.video_id, "time": now}
+        if kind == "download":
+            for field in _download_fields:
+                if progress.get(field) is not None:
+                    event[field] = progress[field]
+            if self.download_started_at is None:
+                self.download_started_at = now
+            if status == "finished":
+                self.download_finished_at = now
+            downloaded = progress.get("downloaded_bytes")
+            if downloaded is None:
+                downloaded = progress.get("total_bytes")
+            if downloaded:
+                key = progress.get("filename") or progress.get("tmpfilename") or ""
+                self.bytes_by_file[key] = downloaded
+        else:
+            event["status"] = status
+            event["postprocessor"] = progress.get("postprocessor")
+            if status == "started" and self.postprocess_started_at is None:
+                self.postprocess_started_at = now
+            if status == "finished":
+                self.postprocess_finished_at = now
+        self._emit(event)
+
+    def feed_line(self, line: str) -> bool:
+        """
+        Handle one line of yt-dlp output.
+
+        Returns:
+            True if the line was a progress line, False otherwise
+        """
+        for kind, prefix in (
+            ("download", _prefix_download),
+            ("postprocess", _prefix_postprocess),
+        ):
+            if line.startswith(prefix):
+                try:
+                    progress = json.loads(line[len(prefix) :])
+                except ValueError:
+                    return False
+                self.handle(kind, progress)
+                return True
+        return False
+
+    def summary(self, cache_hit: bool = False) -> dict:
+        """
+        Build the per-video metrics record and emit it as a "summary" event.
+        """
+        now = time.time()
+        download_seconds = 0.0
+        if self.download_started_at is not None:
+            download_end = self.download_finished_at or now
+            download_seconds = download_end - self.download_started_at
+        postprocess_seconds = 0.0
+        if self.postprocess_started_at is not None:
+            postprocess_end = self.postprocess_finished_at or now
+            postprocess_seconds = postprocess_end - self.postprocess_started_at
+        total_bytes = sum(self.bytes_by_file.values())
+        avg_speed = None
+        if download_seconds:
+            avg_speed = round(total_bytes / download_seconds, 1)
+        record = {
+            "event": "summary",
+            "video_id": self.video_id,
+            "bytes": total_bytes,
+            "download_seconds": round(download_seconds, 3),
+            "postprocess_seconds": round(postprocess_seconds, 3),
+            "total_seconds": round(now - self.started_at, 3),
+            "avg_speed": avg_speed,
+            "cache_hit": cache_hit,
+            "time": now,
+        }
+        self._emit(record)
+        return record
+
+
+class MetricsWriter:
+    """
+    Thread-safe JSON lines writer for per-video "summary" records, usable
+    directly as an ``on_event`` callback.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict):
+        if event.get("event") != "summary":
+            return
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def print_json_event(event: dict):
+    """
+    ``on_event`` callback printing every event as one JSON line on stdout.
+    """
+    print(json.dumps(event, ensure_ascii=False), flush=True)
+
+
+def chain(
+    *callbacks: T.Callable[[dict], None] | None,
+) -> T.Callable[[dict], None] | None:
+    """
+    Combine several ``on_event`` callbacks into one, ``None`` entries are skipped.
+    """
+    callbacks = [callback for callback in callbacks if callback is not None]
+    if not callbacks:
+        return None
+
+    def on_event(event: dict):
+        for callback in callbacks:
+            callback(event)
+
+    return on_event
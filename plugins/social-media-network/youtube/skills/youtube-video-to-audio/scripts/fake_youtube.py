@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+
+"""
+Offline Fake YouTube
+
+A local stand-in for everything ``download_audio.py`` talks to over the
+network, so the download path can be exercised and benchmarked on a machine
+with no internet access (e.g. in CI):
+
+- ``GET /repos/yt-dlp/yt-dlp/releases/latest``: fake GitHub releases API,
+  with ``ETag`` / ``304 Not Modified`` support
+- ``GET /releases/download/<version>/<filename>``: a fake yt-dlp binary (a
+  small Python shim, see below), plus its ``SHA2-256SUMS``
+- ``GET /info/<video_id>``: ``yt-dlp -J`` style info dict of a video
+- ``GET /playlist``: the IDs of a fake playlist
+- ``GET /audio/<video_id>``: synthetic audio, a 16 kHz mono WAV tone of
+  ``audio_seconds``, with HTTP ``Range`` support and optional throttling.
+  ``?start=S&end=E`` returns only that section, as ffmpeg would fetch it
+
+The fake yt-dlp shim understands the yt-dlp command lines built by
+``download_audio.py`` (download with ``-o``, ``--dump-single-json``,
+``--flat-playlist --print id``, ``--version``), fetches everything from this
+server (only the requested section for a ``--download-sections "*S-E"``
+time range, chapter sections download the whole video), and prints progress lines in the ``--progress-template`` format, so
+progress telemetry works too. It ignores ``--extract-audio`` and writes the
+WAV as is, no ffmpeg is needed. IDs starting with ``private`` fail the way
+yt-dlp does for a private video.
+
+:class:`FakeYouTube` starts the server in a background thread and points
+``download_audio``'s module globals (GitHub URLs, yt-dlp path, release cache,
+audio cache) and the toolchain manifest to it, restoring them on exit.
+
+Example Usage:
+    >>> with FakeYouTube() as fake:
+    ...     download_audio.download_yt_dlp()
+    ...     download_audio.download_audio(fake.video_url(0), engine="subprocess")
+
+    # Serve only, e.g. to point other tools at it
+    $ python fake_youtube.py --port 8765 --audio-seconds 60
+
+Requirements:
+    - Linux or macOS (the shim is a Python script with a shebang)
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import io
+import re
+import json
+import math
+import time
+import wave
+import struct
+import hashlib
+import argparse
+import tempfile
+import threading
+import urllib.parse
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import toolchain
+import download_audio
+
+_shim_template = r'''#!/usr/bin/env python3
+# Fake yt-dlp generated by fake_youtube.py, talks to {base_url}
+import re
+import sys
+import json
+import urllib.error
+import urllib.request
+
+BASE_URL = "{base_url}"
+VERSION = "{version}"
+
+
+def get(path):
+    with urllib.request.urlopen(BASE_URL + path, timeout=30) as response:
+        return response.read()
+
+
+def video_id_of(url):
+    match = re.search(r"(?:v=|youtu\.be/|shorts/|live/|embed/)([\w-]{{11}})", url)
+    if match:
+        return match.group(1)
+    return url if re.fullmatch(r"[\w-]{{11}}", url) else None
+
+
+def progress(kind, data):
+    print("[progress-" + kind + "] " + json.dumps(data), flush=True)
+
+
+def main(args):
+    if "--version" in args:
+        print(VERSION)
+        return 0
+    url = args[-1]
+    if "--flat-playlist" in args:
+        ids = json.loads(get("/playlist"))
+        if "--dump-single-json" in args:
+            entries = [dict(_type="url", id=i, title=i, duration=None) for i in ids]
+            print(json.dumps(dict(_type="playlist", id="PLfake", entries=entries)))
+        else:
+            print("\n".join(ids))
+        return 0
+    video_id = video_id_of(url)
+    try:
+        if "--dump-single-json" in args:
+            print(get("/info/" + video_id).decode("utf-8"))
+            return 0
+        output = args[args.index("-o") + 1]
+        path = "/audio/" + video_id
+        if "--download-sections" in args:
+            sections = args[args.index("--download-sections") + 1]
+            match = re.fullmatch(r"\*([\d.]+)-([\d.]+|inf)", sections)
+            if match:
+                path += "?start=" + match.group(1) + "&end=" + match.group(2)
+        with urllib.request.urlopen(BASE_URL + path, timeout=30) as response:
+            total = int(response.headers.get("Content-Length") or 0)
+            done = 0
+            with open(output, "wb") as f:
+                while True:
+                    chunk = response.read(256 * 1024)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    done += len(chunk)
+                    progress("download", dict(status="downloading", downloaded_bytes=done,
+                                              total_bytes=total, filename=output))
+        progress("download", dict(status="finished", downloaded_bytes=done,
+                                  total_bytes=total, filename=output))
+        progress("postprocess", dict(status="started", postprocessor="ExtractAudio"))
+        progress("postprocess", dict(status="finished", postprocessor="ExtractAudio"))
+        return 0
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            print("ERROR: [youtube] " + str(video_id) + ": Private video. "
+                  "Sign in if you've been granted access to this video")
+        else:
+            print("ERROR: unable to download video data: HTTP Error " + str(e.code))
+        return 1
+
+
+sys.exit(main(sys.argv[1:]))
+'''
+
+
+def make_wav(seconds: float, sample_rate: int = 16000) -> bytes:
+    """
+    A 16-bit mono WAV of a 440 Hz tone, so every consumer gets valid audio.
+    """
+    n_frames = int(seconds * sample_rate)
+    period = [
+        int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate))
+        for i in range(sample_rate)
+    ]
+    one_second = struct.pack(f"<{sample_rate}h", *period)
+    frames = one_second * (n_frames // sample_rate)
+    frames += one_second[: (n_frames % sample_rate) * 2]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(frames)
+    return buffer.getvalue()
+
+
+class FakeYouTubeServer(ThreadingHTTPServer):
+    """
+    The HTTP server, its settings and request counters.
+
+    Args:
+        version: Release tag of the fake yt-dlp
+        audio_seconds: Duration of every synthetic video
+        playlist_size: Number of videos in the fake playlist
+        bandwidth: Throttle media responses to this many bytes per second,
+            None for no limit
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        version: str = "2099.01.01",
+        audio_seconds: float = 10.0,
+        playlist_size: int = 20,
+        bandwidth: int | None = None,
+    ):
+        super().__init__(address, FakeYouTubeHandler)
+        self.version = version
+        self.playlist_size = playlist_size
+        self.bandwidth = bandwidth
+        self.audio = make_wav(audio_seconds)
+        self.audio_seconds = audio_seconds
+        self.shim = _shim_template.format(
+            base_url=self.base_url, version=version
+        ).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(version.encode()).hexdigest()[:16]}"'
+        self.counters = {"api": 0, "api_not_modified": 0, "binary": 0, "audio": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def section_audio(self, query: str) -> bytes:
+        """
+        The audio of the ``start`` / ``end`` section of ``query``, sized in
+        proportion to the section, the whole audio without one.
+        """
+        params = urllib.parse.parse_qs(query)
+        if "start" not in params and "end" not in params:
+            return self.audio
+        start = float(params.get("start", ["0"])[0])
+        end = min(float(params.get("end", ["inf"])[0]), self.audio_seconds)
+        return make_wav(max(0.0, end - start))
+
+    def playlist_ids(self) -> list[str]:
+        return [f"fakevid{i:04d}" for i in range(self.playlist_size)]
+
+    def video_info(self, video_id: str) -> dict:
+        size = len(self.audio)
+        return {
+            "id": video_id,
+            "title": f"Fake video {video_id}",
+            "duration": self.audio_seconds,
+            "language": "en",
+            "chapters": [],
+            "subtitles": {},
+            "automatic_captions": {},
+            "formats": [
+                {
+                    "format_id": "249",
+                    "ext": "webm",
+                    "vcodec": "none",
+                    "acodec": "opus",
+                    "abr": 50,
+                    "filesize": size,
+                    "url": f"{self.base_url}/audio/{video_id}",
+                },
+                {
+                    "format_id": "140",
+                    "ext": "m4a",
+                    "vcodec": "none",
+                    "acodec": "mp4a.40.2",
+                    "abr": 129,
+                    "filesize": size * 2,
+                    "url": f"{self.base_url}/audio/{video_id}",
+                },
+            ],
+        }
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    server: FakeYouTubeServer
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def _send_json(self, data, headers: dict | None = None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_bytes(self, data: bytes, throttle: bool = False):
+        start = 0
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match:
+            start = int(match.group(1))
+            if start >= len(data):
+                self.send_response(416)
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+        bandwidth = self.server.bandwidth if throttle else None
+        chunk_size = 64 * 1024
+        for offset in range(start, len(data), chunk_size):
+            chunk = data[offset : offset + chunk_size]
+            self.wfile.write(chunk)
+            if bandwidth:
+                time.sleep(len(chunk) / bandwidth)
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split("?")[0]
+        parts = path.strip("/").split("/")
+        if path == "/repos/yt-dlp/yt-dlp/releases/latest":
+            server.count("api")
+            if self.headers.get("If-None-Match") == server.etag:
+                server.count("api_not_modified")
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._send_json({"tag_name": server.version}, {"ETag": server.etag})
+        elif parts[:2] == ["releases", "download"] and len(parts) == 4:
+            if parts[3] == "SHA2-256SUMS":
+                digest = hashlib.sha256(server.shim).hexdigest()
+                lines = [
+                    f"{digest}  {name}"
+                    for name in ["yt-dlp", "yt-dlp_linux", "yt-dlp_macos"]
+                ]
+                self._send_bytes(("\n".join(lines) + "\n").encode("utf-8"))
+            else:
+                server.count("binary")
+                self._send_bytes(server.shim)
+        elif parts[0] == "info" and len(parts) == 2:
+            if parts[1].startswith("private"):
+                self.send_error(404)
+                return
+            self._send_json(server.video_info(parts[1]))
+        elif path == "/playlist":
+            self._send_json(server.playlist_ids())
+        elif parts[0] == "audio" and len(parts) == 2:
+            if parts[1].startswith("private"):
+                self.send_error(404)
+                return
+            server.count("audio")
+            query = urllib.parse.urlparse(self.path).query
+            self._send_bytes(server.section_audio(query), throttle=True)
+        else:
+            self.send_error(404)
+
+
+class FakeYouTube:
+    """
+    Run a :class:`FakeYouTubeServer` and point ``download_audio`` at it.
+
+    Inside the ``with`` block the yt-dlp binary, release cache and audio
+    cache live in a temporary directory, so nothing in the user's home is
+    touched. Always use ``engine="subprocess"``: the in-process engine runs
+    the real yt-dlp extractors, which cannot be faked.
+
+    Args:
+        dir_root: Directory for the binary and caches (default: a new
+            temporary directory, removed on exit)
+        **kwargs: Passed to :class:`FakeYouTubeServer`
+    """
+
+    _patched = [
+        "github_api_url",
+        "github_download_url",
+        "path_yt_dlp",
+        "path_release_cache",
+    ]
+    _patched_toolchain = ["dir_toolchain", "path_manifest", "_manifest"]
+
+    def __init__(self, dir_root: Path | None = None, **kwargs):
+        self.dir_root = dir_root
+        self.kwargs = kwargs
+        self.server: FakeYouTubeServer | None = None
+        self._tmp = None
+        self._saved = dict()
+        self._saved_toolchain = dict()
+
+    def __enter__(self) -> "FakeYouTube":
+        if self.dir_root is None:
+            self._tmp = tempfile.TemporaryDirectory()
+            self.dir_root = Path(self._tmp.name)
+        self.server = FakeYouTubeServer(**self.kwargs)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self._saved = {name: getattr(download_audio, name) for name in self._patched}
+        self._saved["audio_cache_dir"] = download_audio.audio_cache.dir_cache
+        self._saved_toolchain = {
+            name: getattr(toolchain, name) for name in self._patched_toolchain
+        }
+        base_url = self.server.base_url
+        download_audio.github_api_url = f"{base_url}/repos/yt-dlp/yt-dlp/releases/latest"
+        download_audio.github_download_url = f"{base_url}/releases/download"
+        download_audio.path_yt_dlp = self.dir_root / "bin" / download_audio.filename
+        download_audio.path_release_cache = self.dir_root / "yt-dlp-release.json"
+        download_audio.audio_cache.dir_cache = self.dir_root / "audio"
+        download_audio.path_yt_dlp.parent.mkdir(parents=True, exist_ok=True)
+        # An empty toolchain, so ensure_yt_dlp() keeps the fake binary
+        toolchain.dir_toolchain = self.dir_root / "toolchain"
+        toolchain.path_manifest = toolchain.dir_toolchain / "manifest.json"
+        toolchain._manifest = None
+        return self
+
+    def __exit__(self, *exc):
+        for name in self._patched:
+            setattr(download_audio, name, self._saved[name])
+        download_audio.audio_cache.dir_cache = self._saved["audio_cache_dir"]
+        for name, value in self._saved_toolchain.items():
+            setattr(toolchain, name, value)
+        self.server.shutdown()
+        self.server.server_close()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+    @property
+    def playlist_url(self) -> str:
+        return "https://www.youtube.com/playlist?list=PLfake"
+
+    def video_url(self, i: int) -> str:
+        return f"https://www.youtube.com/watch?v={self.server.playlist_ids()[i]}"
+
+
+def main():
+    """
+    Main CLI entry point for serving the fake YouTube endpoints.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve fake YouTube / GitHub endpoints for offline tests",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Port to listen on (default: 8765)",
+    )
+    parser.add_argument(
+        "--audio-seconds",
+        type=float,
+        default=10.0,
+        help="Duration of every synthetic video (default: 10)",
+    )
+    parser.add_argument(
+        "--playlist-size",
+        type=int,
+        default=20,
+        help="Number of videos in the fake playlist (default: 20)",
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=int,
+        default=None,
+        help="Throttle audio downloads to this many bytes per second (default: no limit)",
+    )
+    args = parser.parse_args()
+
+    server = FakeYouTubeServer(
+        address=("127.0.0.1", args.port),
+        audio_seconds=args.audio_seconds,
+        playlist_size=args.playlist_size,
+        bandwidth=args.bandwidth,
+    )
+    print(f"✓ Fake YouTube serving at {server.base_url}")
+    print(f"  releases API: {server.base_url}/repos/yt-dlp/yt-dlp/releases/latest")
+    print(f"  fake yt-dlp:  {server.base_url}/releases/download/{server.version}/yt-dlp_linux")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+Adaptive Audio Format Selection
+
+Resolves ``--quality auto`` to one concrete yt-dlp format ID per video: the
+smallest native audio-only stream that still meets an ASR quality floor.
+
+Speech recognition does not benefit from music-grade bitrates, and YouTube
+usually offers opus at ~50 kbps next to ~130 kbps AAC. The default selector
+``bestaudio[abr<=64]/worstaudio`` is one-size-fits-all; this one:
+
+1. drops formats below the floor of their codec (:data:`asr_min_abr`)
+2. prefers a format whose codec already matches the output format, so
+   ffmpeg only remuxes (e.g. opus for ``--profile asr-opus``)
+3. picks the smallest estimated download (``filesize``, ``filesize_approx``
+   or ``abr x duration``), opus first when sizes are within 10%
+
+The available formats are read from the metadata index (metadata_index.py)
+when the video is in it, otherwise one ``yt-dlp -J`` probe is made and its
+result is stored in the index when one is given.
+
+Every choice is reported as a "format" event carrying the estimated bytes
+saved compared to the default selector.
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import time
+import threading
+import dataclasses
+from pathlib import Path
+
+import metadata_index
+
+# Default selector of download_audio(), used as the baseline for savings
+default_quality = "bestaudio[abr<=64]/worstaudio"
+
+# Lowest average bitrate (kbps) per codec that still transcribes as well as
+# the source; AAC needs more bits than opus for the same speech quality
+asr_min_abr = {
+    "opus": 32,
+    "mp4a": 48,
+}
+default_min_abr = 48
+
+# Output format -> codec it can be produced from without re-encoding
+_remux_codecs = {
+    "opus": "opus",
+    "m4a": "mp4a",
+    "aac": "mp4a",
+    "vorbis": "vorbis",
+}
+
+_codec_rank = ["opus", "mp4a", "vorbis"]
+
+
+def codec_family(acodec: str | None) -> str:
+    """
+    ``"mp4a.40.2"`` -> ``"mp4a"``, ``"opus"`` -> ``"opus"``.
+    """
+    return (acodec or "").split(".")[0].lower()
+
+
+def estimate_bytes(fmt: dict, duration: float | None) -> int | None:
+    """
+    Best known download size of a format, in bytes.
+    """
+    size = fmt.get("filesize") or fmt.get("filesize_approx")
+    if size:
+        return int(size)
+    if fmt.get("abr") and duration:
+        return int(fmt["abr"] * 1000 / 8 * duration)
+    return None
+
+
+@dataclasses.dataclass
+class FormatChoice:
+    """
+    The format picked for one video and what the default selector would
+    have downloaded instead.
+    """
+
+    format_id: str
+    acodec: str | None
+    abr: float | None
+    needs_transcode: bool
+    estimated_bytes: int | None
+    default_format_id: str | None
+    default_bytes: int | None
+
+    @property
+    def bytes_saved(self) -> int | None:
+        if self.estimated_bytes is None or self.default_bytes is None:
+            return None
+        return self.default_bytes - self.estimated_bytes
+
+    def to_event(self, video_id: str | None) -> dict:
+        event = {"event": "format", "video_id": video_id}
+        event.update(dataclasses.asdict(self))
+        event["bytes_saved"] = self.bytes_saved
+        event["time"] = time.time()
+        return event
+
+
+def select_default_format(formats: list[dict]) -> dict | None:
+    """
+    Emulate :data:`default_quality` on a list of audio-only formats.
+    """
+    if not formats:
+        return None
+    capped = [fmt for fmt in formats if fmt.get("abr") and fmt["abr"] <= 64]
+    if capped:
+        return max(capped, key=lambda fmt: fmt["abr"])
+    return min(formats, key=lambda fmt: fmt.get("abr") or float("inf"))
+
+
+def select_audio_format(
+    formats: list[dict],
+    duration: float | None = None,
+    audio_format: str = "mp3",
+    min_abr: float | None = None,
+) -> FormatChoice | None:
+    """
+    Pick the smallest audio-only format meeting the ASR quality floor.
+
+    Args:
+        formats: Audio-only yt-dlp formats, as stored in the metadata index
+        duration: Video duration in seconds, used to estimate sizes
+        audio_format: Output format, formats of the matching codec need no
+            transcode and are preferred
+        min_abr: Floor in kbps for every codec, overrides :data:`asr_min_abr`
+
+    Returns:
+        The choice, or None when there is no audio-only format
+    """
+    formats = [fmt for fmt in formats if fmt.get("format_id")]
+    if not formats:
+        return None
+    remux_codec = _remux_codecs.get(audio_format)
+
+    def floor(fmt: dict) -> float:
+        if min_abr is not None:
+            return min_abr
+        return asr_min_abr.get(codec_family(fmt.get("acodec")), default_min_abr)
+
+    def rank(fmt: dict) -> int:
+        family = codec_family(fmt.get("acodec"))
+        return _codec_rank.index(family) if family in _codec_rank else len(_codec_rank)
+
+    def size(fmt: dict) -> float:
+        return estimate_bytes(fmt, duration) or float("inf")
+
+    eligible = [fmt for fmt in formats if (fmt.get("abr") or 0) >= floor(fmt)]
+    if eligible:
+        no_transcode = [
+            fmt
+            for fmt in eligible
+            if codec_family(fmt.get("acodec")) == remux_codec
+        ]
+        candidates = no_transcode or eligible
+        # Within 10% of the smallest, the better codec wins over a few bytes
+        smallest = min(size(fmt) for fmt in candidates)
+        chosen = min(
+            (fmt for fmt in candidates if size(fmt) <= smallest * 1.1),
+            key=lambda fmt: (rank(fmt), size(fmt), fmt.get("abr") or 0),
+        )
+    else:
+        # Nothing reaches the floor, take the closest one
+        chosen = max(formats, key=lambda fmt: (fmt.get("abr") or 0, -rank(fmt)))
+
+    default = select_default_format(formats)
+    return FormatChoice(
+        format_id=str(chosen["format_id"]),
+        acodec=chosen.get("acodec"),
+        abr=chosen.get("abr"),
+        needs_transcode=codec_family(chosen.get("acodec")) != remux_codec,
+        estimated_bytes=estimate_bytes(chosen, duration),
+        default_format_id=str(default["format_id"]) if default else None,
+        default_bytes=estimate_bytes(default, duration) if default else None,
+    )
+
+
+def get_audio_formats(
+    video_url: str,
+    video_id: str | None,
+    path_yt_dlp: Path,
+    engine: str = "subprocess",
+    index: "metadata_index.MetadataIndex | None" = None,
+) -> tuple[list[dict], float | None]:
+    """
+    Get a video's audio-only formats and duration, from ``index`` when it
+    has a full (non flat) record, otherwise from one yt-dlp probe.
+
+    Args:
+        video_url: YouTube video URL
+        video_id: Its video ID, None when unknown (the index is not read)
+        path_yt_dlp: yt-dlp binary, used by the ``"subprocess"`` engine
+        engine: Resolved engine, ``"library"`` or ``"subprocess"``
+        index: Metadata index to read from and store the probe in
+
+    Returns:
+        ``(audio_formats, duration)``
+    """
+    if index is not None and video_id is not None:
+        record = index.get(video_id)
+        if record and not record["is_flat"] and record["audio_formats"]:
+            return record["audio_formats"], record["duration"]
+    info = metadata_index.fetch_video_info(video_url, path_yt_dlp, engine=engine)
+    record = metadata_index.info_to_record(info)
+    if index is not None:
+        index.upsert(record)
+    return record["audio_formats"], record["duration"]
+
+
+def resolve_auto_quality(
+    video_url: str,
+    video_id: str | None,
+    path_yt_dlp: Path,
+    audio_format: str = "mp3",
+    min_abr: float | None = None,
+    engine: str = "subprocess",
+    index: "metadata_index.MetadataIndex | None" = None,
+) -> FormatChoice | None:
+    """
+    Resolve ``--quality auto`` for one video, the video and engine arguments
+    are those of :func:`get_audio_formats`.
+
+    Returns:
+        The choice, or None when no audio-only format is known, in which
+        case the caller should fall back to :data:`default_quality`
+    """
+    formats, duration = get_audio_formats(
+        video_url, video_id, path_yt_dlp, engine=engine, index=index
+    )
+    return select_audio_format(
+        formats,
+        duration=duration,
+        audio_format=audio_format,
+        min_abr=min_abr,
+    )
+
+
+def _format_mb(n: int | None) -> str:
+    return "?" if n is None else f"{n / 1024 / 1024:.1f} MB"
+
+
+class FormatSavings:
+    """
+    Thread-safe ``on_event`` callback summing the "format" events of a run,
+    and printing each choice when ``verbose``.
+    """
+
+    def __init__(self, verbose: bool = True):
+        self.verbose = verbose
+        self.videos = 0
+        self.bytes = 0
+        self.default_bytes = 0
+        self.remuxed = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict):
+        if event.get("event") != "format":
+            return
+        with self._lock:
+            self.videos += 1
+            if event["bytes_saved"] is not None:
+                self.bytes += event["estimated_bytes"]
+                self.default_bytes += event["default_bytes"]
+            if not event["needs_transcode"]:
+                self.remuxed += 1
+        if self.verbose:
+            transcode = "transcode" if event["needs_transcode"] else "no transcode"
+            print(
+                f"✓ {event['video_id']}: format {event['format_id']} "
+                f"({event['acodec']}, {event['abr']} kbps, {transcode}), "
+                f"~{_format_mb(event['estimated_bytes'])}, "
+                f"saves ~{_format_mb(event['bytes_saved'])} vs default selector"
+            )
+
+    def report(self):
+        """
+        Print the totals.
+        """
+        with self._lock:
+            saved = self.default_bytes - self.bytes
+            percent = 100 * saved / self.default_bytes if self.default_bytes else 0.0
+            print(
+                f"✓ Auto format: {self.videos} videos, {self.remuxed} without transcode, "
+                f"~{_format_mb(self.bytes)} instead of ~{_format_mb(self.default_bytes)} "
+                f"({percent:.0f}% saved)"
+            )
@@ -0,0 +1,607 @@
+# -*- coding: utf-8 -*-
+
+"""
+YouTube Metadata Index
+
+Resolves many video / playlist / channel URLs concurrently through yt-dlp and
+stores each video's metadata in a local SQLite index, so later stages can plan
+work without probing the network again:
+
+- duration, title, language and chapters
+- available audio-only formats (codec, bitrate, size)
+- available subtitle and auto-caption languages
+- whether the video was already processed, and into which output files
+
+Batch downloads (``download_audio.py --batch --index``) use it to skip
+already-processed IDs, schedule the longest videos first and print the
+estimated audio hours before they start.
+
+Default Behavior:
+    - Index: ~/.cache/sanhe-claude-code-plugins/youtube/metadata.sqlite
+    - Mode: full per-video JSON dump (``yt-dlp -J``), ``--flat`` only lists
+      playlist entries (title + duration), one request per playlist page
+    - Already indexed IDs are not fetched again unless ``--refresh`` is given
+
+Example Usage:
+    # Index a whole channel with 16 concurrent probes
+    $ python metadata_index.py --video-url "https://www.youtube.com/@channel/videos" --workers 16
+
+    # Cheap flat listing, then show the longest unprocessed videos
+    $ python metadata_index.py --video-url "https://www.youtube.com/playlist?list=PLxyz" --flat --show 20
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import subprocess
+import threading
+import urllib.parse
+import typing as T
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import ytdlp_engine
+from retry_policy import format_error
+
+dir_cache = Path.home() / ".cache" / "sanhe-claude-code-plugins" / "youtube"
+path_metadata_index = dir_cache / "metadata.sqlite"
+
+_schema = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    duration REAL,
+    language TEXT,
+    chapters TEXT,
+    audio_formats TEXT,
+    subtitles TEXT,
+    auto_captions TEXT,
+    is_flat INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,
+    processed_at REAL
+)
+"""
+
+# One row per output file a video was processed into, a video processed into
+# another directory or audio format is not done for this one
+_outputs_schema = """
+CREATE TABLE IF NOT EXISTS outputs (
+    video_id TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    audio_format TEXT,
+    processed_at REAL NOT NULL,
+    PRIMARY KEY (video_id, output_path)
+)
+"""
+
+_json_columns = ["chapters", "audio_formats", "subtitles", "auto_captions"]
+
+_audio_format_fields = [
+    "format_id",
+    "ext",
+    "acodec",
+    "abr",
+    "asr",
+    "audio_channels",
+    "filesize",
+    "filesize_approx",
+    "protocol",
+]
+
+
+def fetch_video_info(
+    video_url: str,
+    path_yt_dlp: Path,
+    engine: str = "subprocess",
+) -> dict:
+    """
+    Fetch one video's full yt-dlp info dict without downloading any media.
+
+    Args:
+        video_url: YouTube video URL
+        path_yt_dlp: yt-dlp binary, used by the ``"subprocess"`` engine
+        engine: Resolved engine, ``"library"`` or ``"subprocess"``
+    """
+    if engine == "library":
+        return ytdlp_engine.extract_info(video_url)
+    args = [
+        f"{path_yt_dlp}",
+        "--dump-single-json",
+        "--skip-download",
+        "--no-playlist",
+        video_url,
+    ]
+    result = subprocess.run(args, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def fetch_flat_entries(
+    url: str,
+    path_yt_dlp: Path,
+    engine: str = "subprocess",
+) -> list[dict]:
+    """
+    List a playlist / channel with ``--flat-playlist``: one request per page
+    instead of one per video, but only ``id``, ``title`` and ``duration``.
+    Arguments as in :func:`fetch_video_info`.
+    """
+    if engine == "library":
+        info = ytdlp_engine.extract_info(url, flat=True)
+    else:
+        args = [
+            f"{path_yt_dlp}",
+            "--flat-playlist",
+            "--dump-single-json",
+            url,
+        ]
+        result = subprocess.run(args, check=True, capture_output=True, text=True)
+        info = json.loads(result.stdout)
+    entries = list()
+    for entry in info.get("entries") or [info]:
+        # Channel URLs return one nested playlist per tab
+        if entry.get("_type") == "playlist" or entry.get("ie_key") == "YoutubeTab":
+            entries.extend(
+                fetch_flat_entries(entry["url"], path_yt_dlp, engine=engine)
+            )
+        elif entry.get("id"):
+            entries.append(entry)
+    return entries
+
+
+def info_to_record(info: dict, is_flat: bool = False) -> dict:
+    """
+    Reduce a yt-dlp info dict to an index record.
+    """
+    video_id = info["id"]
+    audio_formats = [
+        {k: fmt.get(k) for k in _audio_format_fields}
+        for fmt in info.get("formats") or []
+        if fmt.get("vcodec") == "none" and fmt.get("acodec") not in (None, "none")
+    ]
+    language = info.get("language")
+    auto = info.get("automatic_captions") or {}
+    # only the original language auto captions are useful, not translations
+    auto_captions = sorted(
+        key
+        for key in auto
+        if key.endswith("-orig")
+        or (language and key.split("-")[0] == language.split("-")[0])
+    )
+    return {
+        "video_id": video_id,
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "title": info.get("title"),
+        "duration": info.get("duration"),
+        "language": language,
+        "chapters": [
+            {
+                "title": chapter.get("title"),
+                "start_time": chapter.get("start_time"),
+                "end_time": chapter.get("end_time"),
+            }
+            for chapter in info.get("chapters") or []
+        ],
+        "audio_formats": audio_formats,
+        "subtitles": sorted(
+            key for key in (info.get("subtitles") or {}) if key != "live_chat"
+        ),
+        "auto_captions": auto_captions,
+        "is_flat": int(is_flat),
+        "fetched_at": time.time(),
+    }
+
+
+class MetadataIndex:
+    """
+    SQLite backed index of video metadata.
+
+    The connection is shared between threads and serialized by a lock, the
+    index itself is small and writes are rare compared to network probes.
+
+    Args:
+        path: SQLite database file, created on first use
+    """
+
+    def __init__(self, path: Path = path_metadata_index):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_schema)
+            self._conn.execute(_outputs_schema)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert(self, record: dict):
+        """
+        Insert or replace a record, keeping its ``processed_at`` mark.
+        """
+        values = dict(record)
+        for column in _json_columns:
+            values[column] = json.dumps(values.get(column) or [])
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO videos (
+                    video_id, url, title, duration, language, chapters,
+                    audio_formats, subtitles, auto_captions, is_flat, fetched_at
+                )
+                VALUES (
+                    :video_id, :url, :title, :duration, :language, :chapters,
+                    :audio_formats, :subtitles, :auto_captions, :is_flat, :fetched_at
+                )
+                ON CONFLICT(video_id) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    duration = excluded.duration,
+                    language = excluded.language,
+                    chapters = excluded.chapters,
+                    audio_formats = excluded.audio_formats,
+                    subtitles = excluded.subtitles,
+                    auto_captions = excluded.auto_captions,
+                    is_flat = excluded.is_flat,
+                    fetched_at = excluded.fetched_at
+                """,
+                values,
+            )
+
+    def _to_record(self, row: sqlite3.Row) -> dict:
+        record = dict(row)
+        for column in _json_columns:
+            record[column] = json.loads(record[column] or "[]")
+        return record
+
+    def get(self, video_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def get_many(self, video_ids: list[str]) -> dict[str, dict]:
+        """
+        Look up many records at once.
+
+        Returns:
+            Mapping of video ID to record, unknown IDs are left out
+        """
+        records = dict()
+        for i in range(0, len(video_ids), 500):
+            chunk = video_ids[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT * FROM videos WHERE video_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            for row in rows:
+                records[row["video_id"]] = self._to_record(row)
+        return records
+
+    def mark_processed(
+        self,
+        video_id: str,
+        output_path: str | None = None,
+        audio_format: str | None = None,
+    ):
+        """
+        Mark a video as processed, and when ``output_path`` is given, as
+        processed into that file.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE videos SET processed_at = ? WHERE video_id = ?",
+                (now, video_id),
+            )
+            if output_path is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO outputs "
+                    "(video_id, output_path, audio_format, processed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (video_id, str(Path(output_path).absolute()), audio_format, now),
+                )
+
+    def processed_ids(
+        self,
+        output_dir: Path | None = None,
+        audio_format: str | None = None,
+    ) -> set[str]:
+        """
+        IDs of the videos processed into an output file (the ``outputs``
+        table).
+
+        Args:
+            output_dir: Only count output files in this directory
+            audio_format: Only count output files of this audio format
+
+        Without a filter, videos marked processed without an output file
+        count as well.
+        """
+        output_dir = str(Path(output_dir).absolute()) if output_dir else None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id, output_path, audio_format FROM outputs"
+            ).fetchall()
+            if output_dir is None and audio_format is None:
+                rows += self._conn.execute(
+                    "SELECT video_id, NULL AS output_path, NULL AS audio_format "
+                    "FROM videos WHERE processed_at IS NOT NULL"
+                ).fetchall()
+        return {
+            row["video_id"]
+            for row in rows
+            if (output_dir is None or str(Path(row["output_path"]).parent) == output_dir)
+            and (audio_format is None or row["audio_format"] == audio_format)
+        }
+
+    def processed_outputs(self) -> set[tuple[str, str]]:
+        """
+        ``(video_id, absolute output path)`` of every processed output file.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id, output_path FROM outputs"
+            ).fetchall()
+        return {(row["video_id"], row["output_path"]) for row in rows}
+
+    def pending(
+        self,
+        limit: int | None = None,
+        output_dir: Path | None = None,
+        audio_format: str | None = None,
+    ) -> list[dict]:
+        """
+        Videos not in :meth:`processed_ids` (with the same filters), longest
+        first (unknown durations last).
+        """
+        processed = self.processed_ids(output_dir, audio_format)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM videos ORDER BY duration IS NULL, duration DESC"
+            ).fetchall()
+        records = [
+            self._to_record(row) for row in rows if row["video_id"] not in processed
+        ]
+        return records[:limit] if limit else records
+
+
+def prefetch_metadata(
+    urls: list[str],
+    index: MetadataIndex,
+    path_yt_dlp: Path,
+    expand_video_urls: T.Callable[[str], list[str]],
+    workers: int = 8,
+    flat: bool = False,
+    refresh: bool = False,
+    engine: str = "subprocess",
+) -> dict:
+    """
+    Resolve ``urls`` and store every video's metadata in ``index``.
+
+    Playlist and channel URLs are expanded first. In full mode every video
+    not yet in the index (or every video with ``refresh``) is probed with
+    ``yt-dlp -J`` by a pool of ``workers`` threads; in flat mode the playlist
+    listing itself is stored.
+
+    Args:
+        urls: Video, playlist or channel URLs
+        index: Index to fill
+        path_yt_dlp: yt-dlp binary, used by the ``"subprocess"`` engine
+        expand_video_urls: Turns one URL into its
+            ``https://www.youtube.com/watch?v=ID`` video URLs, e.g.
+            ``download_audio.expand_video_urls``
+        workers: Concurrent probes
+        flat: Only store the playlist listing
+        refresh: Probe videos that are already indexed again
+        engine: Resolved engine, ``"library"`` or ``"subprocess"``
+
+    Returns:
+        Counts: ``{"indexed": ..., "skipped": ..., "failed": ...}``
+    """
+    stats = {"indexed": 0, "skipped": 0, "failed": 0}
+    if flat:
+        for url in urls:
+            try:
+                entries = fetch_flat_entries(url, path_yt_dlp, engine=engine)
+            except Exception as e:
+                print(f"✗ {url}: {format_error(e)}")
+                stats["failed"] += 1
+                continue
+            for entry in entries:
+                existing = index.get(entry["id"])
+                if existing and not existing["is_flat"] and not refresh:
+                    stats["skipped"] += 1
+                    continue
+                index.upsert(info_to_record(entry, is_flat=True))
+                stats["indexed"] += 1
+        return stats
+
+    video_urls = list()
+    for url in urls:
+        try:
+            video_urls.extend(expand_video_urls(url))
+        except Exception as e:
+            print(f"✗ {url}: {format_error(e)}")
+            stats["failed"] += 1
+    video_ids = [
+        urllib.parse.parse_qs(urllib.parse.urlparse(url).query)["v"][0]
+        for url in video_urls
+    ]
+    existing = index.get_many(video_ids)
+    todo = list()
+    for video_id, video_url in dict(zip(video_ids, video_urls)).items():
+        if video_id in existing and not existing[video_id]["is_flat"] and not refresh:
+            stats["skipped"] += 1
+        else:
+            todo.append(video_url)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(
+                fetch_video_info, video_url, path_yt_dlp, engine
+            ): video_url
+            for video_url in todo
+        }
+        for future in as_completed(futures):
+            video_url = futures[future]
+            try:
+                index.upsert(info_to_record(future.result()))
+                stats["indexed"] += 1
+            except Exception as e:
+                print(f"✗ {video_url}: {format_error(e)}")
+                stats["failed"] += 1
+    return stats
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def main():
+    """
+    Main CLI entry point for prefetching video metadata into the index.
+    """
+    # Only imported here: download_audio.py imports this module, and as a
+    # library this module gets the yt-dlp path and helpers as arguments
+    import download_audio
+
+    parser = argparse.ArgumentParser(
+        description="Prefetch YouTube video metadata into a local SQLite index",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --video-url "https://www.youtube.com/@channel/videos" --workers 16
+  %(prog)s --url-file "~/tmp/urls.txt"
+  %(prog)s --video-url "https://www.youtube.com/playlist?list=PLxyz" --flat --show 20
+        """,
+    )
+    parser.add_argument(
+        "--video-url",
+        type=str,
+        default=None,
+        help="Video, playlist or channel URL",
+    )
+    parser.add_argument(
+        "--url-file",
+        type=str,
+        default=None,
+        help="Text file with one video/playlist/channel URL per line",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of concurrent metadata probes (default: 8)",
+    )
+    parser.add_argument(
+        "--flat",
+        action="store_true",
+        help="Only store the playlist listing (id, title, duration), no per-video probe",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Probe videos again even if they are already in the index",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="auto",
+        choices=download_audio.engines,
+        help="yt-dlp engine, see download_audio.py (default: auto)",
+    )
+    parser.add_argument(
+        "--index-path",
+        type=str,
+        default=str(path_metadata_index),
+        help=f"SQLite index file (default: {path_metadata_index})",
+    )
+    parser.add_argument(
+        "--show",
+        type=int,
+        default=0,
+        help="Print the N longest unprocessed videos after indexing",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Only count videos processed into this --batch output directory as processed (default: any)",
+    )
+    parser.add_argument(
+        "--audio-format",
+        type=str,
+        default=None,
+        help="Only count videos processed into this audio format as processed (default: any)",
+    )
+    args = parser.parse_args()
+
+    urls = list()
+    if args.video_url:
+        urls.append(args.video_url)
+    if args.url_file:
+        urls.extend(download_audio.read_url_file(Path(args.url_file).expanduser()))
+
+    engine = download_audio.resolve_engine(args.engine)
+    if engine == "subprocess":
+        try:
+            download_audio.ensure_yt_dlp()
+        except download_audio.toolchain.VersionNotInstalled as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+
+    with MetadataIndex(Path(args.index_path).expanduser()) as index:
+        if urls:
+            start = time.perf_counter()
+            stats = prefetch_metadata(
+                urls=urls,
+                index=index,
+                workers=args.workers,
+                flat=args.flat,
+                refresh=args.refresh,
+                engine=engine,
+                path_yt_dlp=download_audio.path_yt_dlp,
+                expand_video_urls=lambda url: download_audio.expand_video_urls(
+                    url, engine=engine
+                ),
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"✓ Indexed {stats['indexed']}, skipped {stats['skipped']}, "
+                f"failed {stats['failed']} in {elapsed:.1f}s"
+            )
+        pending = index.pending(
+            output_dir=Path(args.output_dir).expanduser() if args.output_dir else None,
+            audio_format=args.audio_format,
+        )
+        total = sum(record["duration"] or 0 for record in pending)
+        print(f"✓ {len(pending)} unprocessed videos, {total / 3600:.1f} audio hours")
+        for record in pending[: args.show]:
+            print(
+                f"  {format_duration(record['duration']):>9}  "
+                f"{record['video_id']}  {record['title']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
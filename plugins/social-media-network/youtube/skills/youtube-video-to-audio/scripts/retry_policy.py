@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+"""
+Download Retry Policy
+
+Wraps one video download in bounded retries, so a multi-hour video on a
+flaky link resumes instead of starting from zero, and a batch run does not
+stall on a URL that can never succeed:
+
+- Every failure is classified as retryable (network errors, timeouts, HTTP
+  429 / 5xx, truncated fragments) or fatal (private, removed, age or member
+  restricted, unsupported URL, ...). Fatal errors are raised at once.
+- Retryable errors are retried with exponential backoff plus jitter until
+  ``max_attempts`` or the per-video ``deadline`` is reached.
+- Retries reuse the same output path, and yt-dlp runs with ``--continue``,
+  so the ``.part`` file of the failed attempt is resumed, not re-downloaded.
+
+Inside each attempt yt-dlp itself also retries single HTTP requests and
+fragments (:meth:`RetryPolicy.yt_dlp_args`); this outer loop handles what
+escapes those, e.g. a dropped connection that kills the whole process.
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import re
+import time
+import random
+import functools
+import subprocess
+import dataclasses
+import typing as T
+
+# Messages yt-dlp prints for videos that will never download, however often
+# they are retried
+_fatal_patterns = [
+    r"video unavailable",
+    r"private video",
+    r"has been removed",
+    r"account associated with this video has been terminated",
+    r"sign in to confirm your age",
+    r"members-only",
+    r"join this channel",
+    r"copyright",
+    r"not available in your country",
+    r"unsupported url",
+    r"is not a valid url",
+    r"requested format is not available",
+    r"premieres in",
+    r"this live event will begin",
+    r"http error 404",
+    r"http error 410",
+    r"no such file or directory",
+]
+
+_retryable_patterns = [
+    r"timed? ?out",
+    r"connection (reset|refused|aborted)",
+    r"remote end closed",
+    r"incompleteread",
+    r"temporary failure in name resolution",
+    r"network is unreachable",
+    r"http error 429",
+    r"http error 5\d\d",
+    r"http error 403",  # expired signed media URL, a fresh extraction fixes it
+    r"fragment",
+    r"unable to download",
+    r"got error",
+]
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a video did not finish within its per-video deadline.
+    """
+
+
+def _error_text(e: BaseException) -> str:
+    """
+    The text to classify ``e`` by. For a failed yt-dlp process only what it
+    printed counts: ``str(e)`` holds the whole command line, whose flags
+    (``--fragment-retries``, ``--socket-timeout``, ...) would match the
+    retryable patterns on every failure.
+    """
+    if not isinstance(e, subprocess.CalledProcessError):
+        return str(e).lower()
+    parts = list()
+    for stream in (e.stderr, e.output):
+        if isinstance(stream, bytes):
+            stream = stream.decode("utf-8", errors="replace")
+        if stream:
+            parts.append(stream)
+    return "\n".join(parts).lower()
+
+
+def format_error(e: BaseException) -> str:
+    """
+    Turn an exception into a one line message, including yt-dlp's stderr.
+    """
+    if isinstance(e, subprocess.CalledProcessError) and e.stderr:
+        stderr = e.stderr
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode("utf-8", errors="replace")
+        lines = [line for line in stderr.strip().splitlines() if line.strip()]
+        if lines:
+            return lines[-1]
+    return f"{type(e).__name__}: {e}"
+
+
+def is_retryable(e: BaseException) -> bool:
+    """
+    Classify a download failure.
+
+    Returns:
+        True if another attempt may succeed, False if the error is fatal
+    """
+    if isinstance(e, DeadlineExceeded):
+        return False
+    if isinstance(e, (subprocess.TimeoutExpired, ConnectionError, TimeoutError)):
+        return True
+    text = _error_text(e)
+    if any(re.search(pattern, text) for pattern in _fatal_patterns):
+        return False
+    if any(re.search(pattern, text) for pattern in _retryable_patterns):
+        return True
+    # A process that failed without a recognised message is not retried
+    if isinstance(e, subprocess.CalledProcessError):
+        return False
+    # OSError covers socket and URL errors raised while talking to the network
+    return isinstance(e, OSError) and not isinstance(e, FileExistsError)
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """
+    Retry, resume and concurrency settings for one video download.
+
+    Args:
+        max_attempts: Whole-download attempts, 1 disables the outer retries
+        backoff_base: Delay before the second attempt, in seconds, doubled
+            for every following one
+        backoff_max: Upper bound of a single delay, in seconds
+        deadline: Give up on a video after this many seconds, None for no limit
+        concurrent_fragments: DASH / HLS fragments fetched in parallel
+        fragment_retries: yt-dlp retries of a single fragment
+        http_retries: yt-dlp retries of a single HTTP request
+        socket_timeout: Seconds without data before a request is retried
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 2.0
+    backoff_max: float = 60.0
+    deadline: float | None = None
+    concurrent_fragments: int = 4
+    fragment_retries: int = 10
+    http_retries: int = 10
+    socket_timeout: float = 30.0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay after the failed ``attempt`` (1-based), with +-25% jitter so
+        parallel workers do not retry in lockstep.
+        """
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay * random.uniform(0.75, 1.25)
+
+    def yt_dlp_args(self) -> list[str]:
+        """
+        yt-dlp CLI arguments for the in-attempt retries, resume and
+        fragment concurrency.
+        """
+        return [
+            "--continue",
+            "--concurrent-fragments",
+            str(self.concurrent_fragments),
+            "--retries",
+            str(self.http_retries),
+            "--fragment-retries",
+            str(self.fragment_retries),
+            "--retry-sleep",
+            f"http:exp=1:{self.backoff_max:g}",
+            "--retry-sleep",
+            f"fragment:exp=1:{self.backoff_max:g}",
+            "--socket-timeout",
+            f"{self.socket_timeout:g}",
+        ]
+
+    def yt_dlp_params(self) -> dict:
+        """
+        The same settings as :meth:`yt_dlp_args`, as ``YoutubeDL`` params.
+        """
+        # A partial of a module level function has a stable repr, which keeps
+        # the per-thread YoutubeDL instance cache in ytdlp_engine.py warm
+        retry_sleep = functools.partial(_retry_sleep, self.backoff_max)
+        return {
+            "continuedl": True,
+            "concurrent_fragment_downloads": self.concurrent_fragments,
+            "retries": self.http_retries,
+            "fragment_retries": self.fragment_retries,
+            "retry_sleep_functions": {"http": retry_sleep, "fragment": retry_sleep},
+            "socket_timeout": self.socket_timeout,
+        }
+
+
+def _retry_sleep(backoff_max: float, n: int) -> float:
+    return min(backoff_max, 2.0**n)
+
+
+default_retry_policy = RetryPolicy()
+
+
+def run_with_retry(
+    func: T.Callable[[float | None], T.Any],
+    policy: RetryPolicy = default_retry_policy,
+    on_retry: T.Callable[[int, float, BaseException], None] | None = None,
+):
+    """
+    Call ``func`` until it succeeds, fails fatally, or the policy gives up.
+
+    Args:
+        func: One download attempt, called with the seconds left before the
+            deadline (None without a deadline)
+        policy: Retry settings
+        on_retry: Called with ``(failed_attempt, delay, error)`` before
+            sleeping for ``delay`` seconds
+
+    Returns:
+        What ``func`` returned
+
+    Raises:
+        The last error, or :class:`DeadlineExceeded` if the deadline expired
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = None
+        if policy.deadline is not None:
+            remaining = policy.deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                raise DeadlineExceeded(
+                    f"gave up after {attempt - 1} attempts, "
+                    f"deadline of {policy.deadline:g}s exceeded"
+                )
+        try:
+            return func(remaining)
+        except Exception as e:
+            if isinstance(e, subprocess.TimeoutExpired) and policy.deadline is not None:
+                raise DeadlineExceeded(
+                    f"deadline of {policy.deadline:g}s exceeded during attempt {attempt}"
+                ) from e
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.backoff(attempt)
+            if policy.deadline is not None:
+                left = policy.deadline - (time.monotonic() - started)
+                delay = min(delay, max(0.0, left))
+            if on_retry is not None:
+                on_retry(attempt, delay, e)
+            time.sleep(delay)
@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+
+"""
+Versioned yt-dlp / ffmpeg Toolchain
+
+Keeps hash-pinned copies of the external binaries in a shared cache
+directory, one directory per version, so several versions can live side by
+side and a known-good yt-dlp can be pinned when a new release regresses::
+
+    ~/.cache/sanhe-claude-code-plugins/youtube/toolchain/
+        manifest.json
+        yt-dlp/2025.09.26/yt-dlp_linux
+        yt-dlp/2025.10.22/yt-dlp_linux
+        ffmpeg/7.1/ffmpeg
+        ffmpeg/7.1/ffprobe
+
+Every binary is resolved and verified (runs, SHA-256 recorded) once, and
+the result is written to ``manifest.json``. ``download_audio.py`` reads
+only the manifest at import time to find its binaries, later runs do not
+probe the filesystem or ``PATH`` again. ``verify`` re-hashes everything on
+demand to detect a replaced or corrupted binary.
+
+Version Selection (yt-dlp):
+    1. ``YT_DLP_VERSION`` environment variable, e.g. to run two versions side
+       by side from two shells. It must name an installed version, the
+       scripts exit with an error otherwise
+    2. the pinned version (``pin``)
+    3. the most recently installed version
+
+Example Usage:
+    # Install the latest yt-dlp and register ffmpeg (found in ~/ffmpeg or PATH)
+    $ python toolchain.py install
+    $ python toolchain.py add-ffmpeg
+
+    # A new yt-dlp release regressed: go back to a known-good one
+    $ python toolchain.py pin 2025.09.26
+    $ python toolchain.py unpin
+
+    # Show what is installed, re-hash every binary
+    $ python toolchain.py status
+    $ python toolchain.py verify
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+import typing as T
+from pathlib import Path
+
+dir_cache = Path.home() / ".cache" / "sanhe-claude-code-plugins" / "youtube"
+dir_toolchain = dir_cache / "toolchain"
+path_manifest = dir_toolchain / "manifest.json"
+
+_exe_suffix = ".exe" if sys.platform in ["win32", "cygwin"] else ""
+
+_manifest: dict | None = None
+
+
+def _sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def load_manifest() -> dict:
+    """
+    Read the manifest once per process, an empty one if it does not exist.
+    """
+    global _manifest
+    if _manifest is None:
+        try:
+            _manifest = json.loads(path_manifest.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _manifest = dict()
+    return _manifest
+
+
+def save_manifest(manifest: dict):
+    """
+    Atomically replace the manifest.
+    """
+    global _manifest
+    path_manifest.parent.mkdir(parents=True, exist_ok=True)
+    path_tmp = path_manifest.with_name(f".{path_manifest.name}.{os.getpid()}")
+    path_tmp.write_text(json.dumps(manifest, indent=4), encoding="utf-8")
+    os.replace(path_tmp, path_manifest)
+    _manifest = manifest
+
+
+class VersionNotInstalled(LookupError):
+    """
+    Raised when ``YT_DLP_VERSION`` names a version that is not installed.
+    """
+
+
+def selected_version(tool: str) -> str | None:
+    """
+    The version of ``tool`` ("yt-dlp" or "ffmpeg") to use in this process.
+
+    Raises:
+        VersionNotInstalled: If ``YT_DLP_VERSION`` names a version that is
+            not installed, running another version instead would defeat the
+            point of asking for one
+    """
+    entry = load_manifest().get(tool) or {}
+    if tool == "yt-dlp" and os.environ.get("YT_DLP_VERSION"):
+        version = os.environ["YT_DLP_VERSION"]
+        installed = sorted(entry.get("versions") or {})
+        if version not in installed:
+            raise VersionNotInstalled(
+                f"YT_DLP_VERSION={version} is not installed "
+                f"(installed: {', '.join(installed) or 'none'}), "
+                f"run: python toolchain.py install {version}"
+            )
+        return version
+    return entry.get("pinned") or entry.get("active")
+
+
+def get_path(tool: str) -> Path | None:
+    """
+    Path of the selected version of ``tool`` according to the manifest, or
+    None when nothing is registered. Does not touch the filesystem beyond
+    reading the manifest.
+
+    Raises:
+        VersionNotInstalled: See :func:`selected_version`
+    """
+    version = selected_version(tool)
+    record = ((load_manifest().get(tool) or {}).get("versions") or {}).get(version)
+    if record is None:
+        return None
+    return Path(record["path"])
+
+
+def _record(tool: str, version: str, path: Path, **extra):
+    manifest = load_manifest()
+    entry = manifest.setdefault(tool, {"pinned": None, "active": None, "versions": {}})
+    entry["versions"][version] = {
+        "path": str(path),
+        "sha256": _sha256_file(path),
+        "size": path.stat().st_size,
+        "verified_at": time.time(),
+        **extra,
+    }
+    entry["active"] = version
+    save_manifest(manifest)
+
+
+def install_yt_dlp(
+    version: str,
+    filename: str,
+    download: T.Callable[..., T.Any],
+) -> Path:
+    """
+    Install one yt-dlp release into its own versioned directory, verified
+    against the release's published SHA-256, and make it the active one.
+
+    Args:
+        version: Release tag
+        filename: Name of the platform's release binary, e.g. ``yt-dlp_linux``
+        download: Called with ``version=`` and ``path=`` to download and
+            verify the binary, e.g. ``download_audio.download_yt_dlp``
+
+    Returns:
+        Path of the installed binary
+    """
+    path = dir_toolchain / "yt-dlp" / version / filename
+    download(version=version, path=path)
+    _record("yt-dlp", version, path)
+    return path
+
+
+def pin_yt_dlp(
+    version: str,
+    filename: str,
+    download: T.Callable[..., T.Any],
+) -> Path:
+    """
+    Pin a yt-dlp version, installing it first when needed, see
+    :func:`install_yt_dlp` for the arguments.
+    """
+    entry = load_manifest().get("yt-dlp") or {}
+    if version not in (entry.get("versions") or {}):
+        install_yt_dlp(version, filename, download)
+    manifest = load_manifest()
+    manifest["yt-dlp"]["pinned"] = version
+    save_manifest(manifest)
+    return Path(manifest["yt-dlp"]["versions"][version]["path"])
+
+
+def unpin_yt_dlp():
+    manifest = load_manifest()
+    if manifest.get("yt-dlp"):
+        manifest["yt-dlp"]["pinned"] = None
+        save_manifest(manifest)
+
+
+def get_ffmpeg_version(path: Path) -> str:
+    """
+    Run ``ffmpeg -version`` and return the version, e.g. ``"7.1"``.
+
+    Raises:
+        OSError, subprocess.SubprocessError: If the binary cannot be run
+    """
+    result = subprocess.run(
+        [str(path), "-version"],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    match = re.search(r"ffmpeg version (\S+)", result.stdout)
+    return match.group(1) if match else "unknown"
+
+
+def find_ffmpeg() -> Path | None:
+    """
+    Probe the usual ffmpeg locations: the legacy ``~/ffmpeg``, then ``PATH``.
+    """
+    candidates = [
+        Path.home() / "ffmpeg",
+        Path.home() / "ffmpeg" / f"ffmpeg{_exe_suffix}",
+    ]
+    which = shutil.which("ffmpeg")
+    if which:
+        candidates.append(Path(which))
+    for path in candidates:
+        if path.is_file():
+            return path
+    return None
+
+
+def add_ffmpeg(path: Path | None = None, copy: bool = True) -> Path:
+    """
+    Verify an ffmpeg binary and register it in the manifest.
+
+    Args:
+        path: ffmpeg binary (default: :func:`find_ffmpeg`)
+        copy: Copy it, and ``ffprobe`` next to it, into the versioned
+            toolchain directory instead of referencing it in place
+
+    Returns:
+        Path of the registered binary
+
+    Raises:
+        FileNotFoundError: If no ffmpeg can be found
+    """
+    if path is None:
+        path = find_ffmpeg()
+        if path is None:
+            raise FileNotFoundError(
+                "ffmpeg not found in ~/ffmpeg or PATH, register one with: "
+                "python toolchain.py add-ffmpeg --path /path/to/ffmpeg"
+            )
+    path = path.expanduser().absolute()
+    version = get_ffmpeg_version(path)
+    if copy:
+        dir_version = dir_toolchain / "ffmpeg" / version
+        dir_version.mkdir(parents=True, exist_ok=True)
+        path_target = dir_version / f"ffmpeg{_exe_suffix}"
+        shutil.copy2(path, path_target)
+        # yt-dlp looks for ffprobe next to the ffmpeg it is given
+        path_ffprobe = path.with_name(f"ffprobe{_exe_suffix}")
+        if path_ffprobe.exists():
+            shutil.copy2(path_ffprobe, dir_version / path_ffprobe.name)
+        path = path_target
+    _record("ffmpeg", version, path)
+    return path
+
+
+def verify() -> list[str]:
+    """
+    Re-hash every registered binary and check that the selected ones run.
+
+    Returns:
+        Problems found, empty when everything is fine
+    """
+    problems = list()
+    manifest = load_manifest()
+    for tool, entry in manifest.items():
+        for version, record in (entry.get("versions") or {}).items():
+            path = Path(record["path"])
+            if not path.exists():
+                problems.append(f"{tool} {version}: {path} is missing")
+            elif _sha256_file(path) != record["sha256"]:
+                problems.append(
+                    f"{tool} {version}: {path} does not match its SHA-256"
+                )
+        path = get_path(tool)
+        if path is not None and path.exists():
+            flag = "-version" if tool == "ffmpeg" else "--version"
+            try:
+                subprocess.run(
+                    [str(path), flag],
+                    check=True,
+                    capture_output=True,
+                    timeout=60,
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                problems.append(f"{tool} {selected_version(tool)}: cannot run ({e})")
+    return problems
+
+
+def print_status():
+    manifest = load_manifest()
+    if not manifest:
+        print(f"No toolchain registered yet in {path_manifest}")
+    for tool, entry in manifest.items():
+        selected = selected_version(tool)
+        pinned = entry.get("pinned")
+        for version, record in sorted((entry.get("versions") or {}).items()):
+            marks = list()
+            if version == selected:
+                marks.append("selected")
+            if version == pinned:
+                marks.append("pinned")
+            suffix = f" ({', '.join(marks)})" if marks else ""
+            print(
+                f"{tool} {version}{suffix}: {record['path']} "
+                f"sha256={record['sha256'][:16]}"
+            )
+
+
+def main():
+    """
+    Main CLI entry point for managing the yt-dlp / ffmpeg toolchain.
+    """
+    parser = argparse.ArgumentParser(
+        description="Manage versioned, hash-pinned yt-dlp and ffmpeg binaries",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s install
+  %(prog)s install --version 2025.09.26
+  %(prog)s pin 2025.09.26
+  %(prog)s add-ffmpeg --path /opt/ffmpeg/bin/ffmpeg
+  %(prog)s status
+  %(prog)s verify
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_install = subparsers.add_parser("install", help="Install a yt-dlp release")
+    parser_install.add_argument(
+        "--version",
+        type=str,
+        default=None,
+        help="Release tag (default: latest)",
+    )
+
+    parser_pin = subparsers.add_parser("pin", help="Pin a yt-dlp version")
+    parser_pin.add_argument("version", type=str, help="Release tag to pin")
+
+    subparsers.add_parser("unpin", help="Use the most recently installed yt-dlp again")
+
+    parser_ffmpeg = subparsers.add_parser("add-ffmpeg", help="Register an ffmpeg binary")
+    parser_ffmpeg.add_argument(
+        "--path",
+        type=str,
+        default=None,
+        help="ffmpeg binary (default: ~/ffmpeg, then PATH)",
+    )
+    parser_ffmpeg.add_argument(
+        "--no-copy",
+        action="store_true",
+        help="Reference the binary in place instead of copying it into the toolchain",
+    )
+
+    subparsers.add_parser("status", help="Show the registered binaries")
+    subparsers.add_parser("verify", help="Re-hash and run every registered binary")
+
+    args = parser.parse_args()
+
+    if args.command in ("install", "pin"):
+        # These name the version themselves, and are how a YT_DLP_VERSION
+        # that is not installed yet gets installed
+        os.environ.pop("YT_DLP_VERSION", None)
+    try:
+        selected_version("yt-dlp")
+    except VersionNotInstalled as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    # Only imported here: download_audio.py imports this module
+    import download_audio
+
+    if args.command == "install":
+        path = install_yt_dlp(
+            args.version or download_audio.get_latest_yt_dlp_release(),
+            download_audio.filename,
+            download_audio.download_yt_dlp,
+        )
+        print(f"✓ yt-dlp {selected_version('yt-dlp')} active at {path}")
+    elif args.command == "pin":
+        path = pin_yt_dlp(
+            args.version, download_audio.filename, download_audio.download_yt_dlp
+        )
+        print(f"✓ yt-dlp pinned to {args.version} at {path}")
+    elif args.command == "unpin":
+        unpin_yt_dlp()
+        print(f"✓ yt-dlp unpinned, using {selected_version('yt-dlp')}")
+    elif args.command == "add-ffmpeg":
+        path = add_ffmpeg(
+            Path(args.path) if args.path else None,
+            copy=not args.no_copy,
+        )
+        print(f"✓ ffmpeg {selected_version('ffmpeg')} registered at {path}")
+    elif args.command == "status":
+        print_status()
+    elif args.command == "verify":
+        problems = verify()
+        for problem in problems:
+            print(f"✗ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✓ All registered binaries verified")
+
+
+if __name__ == "__main__":
+    main()
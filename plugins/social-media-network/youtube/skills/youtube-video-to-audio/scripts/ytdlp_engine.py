@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+"""
+In-Process yt-dlp Engine
+
+Drives yt-dlp as an imported Python library instead of launching the
+standalone ``yt-dlp_linux`` / ``yt-dlp_macos`` binary for every video. The
+standalone binary pays a PyInstaller unpack, interpreter startup and
+extractor initialisation on each launch; this engine pays them once per
+process and then reuses the ``YoutubeDL`` object, with its initialised
+extractors and HTTP session, for every following URL.
+
+``YoutubeDL`` is not thread-safe, so every thread (e.g. every batch worker)
+gets its own long-lived instance per distinct option set.
+
+Requirements:
+    - ``pip install yt-dlp`` in the interpreter that runs the scripts. When
+      it is missing, :func:`is_available` is False and ``download_audio.py``
+      falls back to the subprocess engine.
+
+Author: sanhe
+Plugin: youtube@sanhe-claude-code-plugins
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+
+from download_progress import ProgressTracker
+
+try:
+    import yt_dlp
+    from yt_dlp.utils import download_range_func
+except ImportError:  # pragma: no cover
+    yt_dlp = None
+
+_local = threading.local()
+
+
+def is_available() -> bool:
+    """
+    Whether the ``yt_dlp`` package can be imported.
+    """
+    return yt_dlp is not None
+
+
+def _get_ydl(params: dict) -> "yt_dlp.YoutubeDL":
+    """
+    Get this thread's ``YoutubeDL`` for the given option set, creating it on
+    first use.
+    """
+    if yt_dlp is None:  # pragma: no cover
+        raise ImportError(
+            "The in-process engine requires the yt-dlp package, run: pip install yt-dlp"
+        )
+    if not hasattr(_local, "ydls"):
+        _local.ydls = dict()
+    key = json.dumps(params, sort_keys=True, default=str)
+    ydl = _local.ydls.get(key)
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(params)
+        ydl.add_progress_hook(_on_download_progress)
+        ydl.add_postprocessor_hook(_on_postprocess_progress)
+        _local.ydls[key] = ydl
+    return ydl
+
+
+def _strip_info(progress: dict) -> dict:
+    return {k: v for k, v in progress.items() if k != "info_dict"}
+
+
+def _on_download_progress(progress: dict):
+    tracker = getattr(_local, "tracker", None)
+    if tracker is not None:
+        tracker.handle("download", _strip_info(progress))
+
+
+def _on_postprocess_progress(progress: dict):
+    tracker = getattr(_local, "tracker", None)
+    if tracker is not None:
+        tracker.handle("postprocess", _strip_info(progress))
+
+
+def download(
+    video_url: str,
+    output: str,
+    quality: str,
+    audio_format: str,
+    bitrate: str,
+    ffmpeg_location: Path,
+    postprocessor_args: str | None = None,
+    download_sections: str | None = None,
+    tracker: ProgressTracker | None = None,
+    extra_params: dict | None = None,
+) -> str:
+    """
+    Download and extract the audio of one video, same behavior as the
+    subprocess engine in ``download_audio.download_audio()``.
+
+    Args:
+        video_url: YouTube video URL
+        output: Output file path, its extension should be ``audio_format``
+        quality: yt-dlp format selector
+        audio_format: Audio format to extract to
+        bitrate: Audio quality passed to the extractor
+        ffmpeg_location: Path of the ffmpeg binary
+        postprocessor_args: Same syntax as yt-dlp's ``--postprocessor-args``,
+            e.g. ``"ExtractAudio:-ar 16000 -ac 1"``
+        download_sections: Same syntax as yt-dlp's ``--download-sections``
+        tracker: Receives the download and post-processing progress events
+        extra_params: More ``YoutubeDL`` params, e.g. the retry and fragment
+            settings of ``RetryPolicy.yt_dlp_params()``
+
+    Returns:
+        The output path
+
+    Raises:
+        yt_dlp.utils.DownloadError: If the download fails
+    """
+    params = {
+        "format": quality,
+        "restrictfilenames": True,
+        "ffmpeg_location": str(ffmpeg_location),
+        "quiet": True,
+        "noprogress": True,
+        "noplaylist": True,
+        "postprocessors": [
+            {
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": audio_format,
+                "preferredquality": bitrate,
+            }
+        ],
+    }
+    if postprocessor_args:
+        name, _, args = postprocessor_args.partition(":")
+        params["postprocessor_args"] = {name.lower(): args.split()}
+    if extra_params:
+        params.update(extra_params)
+    ydl = _get_ydl(params)
+
+    # Options that change per video are set on the shared instance right
+    # before each call, the instance itself (and its session) is reused
+    stem, _ = os.path.splitext(output)
+    ydl.params["outtmpl"] = {"default": f"{stem}.%(ext)s"}
+    ydl.params.pop("download_ranges", None)
+    if download_sections:
+        if download_sections.startswith("*"):
+            start, _, end = download_sections[1:].partition("-")
+            ranges = [(float(start), float(end))]
+            ydl.params["download_ranges"] = download_range_func(None, ranges)
+        else:
+            ydl.params["download_ranges"] = download_range_func(
+                [download_sections], None
+            )
+    _local.tracker = tracker
+    try:
+        ydl.download([video_url])
+    finally:
+        _local.tracker = None
+    return output
+
+
+def extract_info(url: str, flat: bool = False) -> dict:
+    """
+    Get the JSON serializable info dict of a URL without downloading media,
+    the in-process equivalent of ``yt-dlp --dump-single-json``.
+
+    Args:
+        url: Video, playlist or channel URL
+        flat: Do not resolve playlist entries (``--flat-playlist``)
+    """
+    params = {"quiet": True, "skip_download": True}
+    if flat:
+        params["extract_flat"] = "in_playlist"
+    else:
+        params["noplaylist"] = True
+    ydl = _get_ydl(params)
+    return ydl.sanitize_info(ydl.extract_info(url, download=False))
+
+
+def list_video_ids(url: str) -> list[str]:
+    """
+    List the video IDs of a playlist or channel URL without extracting each
+    video, the in-process equivalent of ``yt-dlp --flat-playlist --print id``.
+    """
+    ydl = _get_ydl({"quiet": True, "extract_flat": "in_playlist"})
+    info = ydl.extract_info(url, download=False)
+    if info.get("_type") in ("playlist", "multi_video"):
+        ids = list()
+        for entry in info.get("entries") or []:
+            # Channel URLs return one nested playlist per tab
+            if entry.get("_type") == "playlist" or entry.get("ie_key") == "YoutubeTab":
+                ids.extend(list_video_ids(entry["url"]))
+            elif entry.get("id"):
+                ids.append(entry["id"])
+        return ids
+    return [info["id"]]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+from pathlib import Path
+
+import pytest
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "youtube-video-to-audio"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+from audio_cache import AudioCache
+
+
+def test_make_key():
+    key = AudioCache.make_key("d6rZtgHcbWA", quality="auto", audio_format="mp3")
+    # Stable across runs and independent of the parameter order
+    assert key == AudioCache.make_key("d6rZtgHcbWA", audio_format="mp3", quality="auto")
+    video_id, params_hash = key.split(".")
+    assert (video_id, len(params_hash)) == ("d6rZtgHcbWA", 16)
+    assert key != AudioCache.make_key("d6rZtgHcbWA", quality="auto", audio_format="m4a")
+    assert key != AudioCache.make_key("xxxxxxxxxxx", quality="auto", audio_format="mp3")
+
+
+def test_put_atomic(tmp_path, monkeypatch):
+    cache = AudioCache(dir_cache=tmp_path / "cache")
+    path_src = tmp_path / "src.mp3"
+    path_src.write_bytes(b"old audio")
+    path = cache.put("key", "mp3", path_src)
+    assert cache.get("key", "mp3") == path
+    assert path.read_bytes() == b"old audio"
+
+    def broken_copyfile(src, dst):
+        Path(dst).write_bytes(b"partial")
+        raise OSError("disk full")
+
+    # A failed copy leaves the previous entry intact and no temporary file
+    path_src.write_bytes(b"new audio")
+    monkeypatch.setattr(shutil, "copyfile", broken_copyfile)
+    with pytest.raises(OSError):
+        cache.put("key", "mp3", path_src)
+    assert path.read_bytes() == b"old audio"
+    assert [p.name for p in cache.dir_cache.iterdir()] == [path.name]
+    assert cache.get("other", "mp3") is None
+
+
+def test_evict_lru(tmp_path):
+    cache = AudioCache(dir_cache=tmp_path / "cache", max_bytes=25)
+    path_src = tmp_path / "src.mp3"
+    path_src.write_bytes(b"0123456789")
+    path_a = cache.put("a", "mp3", path_src)
+    path_b = cache.put("b", "mp3", path_src)
+    os.utime(path_a, (1000, 1000))
+    os.utime(path_b, (2000, 2000))
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a", "mp3") == path_a
+    path_c = cache.put("c", "mp3", path_src)
+    assert sorted(p.name for p in cache.dir_cache.iterdir()) == ["a.mp3", "c.mp3"]
+
+    # The entry just added is never evicted, even when it alone is too big
+    path_src.write_bytes(b"x" * 100)
+    path_d = cache.put("d", "mp3", path_src)
+    assert [p.name for p in cache.dir_cache.iterdir()] == ["d.mp3"]
+    assert not path_c.exists()
+    assert path_d.exists()
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "youtube-video-to-audio"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+import download_audio
+
+
+def test_download_audio_batch_range(tmp_path, monkeypatch):
+    calls = list()
+
+    def fake_download_audio(**kwargs):
+        calls.append(kwargs)
+        return kwargs["output_path"]
+
+    monkeypatch.setattr(download_audio, "download_audio", fake_download_audio)
+
+    # No range: every video is downloaded whole
+    download_audio.download_audio_batch(
+        video_urls=["https://youtu.be/aaaaaaaaaaa", "https://youtu.be/bbbbbbbbbbb"],
+        output_dir=tmp_path / "full",
+        workers=2,
+    )
+    assert len(calls) == 2
+    for kwargs in calls:
+        assert kwargs["start"] is None
+        assert kwargs["end"] is None
+        assert kwargs["chapter"] is None
+
+    calls.clear()
+    download_audio.download_audio_batch(
+        video_urls=["https://youtu.be/aaaaaaaaaaa"],
+        output_dir=tmp_path / "range",
+        start="1:30",
+        end=120,
+    )
+    assert [(kwargs["start"], kwargs["end"]) for kwargs in calls] == [("1:30", 120)]
+
+
+
+def test_download_audio_batch_index_skip(tmp_path, monkeypatch):
+    from metadata_index import MetadataIndex
+
+    calls = list()
+
+    def fake_download_audio(**kwargs):
+        calls.append(kwargs)
+        Path(kwargs["output_path"]).write_bytes(b"audio")
+        return kwargs["output_path"]
+
+    monkeypatch.setattr(download_audio, "download_audio", fake_download_audio)
+    urls = ["https://youtu.be/aaaaaaaaaaa"]
+    with MetadataIndex(tmp_path / "metadata.sqlite") as index:
+        download_audio.download_audio_batch(urls, tmp_path / "a", index=index)
+        assert len(calls) == 1
+
+        # Same directory and format: skipped
+        download_audio.download_audio_batch(urls, tmp_path / "a", index=index)
+        assert len(calls) == 1
+
+        # Another directory or format: downloaded
+        download_audio.download_audio_batch(urls, tmp_path / "b", index=index)
+        assert len(calls) == 2
+        download_audio.download_audio_batch(
+            urls, tmp_path / "a", audio_format="m4a", index=index
+        )
+        assert len(calls) == 3
+
+        # Processed, but the file is gone: downloaded again
+        (tmp_path / "a" / "aaaaaaaaaaa.mp3").unlink()
+        results = download_audio.download_audio_batch(urls, tmp_path / "a", index=index)
+        assert len(calls) == 4
+        assert Path(results[0].output_path).exists()
+
+
+def test_metadata_index_pending(tmp_path):
+    from metadata_index import MetadataIndex, info_to_record
+
+    with MetadataIndex(tmp_path / "metadata.sqlite") as index:
+        for video_id, duration in [("aaaaaaaaaaa", 60), ("bbbbbbbbbbb", 600)]:
+            index.upsert(info_to_record({"id": video_id, "duration": duration}))
+        index.mark_processed("aaaaaaaaaaa", tmp_path / "a" / "aaaaaaaaaaa.mp3", "mp3")
+        assert index.processed_ids() == {"aaaaaaaaaaa"}
+        assert [r["video_id"] for r in index.pending()] == ["bbbbbbbbbbb"]
+
+        # Processed into another directory or format is pending for this one
+        assert index.processed_ids(output_dir=tmp_path / "b") == set()
+        assert index.processed_ids(audio_format="m4a") == set()
+        pending = index.pending(output_dir=tmp_path / "b")
+        assert [r["video_id"] for r in pending] == ["bbbbbbbbbbb", "aaaaaaaaaaa"]
+        pending = index.pending(limit=1, output_dir=tmp_path / "a", audio_format="mp3")
+        assert [r["video_id"] for r in pending] == ["bbbbbbbbbbb"]
+
+
+def test_download_audio_batch_fake_youtube(tmp_path):
+    import pytest
+    from fake_youtube import FakeYouTube
+
+    if sys.platform == "win32":
+        pytest.skip("the fake yt-dlp is a Python script with a shebang")
+    urls = [f"https://www.youtube.com/watch?v=fakevid000{i}" for i in range(2)]
+    with FakeYouTube(dir_root=tmp_path / "fake", audio_seconds=20.0):
+        download_audio.download_yt_dlp()
+        # No range: the whole video
+        full = download_audio.download_audio_batch(
+            urls,
+            tmp_path / "full",
+            audio_format="wav",
+            use_cache=False,
+            engine="subprocess",
+        )
+        # A quarter of it: only the bytes of the section are fetched
+        part = download_audio.download_audio_batch(
+            urls,
+            tmp_path / "part",
+            audio_format="wav",
+            use_cache=False,
+            engine="subprocess",
+            start=5,
+            end=10,
+        )
+    for full_item, part_item in zip(full, part):
+        assert full_item.ok and part_item.ok
+        full_size = Path(full_item.output_path).stat().st_size
+        part_size = Path(part_item.output_path).stat().st_size
+        assert full_size == pytest.approx(4 * part_size, rel=0.01)
+
+
+def test_is_retryable_called_process_error():
+    from retry_policy import default_retry_policy, is_retryable
+
+    # The command line holds "--fragment-retries" and "--socket-timeout",
+    # only what yt-dlp printed decides
+    cmd = ["yt-dlp", *default_retry_policy.yt_dlp_args(), "https://youtu.be/x"]
+    error = subprocess.CalledProcessError(1, cmd, stderr="ERROR: Private video")
+    assert is_retryable(error) is False
+    error = subprocess.CalledProcessError(1, cmd, stderr="ERROR: something odd")
+    assert is_retryable(error) is False
+    error = subprocess.CalledProcessError(1, cmd, stderr=b"ERROR: HTTP Error 503")
+    assert is_retryable(error) is True
+    error = subprocess.CalledProcessError(1, cmd, output="Read timed out.")
+    assert is_retryable(error) is True
+
+
+def test_toolchain_selected_version_not_installed(monkeypatch):
+    import pytest
+    import toolchain
+
+    manifest = {"yt-dlp": {"pinned": None, "active": "2025.10.22", "versions": {}}}
+    manifest["yt-dlp"]["versions"]["2025.10.22"] = {"path": "/bin/yt-dlp"}
+    monkeypatch.setattr(toolchain, "load_manifest", lambda: manifest)
+    monkeypatch.setenv("YT_DLP_VERSION", "2025.10.22")
+    assert toolchain.get_path("yt-dlp") == Path("/bin/yt-dlp")
+    monkeypatch.setenv("YT_DLP_VERSION", "2025.09.26")
+    with pytest.raises(toolchain.VersionNotInstalled) as e:
+        toolchain.get_path("yt-dlp")
+    assert "YT_DLP_VERSION=2025.09.26 is not installed" in str(e.value)
+
+
+def test_import_with_yt_dlp_version_not_installed(tmp_path):
+    # Only running yt-dlp needs the version, importing download_audio does not
+    env = {**os.environ, "HOME": str(tmp_path), "YT_DLP_VERSION": "1999.01.01"}
+    code = "import download_audio; download_audio.ensure_yt_dlp()"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=dir_scripts,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert "toolchain.VersionNotInstalled" in result.stderr
+    result = subprocess.run(
+        [sys.executable, "-c", "import download_audio"],
+        cwd=dir_scripts,
+        env=env,
+    )
+    assert result.returncode == 0
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
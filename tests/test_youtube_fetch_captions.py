@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "youtube-captions-to-text"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+import fetch_captions
+
+
+def test_dedupe_lines():
+    assert fetch_captions.dedupe_lines([]) == []
+    assert fetch_captions.dedupe_lines(["a b", "a b", "c"]) == ["a b", "c"]
+    # Rolling auto-captions, every line repeats the previous full line
+    assert fetch_captions.dedupe_lines(
+        ["a b c", "a b c d e", "a b c d e f g", "a b c d e f g h"]
+    ) == ["a b c", "d e", "f g", "h"]
+    assert fetch_captions.dedupe_lines(
+        ["a b c", "a b c d e", "a b c d e", "a b c d e f"]
+    ) == ["a b c", "d e", "f"]
+
+
+def test_resolve_chapter():
+    info = {
+        "chapters": [
+            {"title": "Intro", "start_time": 0.0, "end_time": 60.0},
+            {"title": "Q&A", "start_time": 60.0, "end_time": 300.0},
+        ]
+    }
+    assert fetch_captions.resolve_chapter(info, "q&a|Q&A") == (60.0, 300.0)
+    with pytest.raises(ValueError):
+        fetch_captions.resolve_chapter(info, "Outro")
+    with pytest.raises(re.error):
+        fetch_captions.resolve_chapter(info, "Q&A (")
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
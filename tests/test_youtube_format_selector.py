@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "youtube-video-to-audio"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+from format_selector import select_audio_format
+
+# Audio-only formats of a 10 minute video
+formats = [
+    # Below the opus / AAC floors, smallest but not accurate enough for ASR
+    {"format_id": "600", "acodec": "opus", "abr": 20, "filesize": 1_500_000},
+    {"format_id": "139", "acodec": "mp4a.40.5", "abr": 30, "filesize": 2_250_000},
+    {"format_id": "249", "acodec": "opus", "abr": 50, "filesize": 3_750_000},
+    # No filesize, estimated from abr x duration: 5.25 MB
+    {"format_id": "250", "acodec": "opus", "abr": 70},
+    {"format_id": "251", "acodec": "opus", "abr": 130, "filesize": 9_750_000},
+    {"format_id": "140", "acodec": "mp4a.40.2", "abr": 129, "filesize": 9_700_000},
+]
+
+
+def test_select_audio_format_codec_floor():
+    choice = select_audio_format(formats, duration=600, audio_format="mp3")
+    assert choice.format_id == "249"
+    assert choice.needs_transcode is True
+    assert choice.estimated_bytes == 3_750_000
+    # The default selector takes the best format up to 64 kbps, the same one
+    assert choice.default_format_id == "249"
+    assert choice.bytes_saved == 0
+
+    # Nothing reaches the floor: the highest bitrate
+    choice = select_audio_format(formats, duration=600, min_abr=500)
+    assert choice.format_id == "251"
+
+    assert select_audio_format([], duration=600) is None
+
+
+def test_select_audio_format_remux():
+    # m4a output: AAC needs no transcode, preferred over smaller opus
+    choice = select_audio_format(formats, duration=600, audio_format="m4a")
+    assert choice.format_id == "140"
+    assert choice.needs_transcode is False
+
+    choice = select_audio_format(formats, duration=600, audio_format="opus")
+    assert choice.format_id == "249"
+    assert choice.needs_transcode is False
+
+
+def test_select_audio_format_size_tie_break():
+    # 140 is smaller than 251, but within 10%: opus wins
+    choice = select_audio_format(formats, duration=600, min_abr=100)
+    assert choice.format_id == "251"
+
+    # More than 10% apart: the smaller AAC stream wins
+    candidates = [
+        {"format_id": "251", "acodec": "opus", "abr": 130, "filesize": 12_000_000},
+        {"format_id": "140", "acodec": "mp4a.40.2", "abr": 129, "filesize": 9_700_000},
+    ]
+    choice = select_audio_format(candidates, duration=600)
+    assert choice.format_id == "140"
+    assert choice.default_format_id == "140"
+    assert choice.bytes_saved == 0
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
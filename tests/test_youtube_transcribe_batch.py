@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+from pathlib import Path
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "transcribe-audio-to-text"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+import engines
+import audio_utils
+import batch_transcribe
+import transcribe_audio
+
+# Stand-in for ffmpeg: reports a 10 second duration for any input
+fake_ffmpeg = """#!/bin/sh
+if [ "$1" = "-version" ]; then
+    echo "ffmpeg version 0.0-test"
+else
+    echo "  Duration: 00:00:10.00, start: 0.000000, bitrate: 128 kb/s" >&2
+fi
+"""
+
+
+def test_transcribe_batch_resume(tmp_path, monkeypatch):
+    # The fake engine process probes the duration with the ffmpeg it finds
+    # in a fresh toolchain under HOME
+    dir_bin = tmp_path / "bin"
+    dir_bin.mkdir()
+    path_ffmpeg = dir_bin / "ffmpeg"
+    path_ffmpeg.write_text(fake_ffmpeg)
+    path_ffmpeg.chmod(0o755)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("PATH", f"{dir_bin}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_ENGINE_SPEED", "1000")
+    monkeypatch.setattr(audio_utils, "probe_duration", lambda path: 10.0)
+    monkeypatch.setattr(engines, "path_benchmark", tmp_path / "engine_benchmark.json")
+
+    calls = list()
+    transcribe = transcribe_audio.transcribe_audio
+
+    def counting_transcribe(path_audio, **kwargs):
+        calls.append(path_audio.name)
+        return transcribe(path_audio, **kwargs)
+
+    monkeypatch.setattr(transcribe_audio, "transcribe_audio", counting_transcribe)
+
+    dir_audio = tmp_path / "audio"
+    (dir_audio / "a").mkdir(parents=True)
+    for name in ["a/ep01.mp3", "a/ep01.m4a", "ep02.mp3"]:
+        (dir_audio / name).write_bytes(name.encode("utf-8"))
+    dir_output = tmp_path / "transcripts"
+
+    def run():
+        calls.clear()
+        return batch_transcribe.transcribe_batch(
+            pattern=str(dir_audio),
+            output_dir=dir_output,
+            workers=2,
+            threads=1,
+            use_server=False,
+            use_cache=False,
+            engine="fake",
+        )
+
+    manifest = run()
+    assert sorted(calls) == ["ep01.m4a", "ep01.mp3", "ep02.mp3"]
+    assert {entry["status"] for entry in manifest.files.values()} == {"done"}
+    # Same stem, different extension: two transcripts
+    assert (dir_output / "a" / "ep01.mp3.txt").exists()
+    assert (dir_output / "a" / "ep01.m4a.txt").exists()
+    assert (dir_output / "ep02.mp3.txt").read_text().startswith("[00:00:00.000 --> 00:00:05.000]")
+
+    # Nothing changed, nothing to do
+    run()
+    assert calls == []
+
+    # A crash left one file pending, another one changed since
+    path_manifest = dir_output / batch_transcribe.manifest_filename
+    data = json.loads(path_manifest.read_text())
+    data["files"][str(dir_audio / "ep02.mp3")]["status"] = "pending"
+    path_manifest.write_text(json.dumps(data))
+    (dir_audio / "a" / "ep01.m4a").write_bytes(b"new content")
+    manifest = run()
+    assert sorted(calls) == ["ep01.m4a", "ep02.mp3"]
+    assert {entry["status"] for entry in manifest.files.values()} == {"done"}
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+from pathlib import Path
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "transcribe-audio-to-text"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+from transcript_cache import TranscriptCache, hash_audio
+
+
+def test_transcript_cache(tmp_path):
+    path_audio = tmp_path / "a.mp3"
+    path_audio.write_bytes(b"audio")
+    path_copy = tmp_path / "copy" / "b.mp3"
+    path_copy.parent.mkdir()
+    path_copy.write_bytes(b"audio")
+    # The key depends on the content and the parameters, not the path
+    key = TranscriptCache.make_key(hash_audio(path_audio), engine="fake", model=None)
+    assert key == TranscriptCache.make_key(hash_audio(path_copy), model=None, engine="fake")
+    assert key != TranscriptCache.make_key(hash_audio(path_audio), engine="whisper-cpp")
+
+    cache = TranscriptCache(dir_cache=tmp_path / "cache", max_bytes=25)
+    path_output = tmp_path / "out" / "a.txt"
+    assert cache.restore(key, path_output) is False
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    path_src = tmp_path / "a.txt"
+    path_src.write_text("0123456789")
+    cache.put(key, path_src)
+    assert cache.restore(key, path_output) is True
+    assert path_output.read_text() == "0123456789"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_transcript_cache_evict(tmp_path):
+    cache = TranscriptCache(dir_cache=tmp_path / "cache", max_bytes=25)
+    path_src = tmp_path / "src.txt"
+    path_src.write_text("0123456789")
+    path_a = cache.put("a", path_src)
+    path_b = cache.put("b", path_src)
+    os.utime(path_a, (1000, 1000))
+    os.utime(path_b, (2000, 2000))
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == path_a
+    path_c = cache.put("c", path_src)
+    assert path_a.exists()
+    assert not path_b.exists()
+    assert path_c.exists()
+    assert sorted(p.name for p in cache.dir_cache.iterdir()) == ["a.txt", "c.txt"]
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "transcribe-audio-to-text"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+import engines
+import autotune
+
+
+def test_select_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(engines, "path_benchmark", tmp_path / "engine_benchmark.json")
+    monkeypatch.setattr(engines.WhisperCppEngine, "is_available", lambda self: True)
+    monkeypatch.setattr(engines.FasterWhisperEngine, "is_available", lambda self: True)
+    # No benchmark on this host
+    assert engines.select_engine() == engines.default_engine
+
+    results = {
+        "whisper-cpp": {"ok": True, "realtime_factor": 20.0, "wer": 0.2},
+        "faster-whisper": {"ok": True, "realtime_factor": 30.0, "wer": 0.5},
+        # Benchmarked without a reference, never selected
+        "audinota": {"ok": True, "realtime_factor": 50.0, "wer": None},
+        "fake": {"ok": True, "realtime_factor": 1000.0, "wer": 0.0},
+    }
+    engines.save_benchmark({engines.get_host(): {"engines": results}})
+    assert engines.select_engine(max_wer=0.35) == "whisper-cpp"
+    assert engines.select_engine(max_wer=0.6) == "faster-whisper"
+    assert engines.select_engine(max_wer=0.1) == engines.default_engine
+
+    monkeypatch.setattr(engines.WhisperCppEngine, "is_available", lambda self: False)
+    assert engines.select_engine(max_wer=0.35) == engines.default_engine
+
+
+def test_autotune_get_candidates():
+    assert autotune.get_candidates(1) == [(1, 1)]
+    assert autotune.get_candidates(8) == [(1, 8), (2, 4), (4, 2), (8, 1)]
+    assert autotune.get_candidates(6) == [(1, 6), (2, 3), (4, 1), (6, 1)]
+
+
+def test_autotune_resolve(tmp_path, monkeypatch):
+    monkeypatch.setattr(engines, "path_benchmark", tmp_path / "engine_benchmark.json")
+    monkeypatch.setattr(autotune, "get_cpu_count", lambda: 8)
+    # Not tuned: the mode's default workers, the cores shared among them
+    assert autotune.resolve("fake", default_workers=4) == (4, 2)
+    assert autotune.resolve("fake") == (8, 1)
+    assert autotune.resolve("fake", workers=3) == (3, 2)
+    assert autotune.resolve("fake", workers=2, threads=6) == (2, 6)
+
+    tuning = {"workers": 2, "threads": 4, "realtime_factor": 9.0, "host_cpu_count": 8}
+    engines.save_benchmark({engines.get_host(): {"tuning": {"fake": tuning}}})
+    assert autotune.resolve("fake", default_workers=4) == (2, 4)
+    # The tuned threads only go with the tuned workers
+    assert autotune.resolve("fake", workers=4) == (4, 2)
+    assert autotune.resolve("whisper-cpp", default_workers=4) == (4, 2)
+
+    # Tuned on another CPU count, ignored
+    monkeypatch.setattr(autotune, "get_cpu_count", lambda: 16)
+    assert autotune.resolve("fake", default_workers=4) == (4, 4)
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
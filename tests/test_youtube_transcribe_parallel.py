@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "transcribe-audio-to-text"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+import parallel_transcribe
+
+
+def test_shift_timestamps():
+    text = (
+        "[00:00:01.000 --> 00:00:02.500] Meet me at 10:30:00 sharp.\n"
+        "00:00:03,000 --> 00:00:04,000\n"
+        "[00:00:05] Call 00:00:09 and 1:02:03.\n"
+    )
+    assert parallel_transcribe.shift_timestamps(text, 60) == (
+        "[00:01:01.000 --> 00:01:02.500] Meet me at 10:30:00 sharp.\n"
+        "00:01:03,000 --> 00:01:04,000\n"
+        "[00:01:05] Call 00:00:09 and 1:02:03.\n"
+    )
+
+
+def test_plan_chunks():
+    chunks = parallel_transcribe.plan_chunks(
+        duration=1000.0,
+        silences=[(290.0, 292.0), (610.0, 612.0)],
+        chunk_seconds=300.0,
+        overlap=1.0,
+    )
+    # Cut in the silences near every target, a forced cut where there is
+    # none, and no tiny last chunk
+    assert [(c.start, c.end, c.overlap) for c in chunks] == [
+        (0.0, 291.0, 0.0),
+        (291.0, 611.0, 0.0),
+        (611.0, 911.0, 0.0),
+        (910.0, 1000.0, 1.0),
+    ]
+    assert [c.index for c in chunks] == [0, 1, 2, 3]
+
+    chunks = parallel_transcribe.plan_chunks(100.0, [], chunk_seconds=300.0)
+    assert [(c.start, c.end) for c in chunks] == [(0.0, 100.0)]
+
+
+def test_merge_overlap():
+    merge_overlap = parallel_transcribe.merge_overlap
+    assert merge_overlap("We went to the park today.", "the park, today and then") == "and then"
+    # One shared word is too likely a coincidence
+    assert merge_overlap("Hello world.", "world peace") == "world peace"
+    assert merge_overlap("", "first words") == "first words"
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
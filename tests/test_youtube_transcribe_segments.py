@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+import pytest
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "transcribe-audio-to-text"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+import segments
+
+
+def test_parse_transcript():
+    text = (
+        "[00:00:00.000 --> 00:00:02.500] Hello there.\n"
+        "[00:00:02.500] General Kenobi.\n"
+        "[00:00:04.000] You are a bold one.\n"
+    )
+    result = segments.parse_transcript(text, duration=6.0)
+    assert [(s.start, s.end) for s in result] == [(0.0, 2.5), (2.5, 4.0), (4.0, 6.0)]
+    assert result[1].text == "General Kenobi."
+
+    # Plain text has no times to offer, none are made up
+    with pytest.raises(ValueError):
+        segments.parse_transcript("Hello there.\nGeneral Kenobi.\n", duration=6.0)
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)
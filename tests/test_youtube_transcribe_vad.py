@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+dir_scripts = (
+    Path(__file__).absolute().parent.parent
+    / "plugins"
+    / "social-media-network"
+    / "youtube"
+    / "skills"
+    / "transcribe-audio-to-text"
+    / "scripts"
+)
+sys.path.append(str(dir_scripts))
+
+import vad
+
+
+def test_time_map_to_original():
+    time_map = vad.TimeMap(regions=[(10.0, 20.0), (30.0, 50.0)])
+    assert time_map.offsets == [0.0, 10.0]
+    assert time_map.speech_seconds == 30.0
+    assert time_map.to_original(0.0) == 10.0
+    assert time_map.to_original(5.0) == 15.0
+    # The start of the second region in the condensed audio
+    assert time_map.to_original(10.0) == 30.0
+    assert time_map.to_original(15.0) == 35.0
+    # Past the end of the speech, clamped to the last region
+    assert time_map.to_original(100.0) == 50.0
+
+    assert vad.TimeMap(regions=[]).to_original(7.0) == 7.0
+
+
+if __name__ == "__main__":
+    from sanhe_claude_code_plugins.tests import run_unit_test
+
+    run_unit_test(__file__)